@@ -3,23 +3,31 @@ Backtest engine: simulates a simple long-only strategy from signals and price da
 Uses common index of signals and prices to avoid look-ahead bias.
 
 Assumptions: long-only (no shorting), no commission or slippage, fixed 100 shares per trade.
+
+BacktestPortfolio computes the portfolio without plotting; PlotPortfolio draws it on request.
+BacktestBatch runs the same rules over a (date x ticker) panel in one vectorised pass;
+BatchPanels builds that panel from per-ticker series aligned as Backtest aligns them.
+BacktestEvents is the event-driven mode (see event_backtest): orders fill at the next
+open in whole board lots, with commission, stamp duty, slippage and partial fills.
 """
 import sys
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from event_backtest import NO_COSTS, orders_from_signals, run_events
 
-def Backtest(ticker, signals, df, initial_capital=float(100000.0)):
+
+def BacktestPortfolio(ticker, signals, df, initial_capital=float(100000.0)):
     """
-    Run backtest: long-only, fixed 100 shares per signal.
+    Compute-only backtest: long-only, fixed 100 shares per signal, no figure.
 
     Parameters
     ----------
     ticker : str
         Symbol name (e.g. '0001.HK').
     signals : pd.DataFrame
-        Must have DatetimeIndex, columns 'signal' (0/1) and 'positions' (from signal.diff()).
+        Must have DatetimeIndex and a 'signal' column (0/1).
     df : pd.DataFrame
         Price data with DatetimeIndex and 'Close' column.
     initial_capital : float
@@ -29,37 +37,43 @@ def Backtest(ticker, signals, df, initial_capital=float(100000.0)):
     -------
     portfolio : pd.DataFrame
         Columns: ticker, holdings, cash, total, returns.
-    fig : matplotlib.figure.Figure
-        Equity curve figure.
     """
     # Align to common index to avoid look-ahead and NaNs
-    common_idx = signals.index.intersection(df.index).sort_values()
+    common_idx = signals.index.intersection(df.index)
     if len(common_idx) == 0:
         raise ValueError("signals and df have no common index; cannot run backtest")
-    signals = signals.reindex(common_idx).ffill().fillna(0.0)
-    df = df.reindex(common_idx).ffill().bfill()
-
-    positions = pd.DataFrame(index=common_idx).fillna(0.0)
-    positions[ticker] = 100 * signals["signal"]
 
-    portfolio = positions.multiply(df["Close"], axis=0)
+    result = BacktestBatch(
+        df[["Close"]].set_axis([ticker], axis=1),
+        signals[["signal"]].set_axis([ticker], axis=1),
+        initial_capital=initial_capital,
+    )
 
-    # Store the difference in shares owned 
-    pos_diff = positions.diff()
+    portfolio = pd.DataFrame(index=result["total"].index)
+    portfolio[ticker] = result["holdings"][ticker]
+    for column in ("holdings", "cash", "total", "returns"):
+        portfolio[column] = result[column][ticker]
 
-    # Add `holdings` to portfolio
-    portfolio['holdings'] = (positions.multiply(df['Close'], axis=0)).sum(axis=1)
+    return portfolio
 
-    # Add `cash` to portfolio
-    portfolio['cash'] = initial_capital - (pos_diff.multiply(df['Close'], axis=0)).sum(axis=1).cumsum()   
 
-    # Add `total` to portfolio
-    portfolio['total'] = portfolio['cash'] + portfolio['holdings']
+def PlotPortfolio(portfolio, signals):
+    """
+    Plot the equity curve with buy/sell markers.
 
-    # Add `returns` to portfolio
-    portfolio['returns'] = portfolio['total'].pct_change()
+    Parameters
+    ----------
+    portfolio : pd.DataFrame
+        Output of BacktestPortfolio (needs 'total').
+    signals : pd.DataFrame
+        Signals with a 'positions' column (from signal.diff()).
 
-    # Plot portfolio value
+    Returns
+    -------
+    fig : matplotlib.figure.Figure
+        Equity curve figure.
+    """
+    positions = signals["positions"].reindex(portfolio.index)
 
     # Create a figure
     fig = plt.figure(figsize=(8, 6))
@@ -74,8 +88,8 @@ def Backtest(ticker, signals, df, initial_capital=float(100000.0)):
         lw=1.2,
         label="Total value (including cash)",
     )
-    buy_mask = signals["positions"] == 1.0
-    sell_mask = signals["positions"] == -1.0
+    buy_mask = positions == 1.0
+    sell_mask = positions == -1.0
     ax1.plot(
         portfolio.loc[buy_mask].index,
         portfolio["total"].loc[buy_mask].values,
@@ -94,5 +108,180 @@ def Backtest(ticker, signals, df, initial_capital=float(100000.0)):
     )
 
     plt.legend()
-    
+
+    return fig
+
+
+def Backtest(ticker, signals, df, initial_capital=float(100000.0)):
+    """
+    Run backtest: long-only, fixed 100 shares per signal.
+
+    Thin wrapper around BacktestPortfolio and PlotPortfolio. Use
+    BacktestPortfolio directly when the figure is not needed.
+
+    Parameters
+    ----------
+    ticker : str
+        Symbol name (e.g. '0001.HK').
+    signals : pd.DataFrame
+        Must have DatetimeIndex, columns 'signal' (0/1) and 'positions' (from signal.diff()).
+    df : pd.DataFrame
+        Price data with DatetimeIndex and 'Close' column.
+    initial_capital : float
+        Starting cash.
+
+    Returns
+    -------
+    portfolio : pd.DataFrame
+        Columns: ticker, holdings, cash, total, returns.
+    fig : matplotlib.figure.Figure
+        Equity curve figure.
+    """
+    portfolio = BacktestPortfolio(ticker, signals, df, initial_capital=initial_capital)
+    signals = signals.reindex(portfolio.index).ffill().fillna(0.0)
+    fig = PlotPortfolio(portfolio, signals)
+
     return portfolio, fig
+
+
+def BacktestBatch(prices, signals, initial_capital=float(100000.0), shares=100):
+    """
+    Run the long-only backtest for many tickers at once on a (date x ticker) panel.
+
+    Each column is an independent portfolio with the same rules as ``Backtest``:
+    ``shares`` shares held while the signal is 1, filled at Close, no costs.
+    All tickers are computed in a single NumPy pass and no figure is drawn.
+
+    Parameters
+    ----------
+    prices : pd.DataFrame
+        Close prices, DatetimeIndex x ticker columns.
+    signals : pd.DataFrame
+        Signals (0/1), DatetimeIndex x ticker columns.
+    initial_capital : float
+        Starting cash per ticker.
+    shares : int
+        Shares held per ticker while the signal is on.
+
+    Returns
+    -------
+    result : dict of pd.DataFrame
+        Keys 'holdings', 'cash', 'total', 'returns'; each frame is date x ticker.
+
+    Notes
+    -----
+    Rows are the dates common to both panels; columns the common tickers.
+    Within a column, missing prices are forward/back filled and missing signals
+    forward filled then set to 0. A ticker's portfolio starts on its first price,
+    as a separate ``Backtest`` of it would: every output is NaN before that row,
+    and that row books no trade and has a NaN return. Build ragged panels with
+    ``BatchPanels`` so each ticker also keeps only its own dates.
+    """
+    tickers = signals.columns.intersection(prices.columns)
+    if len(tickers) == 0:
+        raise ValueError("signals and prices have no common ticker; cannot run backtest")
+    common_idx = signals.index.intersection(prices.index).sort_values()
+    if len(common_idx) == 0:
+        raise ValueError("signals and prices have no common index; cannot run backtest")
+
+    sig = signals[tickers].reindex(common_idx).ffill().fillna(0.0).to_numpy(dtype=np.float64)
+    close = prices[tickers].reindex(common_idx)
+    started = np.logical_or.accumulate(close.notna().to_numpy(), axis=0)
+    first = started.copy()
+    first[1:] &= ~started[:-1]
+    close = close.ffill().bfill().to_numpy(dtype=np.float64)
+
+    positions = shares * sig
+    pos_diff = np.zeros_like(positions)
+    pos_diff[1:] = positions[1:] - positions[:-1]
+    pos_diff[first | ~started] = 0.0
+
+    holdings = positions * close
+    cash = initial_capital - np.cumsum(pos_diff * close, axis=0)
+    total = cash + holdings
+    returns = np.full_like(total, np.nan)
+    returns[1:] = total[1:] / total[:-1] - 1.0
+    holdings[~started] = cash[~started] = total[~started] = np.nan
+    returns[first | ~started] = np.nan
+
+    return {
+        name: pd.DataFrame(values, index=common_idx, columns=tickers)
+        for name, values in (
+            ("holdings", holdings),
+            ("cash", cash),
+            ("total", total),
+            ("returns", returns),
+        )
+    }
+
+
+def BatchPanels(prices, signals):
+    """
+    Build BacktestBatch panels from per-ticker series with different dates.
+
+    Each ticker is cut to the dates common to its own prices and signals (the
+    alignment ``Backtest`` uses for one ticker), after dropping duplicate dates
+    (keeping the first), before the tickers are joined on the union of dates.
+
+    Parameters
+    ----------
+    prices : dict of str -> pd.Series
+        Ticker -> Close prices with a DatetimeIndex.
+    signals : dict of str -> pd.Series
+        Ticker -> signals (0/1) with a DatetimeIndex.
+
+    Returns
+    -------
+    prices, signals : pd.DataFrame
+        Union of dates x ticker; NaN where a date is not one of the ticker's own.
+    """
+    aligned_prices, aligned_signals = {}, {}
+    for ticker, close in prices.items():
+        close = close[~close.index.duplicated(keep="first")]
+        signal = signals[ticker]
+        signal = signal[~signal.index.duplicated(keep="first")]
+        common_idx = close.index.intersection(signal.index)
+        aligned_prices[ticker] = close.loc[common_idx]
+        aligned_signals[ticker] = signal.loc[common_idx]
+    return pd.concat(aligned_prices, axis=1), pd.concat(aligned_signals, axis=1)
+
+
+def BacktestEvents(bars, signals, initial_capital=float(100000.0), shares=100, lot_size=1,
+                   costs=NO_COSTS, slippage=0.0, participation=None):
+    """
+    Event-driven backtest of a signal panel: realistic fills instead of Close fills.
+
+    Each signal change becomes a market order for the move to signal x ``shares``
+    (rounded down to whole lots), submitted at that bar's close and filled at the
+    next bar's open through event_backtest.run_events.
+
+    Parameters
+    ----------
+    bars : dict of pd.DataFrame
+        'Open', 'High', 'Low', 'Close' (and 'Volume') date x ticker frames,
+        e.g. from screener.load_panel.
+    signals : pd.DataFrame
+        Signals, DatetimeIndex x ticker columns (aligned to the bars).
+    initial_capital : float
+        Starting cash per ticker.
+    shares : int
+        Shares held per ticker while the signal is 1.
+    lot_size : int or dict
+        Board lot, for all tickers or per ticker.
+    costs : event_backtest.CostModel
+        Commission, stamp duty and levies (e.g. event_backtest.HKEX_COSTS).
+    slippage : float
+        Fraction of price lost on every fill.
+    participation : float or None
+        Largest fraction of a bar's volume filled per ticker; the rest fills later.
+
+    Returns
+    -------
+    result : dict
+        As BacktestBatch, plus 'position' (shares) and 'fills'.
+    """
+    close = bars["Close"]
+    signals = signals.reindex(index=close.index, columns=close.columns)
+    orders = orders_from_signals(signals, shares=shares, lot_size=lot_size)
+    return run_events(bars, orders, lot_size=lot_size, costs=costs, slippage=slippage,
+                      participation=participation, initial_capital=initial_capital)
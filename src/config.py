@@ -2,6 +2,8 @@
 Centralised configuration for data paths and optional settings.
 Uses environment variable DATA_ROOT (or ALGOTRADING_DATA) for the repo/data root;
 defaults to the parent of the directory containing this file, then 'database'.
+PRICE_STORE_DIR overrides where the binary price store is written;
+VADER_CACHE_PATH overrides the file holding cached per-headline VADER scores.
 """
 import os
 import re
@@ -11,6 +13,10 @@ _THIS_DIR = os.path.dirname(os.path.abspath(__file__))
 _REPO_ROOT = os.path.dirname(_THIS_DIR)
 _DATA_ROOT = os.environ.get("DATA_ROOT") or os.environ.get("ALGOTRADING_DATA") or os.path.join(_REPO_ROOT, "database")
 _DATABASE_REAL = os.path.join(_REPO_ROOT, "database_real")
+# Binary price store (see price_store.py): PRICE_STORE_DIR or <data root>/.price_store
+_PRICE_STORE = os.environ.get("PRICE_STORE_DIR") or os.path.join(_DATA_ROOT, ".price_store")
+# Per-headline VADER score cache: VADER_CACHE_PATH or <data root>/sentiment_data/vader-cache.csv
+_VADER_CACHE = os.environ.get("VADER_CACHE_PATH") or os.path.join(_DATA_ROOT, "sentiment_data", "vader-cache.csv")
 
 
 def get_data_root():
@@ -23,6 +29,16 @@ def get_database_real_root():
     return _DATABASE_REAL
 
 
+def get_price_store_dir():
+    """Return the directory holding the binary price store (created on first use)."""
+    return _PRICE_STORE
+
+
+def get_vader_cache_path():
+    """Return the CSV file caching VADER compound scores by headline hash."""
+    return _VADER_CACHE
+
+
 def _safe_symbol(symbol: str) -> str:
     """Allow only alphanumeric symbols to avoid path traversal."""
     if not symbol or not isinstance(symbol, str):
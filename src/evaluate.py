@@ -1,6 +1,9 @@
 """
 Portfolio evaluation: return series, Sharpe ratio, max drawdown, CAGR, standard deviation.
 All functions expect a portfolio DataFrame with 'returns' and 'total' columns (e.g. from backtest.Backtest).
+
+PerformanceMetrics computes every statistic for one or many equity curves (e.g. the
+'total' panel of backtest.BacktestBatch) in one vectorised pass, without plotting.
 """
 import sys
 import math
@@ -40,12 +43,15 @@ def SharpeRatio(portfolio):
 """
 Maximum drawdown
 
+:df: portfolio (its 'total' is measured) or price data (its 'Close')
 :window: trailing 252 trading day window
 """
 def MaxDrawdown(df, window=252):
+    value = df['total'] if 'total' in df else df['Close']
+
     # Calculate the max drawdown in the past window days for each day 
-    rolling_max = df['Close'].rolling(window, min_periods=1).max()
-    daily_drawdown = df['Close'] / rolling_max - 1.0
+    rolling_max = value.rolling(window, min_periods=1).max()
+    daily_drawdown = value / rolling_max - 1.0
 
     # Calculate the minimum (negative) daily drawdown
     max_daily_drawdown = daily_drawdown.rolling(window, min_periods=1).min()
@@ -91,13 +97,128 @@ sqrt(sum[(r_i - r_avg)^2] / n-1)
 """
 
 def StandardDeviation(portfolio):
-    """Annualized standard deviation of strategy returns. Returns 0 if fewer than 2 observations."""
+    """Standard deviation of strategy returns (per period). Returns 0 if fewer than 2 observations."""
     returns = portfolio["returns"]
-    n = len(returns)
-    if n < 2:
+    if returns.count() < 2:
         return 0.0
-    returns_diff = returns - returns.mean()
-    returns_diff = returns_diff * returns_diff
-    returns_diff_sum = returns_diff.sum()
-    sd = math.sqrt(returns_diff_sum / (n - 1))
-    return sd
+    return float(returns.std())
+
+
+METRICS = ("total_return", "cagr", "volatility", "sharpe", "sortino", "max_drawdown",
+           "max_drawdown_duration", "calmar", "hit_rate", "turnover")
+
+
+def _curves(curves):
+    """Equity values as a 2-D (time x curve) array, with the time index and curve labels."""
+    if isinstance(curves, dict):
+        curves = curves["total"]
+    if isinstance(curves, pd.DataFrame) and "total" in curves.columns:
+        curves = curves["total"]
+    if isinstance(curves, pd.Series):
+        return curves.to_numpy(dtype=np.float64)[:, None], curves.index, None
+    if isinstance(curves, pd.DataFrame):
+        return curves.to_numpy(dtype=np.float64), curves.index, curves.columns
+    values = np.asarray(curves, dtype=np.float64)
+    if values.ndim == 1:
+        return values[:, None], None, None
+    return values, None, pd.RangeIndex(values.shape[1])
+
+
+def PerformanceMetrics(curves, positions=None, prices=None, periods_per_year=252):
+    """
+    All performance statistics of one or many equity curves in one vectorised pass.
+
+    Parameters
+    ----------
+    curves : pd.Series, pd.DataFrame, np.ndarray or dict
+        Portfolio value over time: a portfolio (its 'total' column), a Series, a
+        date x curve DataFrame, a 1-D or (time x curve) 2-D array, or a
+        BacktestBatch / BacktestEvents result (its 'total'). NaN values (e.g. before
+        a ticker's history starts) are skipped.
+    positions : array-like or None
+        Holdings over time, same shape as the curves, for turnover: shares when
+        prices are given, otherwise portfolio weights. None gives NaN turnover.
+    prices : array-like or None
+        Prices the positions trade at (e.g. the Close panel).
+    periods_per_year : int
+        252 for daily curves.
+
+    Returns
+    -------
+    metrics : pd.Series or pd.DataFrame
+        The METRICS for a single curve, or one row per curve:
+        total_return, cagr (as CAGR: calendar days for a DatetimeIndex, otherwise
+        periods), volatility (annualised std of returns), sharpe (as SharpeRatio),
+        sortino (annualised mean over downside deviation), max_drawdown (<= 0),
+        max_drawdown_duration (most periods spent below a previous peak),
+        calmar (cagr / |max_drawdown|), hit_rate (share of non-zero returns that are
+        positive) and turnover (annualised traded value over average equity).
+        Ratios with a zero denominator are 0, as in SharpeRatio.
+    """
+    values, index, labels = _curves(curves)
+    n_periods, n_curves = values.shape
+    annual = np.sqrt(periods_per_year)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = values[1:] / values[:-1] - 1.0
+        valid = np.isfinite(returns)
+        count = valid.sum(axis=0)
+        r = np.where(valid, returns, 0.0)
+        mean = r.sum(axis=0) / count
+        var = np.where(valid, (returns - mean) ** 2, 0.0).sum(axis=0) / (count - 1)
+        std = np.where(count > 1, np.sqrt(var), 0.0)
+        downside = np.sqrt((np.minimum(r, 0.0) ** 2).sum(axis=0) / count)
+
+        sharpe = np.where(std > 0, annual * mean / std, 0.0)
+        sortino = np.where(downside > 0, annual * mean / downside, 0.0)
+        gains, moves = (r > 0).sum(axis=0), (r != 0).sum(axis=0)
+        hit_rate = np.where(moves > 0, gains / moves, 0.0)
+
+        # first and last valid value of each curve
+        finite = np.isfinite(values)
+        has_value = finite.any(axis=0)
+        first = np.argmax(finite, axis=0)
+        last = n_periods - 1 - np.argmax(finite[::-1], axis=0)
+        columns = np.arange(n_curves)
+        start_val, end_val = values[first, columns], values[last, columns]
+        total_return = np.where(has_value, end_val / start_val - 1.0, 0.0)
+
+        if isinstance(index, pd.DatetimeIndex):
+            span = np.asarray((index[last] - index[first]).days, dtype=np.float64)
+        else:
+            span = (last - first).astype(np.float64)
+        ok = (span > 0) & (start_val > 0) & np.isfinite(end_val)
+        cagr = np.where(ok, (end_val / start_val) ** (periods_per_year / np.where(ok, span, 1.0)) - 1.0, 0.0)
+
+        peak = np.fmax.accumulate(values, axis=0)
+        drawdown = values / peak - 1.0
+        max_drawdown = np.where(has_value, np.nanmin(np.where(finite, drawdown, 0.0), axis=0), 0.0)
+        # periods since the last peak (a NaN value counts as a peak)
+        at_peak = ~(values < peak)
+        steps = np.arange(n_periods)[:, None]
+        since_peak = steps - np.maximum.accumulate(np.where(at_peak, steps, 0), axis=0)
+        duration = since_peak.max(axis=0) if n_periods else np.zeros(n_curves, dtype=np.int64)
+        calmar = np.where(max_drawdown < 0, cagr / np.abs(max_drawdown), 0.0)
+
+        if positions is None:
+            turnover = np.full(n_curves, np.nan)
+        else:
+            held, _, _ = _curves(positions)
+            traded = np.abs(np.diff(held, axis=0, prepend=0.0))
+            if prices is not None:
+                traded = traded * _curves(prices)[0]
+                traded = traded / np.nanmean(values, axis=0)
+            turnover = periods_per_year * np.nansum(traded, axis=0) / max(n_periods, 1)
+
+    metrics = pd.DataFrame({
+        "total_return": total_return,
+        "cagr": cagr,
+        "volatility": annual * std,
+        "sharpe": sharpe,
+        "sortino": sortino,
+        "max_drawdown": max_drawdown,
+        "max_drawdown_duration": duration,
+        "calmar": calmar,
+        "hit_rate": hit_rate,
+        "turnover": turnover,
+    }, index=labels)
+    return metrics.iloc[0].rename(None) if labels is None else metrics
@@ -0,0 +1,409 @@
+"""
+Event-driven backtest engine.
+
+Bars are processed one at a time as events against a compact order book, so orders
+can rest, trigger and fill over several bars:
+
+- market orders fill at the next bar's open, plus slippage;
+- limit orders fill when the bar trades through the limit, at the limit or a better open;
+- stop orders trigger when the bar trades through the stop, fill at the stop or a worse
+  open (plus slippage), and then behave as market orders;
+- quantities are whole board lots per ticker, and a fill can be capped at a fraction of
+  the bar's volume, leaving the rest of the order open (partial fills);
+- commission, stamp duty and levies come from a CostModel.
+
+Every ticker is an independent account with its own starting cash (as in
+backtest.BacktestBatch); there are no margin checks, so cash can go negative.
+
+All state (open orders, positions, cash) lives in NumPy arrays indexed by ticker, and
+each bar is a handful of vectorised operations over the open orders only, so decades of
+daily bars for hundreds of tickers, or minute bars for a few, run without per-bar
+DataFrame work.
+
+Usage:
+    bars = {'Open': ..., 'High': ..., 'Low': ..., 'Close': ..., 'Volume': ...}  # date x ticker
+    orders = pd.DataFrame({'date': [...], 'ticker': [...], 'quantity': [500, -500],
+                           'type': ['MKT', 'LMT'], 'limit': [np.nan, 52.0]})
+    result = run_events(bars, orders, lot_size={'0005.HK': 400}, costs=HKEX_COSTS)
+    result['total'], result['fills']
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+MARKET, LIMIT, STOP = 0, 1, 2
+ORDER_TYPES = {"MKT": MARKET, "LMT": LIMIT, "STP": STOP}
+
+_NEVER = np.iinfo(np.int64).max
+
+CostModel = namedtuple(
+    "CostModel",
+    ["commission_rate", "min_commission", "stamp_duty_rate", "stamp_duty_rounding", "levy_rate"],
+    defaults=[0.0, 0.0, 0.0, 0.0, 0.0],
+)
+CostModel.__doc__ = """Transaction costs of one fill, charged on both buys and sells.
+
+commission_rate, min_commission: broker commission = max(rate x value, minimum).
+stamp_duty_rate, stamp_duty_rounding: stamp duty = rate x value, rounded up to a
+multiple of stamp_duty_rounding (0 = no rounding).
+levy_rate: exchange trading fee and levies, as a fraction of value.
+"""
+
+NO_COSTS = CostModel()
+
+# HKEX equities (rates as of 2023; check current broker and government rates):
+# 0.03% commission (min HK$3), 0.1% stamp duty rounded up to HK$1, and the HKEX trading
+# fee (0.00565%), SFC levy (0.0027%) and AFRC levy (0.00015%).
+HKEX_COSTS = CostModel(commission_rate=0.0003, min_commission=3.0, stamp_duty_rate=0.001,
+                       stamp_duty_rounding=1.0, levy_rate=0.0000565 + 0.000027 + 0.0000015)
+
+Order = namedtuple("Order", ["ticker", "quantity", "type", "limit", "stop", "tif"],
+                   defaults=["MKT", np.nan, np.nan, "GTC"])
+Order.__doc__ = """An order submitted from an on_bar callback.
+
+ticker: column label; quantity: shares, positive to buy and negative to sell (rounded
+down to whole lots); type: 'MKT', 'LMT' or 'STP'; limit / stop: prices for limit / stop
+orders; tif: 'GTC' (until filled) or 'DAY' (only its first bar).
+"""
+
+BarState = namedtuple("BarState", ["bar", "date", "close", "position", "cash"])
+BarState.__doc__ = """What an on_bar callback sees after bar `bar` closes.
+
+close, position, cash: arrays by ticker (read-only views of the engine state).
+"""
+
+
+def transaction_costs(value, costs=NO_COSTS):
+    """Costs of fills with absolute traded value `value` (array) under a CostModel."""
+    value = np.abs(np.asarray(value, dtype=np.float64))
+    commission = np.maximum(value * costs.commission_rate, costs.min_commission)
+    stamp_duty = value * costs.stamp_duty_rate
+    if costs.stamp_duty_rounding:
+        stamp_duty = np.ceil(stamp_duty / costs.stamp_duty_rounding - 1e-9) * costs.stamp_duty_rounding
+    return np.where(value > 0, commission + stamp_duty + value * costs.levy_rate, 0.0)
+
+
+class OrderBook:
+    """
+    Orders as parallel arrays (ticker, remaining quantity, type, limit, stop, first and
+    last bar it may fill on, whether a stop has triggered). Orders are appended in
+    submission order; `open` holds the indices of orders that are live and not yet
+    filled or expired.
+
+    The arrays keep spare capacity, doubled when full, so orders added bar by bar
+    (on_bar) cost amortised O(new orders) rather than a copy of the whole book; each
+    field is a view of the first len(book) entries.
+    """
+    _FIELDS = (("ticker", np.int64), ("quantity", np.int64), ("type", np.int8), ("limit", np.float64),
+               ("stop", np.float64), ("start", np.int64), ("expires", np.int64))
+    _COLUMNS = _FIELDS + (("triggered", bool),)
+
+    def __init__(self, capacity=16):
+        self._columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in self._COLUMNS}
+        self._count = 0
+        self.open = np.empty(0, dtype=np.int64)
+        self._pending = np.empty(0, dtype=np.int64)  # submitted but not yet live, by start bar
+        self._pending_start = np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        return self._count
+
+    def __getattr__(self, name):
+        columns = self.__dict__.get("_columns")
+        if columns is None or name not in columns:
+            raise AttributeError(name)
+        return columns[name][:self._count]
+
+    def _reserve(self, size):
+        capacity = len(self._columns["ticker"])
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity)
+        for name, values in self._columns.items():
+            grown = np.empty(capacity, dtype=values.dtype)
+            grown[:self._count] = values[:self._count]
+            self._columns[name] = grown
+
+    def add(self, ticker, quantity, type, limit, stop, start, expires):
+        """Append orders (arrays of equal length); return their ids."""
+        fields = locals()
+        first = self._count
+        ids = np.arange(first, first + len(np.atleast_1d(ticker)))
+        self._reserve(first + len(ids))
+        for name, dtype in self._FIELDS:
+            self._columns[name][ids] = np.asarray(fields[name], dtype=dtype)
+        self._columns["triggered"][ids] = False
+        self._count += len(ids)
+
+        # merge the new live orders into the pending list, which stays sorted by start bar
+        # (stable: equal starts keep submission order)
+        live = ids[(self.quantity[ids] != 0) & (self.expires[ids] >= self.start[ids])]
+        live = live[np.argsort(self.start[live], kind="stable")]
+        at = np.searchsorted(self._pending_start, self.start[live], side="right")
+        self._pending = np.insert(self._pending, at, live)
+        self._pending_start = np.insert(self._pending_start, at, self.start[live])
+        return ids
+
+    def next_start(self):
+        """First bar on which a pending order goes live (_NEVER if none)."""
+        return self._pending_start[0] if len(self._pending) else _NEVER
+
+    def activate(self, bar):
+        """Move orders whose start bar has arrived onto the open list."""
+        if not len(self._pending) or self._pending_start[0] > bar:
+            return
+        n = np.searchsorted(self._pending_start, bar, side="right")
+        self.open = np.sort(np.concatenate([self.open, self._pending[:n]]))
+        self._pending = self._pending[n:]
+        self._pending_start = self._pending_start[n:]
+
+    def retire(self, bar):
+        """Drop filled orders and orders whose last bar was `bar`."""
+        keep = (self.quantity[self.open] != 0) & (self.expires[self.open] > bar)
+        self.open = self.open[keep]
+
+
+def _lots(quantity, lot):
+    """Round share quantities toward zero to whole lots."""
+    return np.trunc(quantity / lot).astype(np.int64) * lot
+
+
+def _match(book, bar, o, h, low, vol, lot, slippage, participation):
+    """Fill the open orders against one bar; return (order ids, signed quantities, prices)."""
+    ids = book.open
+    tick = book.ticker[ids]
+    qty = book.quantity[ids]
+    kind = book.type[ids]
+    limit = book.limit[ids]
+    stop = book.stop[ids]
+    buy = qty > 0
+    bo, bh, bl = o[tick], h[tick], low[tick]
+
+    # stops trigger when the bar trades through them, then fill like market orders
+    untriggered = (kind == STOP) & ~book.triggered[ids]
+    trigger = untriggered & np.where(buy, bh >= stop, bl <= stop)
+    book.triggered[ids[trigger]] = True
+
+    price = np.full(len(ids), np.nan)
+    market = (kind == MARKET) | ((kind == STOP) & ~untriggered)
+    price[market] = bo[market]
+    price[trigger] = np.where(buy, np.fmax(bo, stop), np.fmin(bo, stop))[trigger]
+    slipped = market | trigger
+    price[slipped] *= 1.0 + np.where(buy, slippage, -slippage)[slipped]
+
+    is_limit = kind == LIMIT
+    through = is_limit & np.where(buy, bl <= limit, bh >= limit)
+    price[through] = np.where(buy, np.fmin(bo, limit), np.fmax(bo, limit))[through]
+
+    fill = ~np.isnan(price)  # also excludes tickers with no bar (NaN open)
+    if not fill.any():
+        return ids[:0], qty[:0], price[:0]
+    ids, tick, qty, price = ids[fill], tick[fill], qty[fill], price[fill]
+
+    size = np.abs(qty)
+    if participation is not None:
+        # volume cap per ticker, shared by its orders first come first served
+        cap = _lots(np.fmax(vol[tick], 0.0) * participation, lot[tick])
+        order = np.lexsort((ids, tick))
+        ids, tick, qty, price, size, cap = ids[order], tick[order], qty[order], price[order], size[order], cap[order]
+        before = np.cumsum(size) - size
+        first = np.concatenate(([True], tick[1:] != tick[:-1]))
+        before -= np.maximum.accumulate(np.where(first, before, 0))
+        size = np.clip(cap - before, 0, size)
+        size = _lots(size, lot[tick])
+
+    filled = size > 0
+    ids, qty, price, size = ids[filled], qty[filled], price[filled], size[filled]
+    signed = np.where(qty > 0, size, -size)
+    book.quantity[ids] -= signed
+    return ids, signed, price
+
+
+def _per_ticker(value, tickers, default):
+    if value is None:
+        return np.full(len(tickers), default)
+    if isinstance(value, dict):
+        return np.array([value.get(ticker, default) for ticker in tickers])
+    return np.broadcast_to(np.asarray(value), (len(tickers),)).copy()
+
+
+def _order_arrays(orders, index, tickers):
+    """Convert an orders DataFrame into OrderBook.add arguments."""
+    column = {ticker: j for j, ticker in enumerate(tickers)}
+    n = len(orders)
+    dates = pd.DatetimeIndex(pd.to_datetime(orders["date"]))
+    # an order submitted at `date` can fill from the first bar after it
+    start = index.searchsorted(dates, side="right")
+    if "good_after" in orders:
+        good_after = pd.to_datetime(orders["good_after"])
+        after = index.searchsorted(pd.DatetimeIndex(good_after.fillna(pd.Timestamp.min)), side="left")
+        start = np.maximum(start, after)
+    tif = orders["tif"].to_numpy() if "tif" in orders else np.full(n, "GTC")
+    # expires: the last bar the order may fill on
+    expires = np.where(tif == "DAY", start, _NEVER)
+    if "expiry" in orders:
+        expiry = pd.to_datetime(orders["expiry"])
+        last = index.searchsorted(pd.DatetimeIndex(expiry.fillna(pd.Timestamp.max)), side="right") - 1
+        expires = np.minimum(expires, np.where(expiry.notna(), last, _NEVER))
+
+    kinds = orders["type"] if "type" in orders else pd.Series("MKT", index=orders.index)
+    return dict(
+        ticker=np.array([column[t] for t in orders["ticker"]], dtype=np.int64),
+        quantity=orders["quantity"].to_numpy(dtype=np.int64),
+        type=np.array([ORDER_TYPES[k] for k in kinds], dtype=np.int8),
+        limit=orders["limit"].to_numpy(dtype=np.float64) if "limit" in orders else np.full(n, np.nan),
+        stop=orders["stop"].to_numpy(dtype=np.float64) if "stop" in orders else np.full(n, np.nan),
+        start=start,
+        expires=expires,
+    )
+
+
+def run_events(bars, orders=None, on_bar=None, lot_size=1, costs=NO_COSTS, slippage=0.0,
+               participation=None, initial_capital=float(100000.0)):
+    """
+    Run the event-driven backtest.
+
+    Parameters
+    ----------
+    bars : dict of str -> pd.DataFrame
+        'Open', 'High', 'Low', 'Close' (and 'Volume' if participation is set) as
+        date x ticker frames with the same index and columns (e.g. screener.load_panel;
+        daily or intraday). NaN bars (ticker not trading) fill nothing.
+    orders : pd.DataFrame or None
+        One row per order: 'date' (submission time), 'ticker', 'quantity' (signed
+        shares, rounded toward zero to whole lots) and optionally 'type' ('MKT',
+        'LMT', 'STP'), 'limit', 'stop', 'tif' ('GTC' or 'DAY'), 'good_after' (earliest
+        fill time, as IB's goodAfterTime) and 'expiry' (last fill time).
+    on_bar : callable or None
+        on_bar(BarState) called after every bar's close; may return a list of Order
+        to submit, live from the next bar.
+    lot_size : int, array or dict of ticker -> int
+        Board lot per ticker.
+    costs : CostModel
+        Commission, stamp duty and levies (see HKEX_COSTS).
+    slippage : float
+        Fraction of price paid on market and stop fills (e.g. 0.0005 for 5 bp).
+    participation : float or None
+        Largest fraction of a bar's volume one ticker can fill; None is unlimited.
+    initial_capital : float
+        Starting cash per ticker.
+
+    Returns
+    -------
+    result : dict
+        'position', 'holdings', 'cash', 'total', 'returns': date x ticker frames;
+        'fills': one row per fill (date, ticker, order, quantity, price, costs).
+    """
+    close_frame = bars["Close"]
+    index, tickers = close_frame.index, list(close_frame.columns)
+    n_bars, n_tickers = close_frame.shape
+
+    def values(name):
+        return bars[name].to_numpy(dtype=np.float64) if name in bars else np.full((n_bars, n_tickers), np.nan)
+
+    opens, highs, lows, closes = values("Open"), values("High"), values("Low"), values("Close")
+    volumes = values("Volume")
+    marks = close_frame.ffill().fillna(0.0).to_numpy(dtype=np.float64)
+    lot = np.maximum(_per_ticker(lot_size, tickers, 1).astype(np.int64), 1)
+
+    book = OrderBook()
+    if orders is not None and len(orders):
+        arrays = _order_arrays(orders, index, tickers)
+        arrays["quantity"] = _lots(arrays["quantity"], lot[arrays["ticker"]])
+        book.add(**arrays)
+
+    position = np.zeros(n_tickers, dtype=np.int64)
+    cash = np.full(n_tickers, float(initial_capital))
+    position_hist = np.empty((n_bars, n_tickers), dtype=np.int64)
+    cash_hist = np.empty((n_bars, n_tickers))
+    fills = []
+    column = {ticker: j for j, ticker in enumerate(tickers)}
+
+    t = 0
+    while t < n_bars:
+        book.activate(t)
+        if not len(book.open) and on_bar is None:
+            # nothing can happen until the next order goes live
+            stop = min(book.next_start(), n_bars)
+            position_hist[t:stop] = position
+            cash_hist[t:stop] = cash
+            t = stop
+            continue
+        if len(book.open):
+            ids, signed, price = _match(book, t, opens[t], highs[t], lows[t], volumes[t], lot,
+                                        slippage, participation)
+            if len(ids):
+                tick = book.ticker[ids]
+                value = signed * price
+                fee = transaction_costs(value, costs)
+                np.add.at(position, tick, signed)
+                np.add.at(cash, tick, -(value + fee))
+                fills.append((np.full(len(ids), t), tick, ids, signed, price, fee))
+            book.retire(t)
+
+        position_hist[t] = position
+        cash_hist[t] = cash
+
+        if on_bar is not None:
+            new = on_bar(BarState(t, index[t], closes[t], position_hist[t], cash_hist[t]))
+            if new:
+                tick = np.array([column[o.ticker] for o in new], dtype=np.int64)
+                book.add(
+                    ticker=tick,
+                    quantity=_lots(np.array([o.quantity for o in new], dtype=np.int64), lot[tick]),
+                    type=np.array([ORDER_TYPES[o.type] for o in new], dtype=np.int8),
+                    limit=np.array([o.limit for o in new], dtype=np.float64),
+                    stop=np.array([o.stop for o in new], dtype=np.float64),
+                    start=np.full(len(new), t + 1),
+                    expires=np.array([t + 1 if o.tif == "DAY" else _NEVER for o in new], dtype=np.int64),
+                )
+        t += 1
+
+    holdings = position_hist * marks
+    total = cash_hist + holdings
+    returns = np.full_like(total, np.nan)
+    returns[1:] = total[1:] / total[:-1] - 1.0
+
+    result = {
+        name: pd.DataFrame(array, index=index, columns=close_frame.columns)
+        for name, array in (("position", position_hist), ("holdings", holdings), ("cash", cash_hist),
+                            ("total", total), ("returns", returns))
+    }
+
+    if fills:
+        bar, tick, ids, signed, price, fee = (np.concatenate(parts) for parts in zip(*fills))
+    else:
+        bar = tick = ids = signed = np.empty(0, dtype=np.int64)
+        price = fee = np.empty(0)
+    result["fills"] = pd.DataFrame({
+        "date": index[bar],
+        "ticker": np.asarray(close_frame.columns)[tick],
+        "order": ids,
+        "quantity": signed,
+        "price": price,
+        "costs": fee,
+    })
+    return result
+
+
+def orders_from_signals(signals, shares=100, lot_size=1):
+    """
+    Market orders that move each ticker to signal x shares (whole lots), submitted at
+    the close of the bar where the signal changes and so filled at the next open.
+
+    signals: date x ticker frame (NaN carries the previous signal forward, leading
+    NaN is 0). Returns an orders DataFrame for run_events.
+    """
+    signals = signals.ffill().fillna(0.0)
+    tickers = list(signals.columns)
+    lot = np.maximum(_per_ticker(lot_size, tickers, 1).astype(np.int64), 1)
+    target = _lots(signals.to_numpy(dtype=np.float64) * shares, lot)
+    change = np.diff(target, axis=0, prepend=0)
+    rows, cols = np.nonzero(change)
+    return pd.DataFrame({
+        "date": signals.index[rows],
+        "ticker": np.asarray(tickers)[cols],
+        "quantity": change[rows, cols],
+        "type": "MKT",
+    })
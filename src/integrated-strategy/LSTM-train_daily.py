@@ -10,6 +10,7 @@ https://www.kaggle.com/taronzakaryan/predicting-stock-price-using-lstm-model-pyt
 """
 
 import os
+from functools import partial
 import numpy as np
 import random
 import pandas as pd
@@ -31,6 +32,7 @@ import torch.nn as nn
 from torch.autograd import Variable
 
 from models.LSTM import LSTM, predict_price
+from training import fit, checkpoint_path, predict, run_jobs
 from utils import read_strategy_data, load_data, merge_data_daily, visualise, gen_signal
 
 
@@ -70,13 +72,8 @@ def LSTM_predict(symbol, strategy, dir_name):
     print("input_dim: ", input_dim, ", hidden_dim: ", hidden_dim, ", num_layers: ", num_layers, ", output_dim", output_dim)
     print("num_epochs: ", num_epochs, ", batch_size: ", batch_size, ", lr: ", lr)
 
-    train = torch.utils.data.TensorDataset(x_train,y_train)
     test = torch.utils.data.TensorDataset(x_test,y_test)
 
-    train_loader = torch.utils.data.DataLoader(dataset=train,
-                                           batch_size=batch_size,
-                                           shuffle=False)
-
     test_loader = torch.utils.data.DataLoader(dataset=test,
                                           batch_size=batch_size,
                                           shuffle=False)
@@ -86,34 +83,11 @@ def LSTM_predict(symbol, strategy, dir_name):
     loss_fn = torch.nn.MSELoss()
     optimiser = torch.optim.Adam(model.parameters(), lr=lr)
 
-    hist = np.zeros(num_epochs)
-
-    # Number of steps to unroll
-    seq_dim = look_back - 1  
-
-    # Train model
-    for t in range(num_epochs):
-        for i, (train_data, train_label) in enumerate(train_loader):
-            # Forward pass
-            train_pred = model(train_data)
-            loss = loss_fn(train_pred, train_label)
-
-            hist[t] = loss.item()
-
-            # Zero out gradient, else they will accumulate between epochs
-            optimiser.zero_grad()
-
-            # Backward pass
-            loss.backward()
-
-            # Update parameters
-            optimiser.step()
+    # Train model; resumes from this ticker's checkpoint, or skips training if it is complete
+    hist = fit(model, optimiser, loss_fn, x_train, y_train, num_epochs, batch_size=batch_size,
+               checkpoint=checkpoint_path('saved_models', symbol + '_' + strategy + '_daily'))
+    y_train_pred = predict(model, x_train)
 
-        if t % 10 == 0 and t != 0:
-            y_train_pred = model(x_train)
-            loss = loss_fn(y_train_pred, y_train)
-            print("Epoch ", t, "MSE: ", loss.item())
-    
     # Plot training loss
     # plt.plot(hist, label="Training loss")
     # plt.legend()
@@ -121,7 +95,7 @@ def LSTM_predict(symbol, strategy, dir_name):
     # plt.savefig('output/0001_training_loss.png')
 
     # Make predictions
-    y_test_pred = model(x_test)
+    y_test_pred = predict(model, x_test)
 
     # Invert predictions
     y_train_pred = scaler.inverse_transform(y_train_pred.detach().numpy())
@@ -140,15 +114,25 @@ def LSTM_predict(symbol, strategy, dir_name):
     return y_train_pred, y_train, y_test_pred, y_test,model
 
 
-def main():         
-    dir_name = os.getcwd() # get current working directory
-    ticker = '0001'
+def train_and_save(ticker, strategy, dir_name):
+    y_train_pred, y_train, y_test_pred, y_test, model = LSTM_predict(ticker, strategy, dir_name)
 
-    y_train_pred, y_train, y_test_pred, y_test,model = LSTM_predict(ticker, 'macd-crossover', dir_name)
-    
     # save model
-    torch.save(model, 'saved_models/' + ticker + '_model') 
-    model_path = os.path.join(dir_name,'/models' + ticker + '_model')
+    torch.save(model, 'saved_models/' + ticker + '_model')
+
+
+def main(processes=None, torch_threads=1):
+    dir_name = os.getcwd() # get current working directory
+    ticker_list = ['0001']
+
+    # one job per ticker across worker processes, as in LSTM-train_wrapper.py;
+    # re-running resumes from saved_models/ checkpoints
+    errors = run_jobs(partial(train_and_save, strategy='macd-crossover', dir_name=dir_name), ticker_list,
+                      processes=processes, torch_threads=torch_threads)
+
+    failed = {ticker: error for ticker, error in errors.items() if error}
+    if failed:
+        print("Failed tickers:", failed)
 
 
 if __name__ == "__main__":
@@ -30,10 +30,11 @@ import torch.nn as nn
 from torch.autograd import Variable
 
 from models.LSTM import LSTM, predict_price
+from training import fit, predict
 from utils import read_data, load_data, visualise, gen_signal
 
 
-data_dir = "../../database/microeconomic_data/hkex_ticks_day/"
+data_dir = None # hkex_ticks_day via the binary price store
 
 # select date range
 dates = pd.date_range('2010-01-02','2016-12-31',freq='B')
@@ -99,31 +100,12 @@ optimiser = torch.optim.Adam(model.parameters(), lr=0.01)
 # for i in range(len(list(model.parameters()))):
 #     print(list(model.parameters())[i].size())
 
-hist = np.zeros(num_epochs)
-
 # Number of steps to unroll
 seq_dim = look_back - 1  
 
-# Train model
-
-for t in range(num_epochs):    
-    # Forward pass
-    y_train_pred = model(x_train)
-    loss = loss_fn(y_train_pred, y_train)
-
-    if t % 10 == 0 and t !=0:
-        print("Epoch ", t, "MSE: ", loss.item())
-
-    hist[t] = loss.item()
-
-    # Zero out gradient, else they will accumulate between epochs
-    optimiser.zero_grad()
-
-    # Backward pass
-    loss.backward()
-
-    # Update parameters
-    optimiser.step()
+# Train model: one step on the full training set per epoch
+hist = fit(model, optimiser, loss_fn, x_train, y_train, num_epochs)
+y_train_pred = predict(model, x_train)
   
 # plt.plot(hist, label="Training loss")
 # plt.legend()
@@ -131,7 +113,7 @@ for t in range(num_epochs):
 # plt.savefig('output/0001_training_loss.png')
 
 # Make predictions
-y_test_pred = model(x_test)
+y_test_pred = predict(model, x_test)
 
 # Invert predictions
 y_train_pred = scaler.inverse_transform(y_train_pred.detach().numpy())
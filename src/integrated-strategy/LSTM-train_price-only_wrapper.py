@@ -30,12 +30,13 @@ import torch.nn as nn
 from torch.autograd import Variable
 
 from models.LSTM import LSTM, predict_price
+from training import fit, checkpoint_path, predict, run_jobs
 from utils import read_data, load_data, visualise, gen_signal
 
 
 def LSTM_predict(symbol):
 
-    data_dir = "../../database/microeconomic_data/hkex_ticks_day/"
+    data_dir = None # hkex_ticks_day via the binary price store
 
     # select date range
     dates = pd.date_range('2010-01-02','2016-12-31',freq='B')
@@ -100,38 +101,18 @@ def LSTM_predict(symbol):
     # for i in range(len(list(model.parameters()))):
     #     print(list(model.parameters())[i].size())
 
-    hist = np.zeros(num_epochs)
+    # Train model; resumes from this ticker's checkpoint, or skips training if it is complete
+    hist = fit(model, optimiser, loss_fn, x_train, y_train, num_epochs, batch_size=None,
+               checkpoint=checkpoint_path('saved_models', symbol + '_price-only'))
+    y_train_pred = predict(model, x_train)
 
-    # Number of steps to unroll
-    seq_dim = look_back - 1  
-
-    # Train model
-    for t in range(num_epochs):    
-        # Forward pass
-        y_train_pred = model(x_train)
-        loss = loss_fn(y_train_pred, y_train)
-
-        if t % 10 == 0 and t !=0:
-            print("Epoch ", t, "MSE: ", loss.item())
-
-        hist[t] = loss.item()
-
-        # Zero out gradient, else they will accumulate between epochs
-        optimiser.zero_grad()
-
-        # Backward pass
-        loss.backward()
-
-        # Update parameters
-        optimiser.step()
-    
     # plt.plot(hist, label="Training loss")
     # plt.legend()
     # plt.show()
     # plt.savefig('output/0001_training_loss.png')
 
     # Make predictions
-    y_test_pred = model(x_test)
+    y_test_pred = predict(model, x_test)
 
     # Invert predictions
     y_train_pred = scaler.inverse_transform(y_train_pred.detach().numpy())
@@ -167,15 +148,16 @@ def LSTM_predict(symbol):
 
 
 
-def main():
+def main(processes=None, torch_threads=1):
     ticker_list = ['0001', '0002', '0003', '0004', '0005', '0016', '0019', '0113', '0168', '0175', '0386', '0388', '0669', '0700',
                    '0762', '0823', '0857', '0868', '0883', '0939', '0941', '0968', '1211', '1299', '1818', '2319', '2382', '2688', '2689', '2899']
-    
-    for ticker in ticker_list:
 
-        print("############ Ticker: " + ticker + " ############")
-        LSTM_predict(ticker)
-        print('\n')
+    # one job per ticker across worker processes; re-running resumes from saved_models/ checkpoints
+    errors = run_jobs(LSTM_predict, ticker_list, processes=processes, torch_threads=torch_threads)
+
+    failed = {ticker: error for ticker, error in errors.items() if error}
+    if failed:
+        print("Failed tickers:", failed)
 
 if __name__ == "__main__":
     main()
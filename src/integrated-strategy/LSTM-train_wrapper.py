@@ -10,6 +10,7 @@ https://www.kaggle.com/taronzakaryan/predicting-stock-price-using-lstm-model-pyt
 """
 
 import os
+from functools import partial
 import numpy as np
 import random
 import pandas as pd
@@ -31,6 +32,7 @@ import torch.nn as nn
 from torch.autograd import Variable
 
 from models.LSTM import LSTM, predict_price
+from training import fit, checkpoint_path, predict, run_jobs
 from utils import read_strategy_data, load_data, merge_data, visualise, gen_signal
 
 
@@ -71,13 +73,8 @@ def LSTM_predict(symbol, strategy):
     print("input_dim: ", input_dim, ", hidden_dim: ", hidden_dim, ", num_layers: ", num_layers, ", output_dim", output_dim)
     print("num_epochs: ", num_epochs, ", batch_size: ", batch_size, ", lr: ", lr)
 
-    train = torch.utils.data.TensorDataset(x_train,y_train)
     test = torch.utils.data.TensorDataset(x_test,y_test)
 
-    train_loader = torch.utils.data.DataLoader(dataset=train,
-                                           batch_size=batch_size,
-                                           shuffle=False)
-
     test_loader = torch.utils.data.DataLoader(dataset=test,
                                           batch_size=batch_size,
                                           shuffle=False)
@@ -87,41 +84,18 @@ def LSTM_predict(symbol, strategy):
     loss_fn = torch.nn.MSELoss()
     optimiser = torch.optim.Adam(model.parameters(), lr=lr)
 
-    hist = np.zeros(num_epochs)
-
-    # Number of steps to unroll
-    seq_dim = look_back - 1  
-
-    # Train model
-    for t in range(num_epochs):
-        for i, (train_data, train_label) in enumerate(train_loader):
-            # Forward pass
-            train_pred = model(train_data)
-            loss = loss_fn(train_pred, train_label)
-
-            hist[t] = loss.item()
-
-            # Zero out gradient, else they will accumulate between epochs
-            optimiser.zero_grad()
+    # Train model; resumes from this ticker's checkpoint, or skips training if it is complete
+    hist = fit(model, optimiser, loss_fn, x_train, y_train, num_epochs, batch_size=batch_size,
+               checkpoint=checkpoint_path('saved_models', symbol + '_' + strategy))
+    y_train_pred = predict(model, x_train)
 
-            # Backward pass
-            loss.backward()
-
-            # Update parameters
-            optimiser.step()
-
-        if t % 10 == 0 and t != 0:
-            y_train_pred = model(x_train)
-            loss = loss_fn(y_train_pred, y_train)
-            print("Epoch ", t, "MSE: ", loss.item())
-    
     # plt.plot(hist, label="Training loss")
     # plt.legend()
     # plt.show()
     # plt.savefig('output/0001_training_loss.png')
 
     # Make predictions
-    y_test_pred = model(x_test)
+    y_test_pred = predict(model, x_test)
 
     # Invert predictions
     y_train_pred = scaler.inverse_transform(y_train_pred.detach().numpy())
@@ -149,17 +123,18 @@ def LSTM_predict(symbol, strategy):
     
 
 
-def main():
+def main(processes=None, torch_threads=1):
     ticker_list = ['0001', '0002', '0003', '0004', '0005', '0016', '0019', '0168', '0175', '0386', '0669', '0700',
                    '0762', '0823', '0857', '0868', '0883', '0939', '0941', '0968', '1211', '1299', '1818', '2319', '2382', '2688', '2689', '2899']
-  
-    for ticker in ticker_list:
 
-        print("############ Ticker: " + ticker + " ############")
-        LSTM_predict(ticker, 'macd-crossover')
-        #LSTM_predict('0001','all')
-        
-        print('\n')    
+    # one job per ticker across worker processes; re-running resumes from saved_models/ checkpoints
+    errors = run_jobs(partial(LSTM_predict, strategy='macd-crossover'), ticker_list,
+                      processes=processes, torch_threads=torch_threads)
+    #run_jobs(partial(LSTM_predict, strategy='all'), ['0001'], processes=1)
+
+    failed = {ticker: error for ticker, error in errors.items() if error}
+    if failed:
+        print("Failed tickers:", failed)
     
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -17,7 +17,8 @@ from evaluate import PortfolioReturn, SharpeRatio, MaxDrawdown, CAGR
 from filters.macro_analysis import GetSensitivity, GetMacrodata
 
 # sentiment analysis
-from config import get_price_path, safe_symbol
+from config import safe_symbol
+from price_store import read_prices
 from filters.sentiment_analysis import SentimentFilter
 
 """
@@ -26,13 +27,8 @@ Technical analysis: generate signals with MACD crossover strategy.
 
 # load price data (symbol 0001 for this script)
 symbol = safe_symbol("0001")
-price_file = get_price_path(symbol)
-try:
-    df_whole = pd.read_csv(price_file, header=0, index_col="Date", parse_dates=True)
-except FileNotFoundError:
-    raise FileNotFoundError(f"Price file not found: {price_file}") from None
-except OSError as e:
-    raise OSError(f"Could not read price file {price_file}: {e}") from e
+# load price data (served from the binary price store)
+df_whole = read_prices(symbol)
 
 # select time range (for trading)
 start_date = pd.Timestamp('2017-01-01')
@@ -111,7 +107,7 @@ sharpe_ratio = SharpeRatio(portfolio)
 print("Sharpe ratio: {ratio:.4f} ".format(ratio = sharpe_ratio))
 
 # 3. Maximum drawdown
-maxDrawdown_fig, max_daily_drawdown, daily_drawdown = MaxDrawdown(df)
+maxDrawdown_fig, max_daily_drawdown, daily_drawdown = MaxDrawdown(portfolio)
 maxDrawdown_fig.suptitle('Baseline - Maximum drawdown', fontsize=14)
 #maxDrawdown_fig.savefig('./figures/baseline_maximum-drawdown')
 plt.show()
@@ -8,28 +8,30 @@ sys.path.append("..")
 sys.path.append("../technical-analysis_python/")
 mpl.use("tkagg")  # issues with Big Sur
 
-from config import get_price_path, safe_symbol
+from config import safe_symbol
+from price_store import read_prices
 from strategy.macd_crossover import macdCrossover
-from backtest import Backtest
+from backtest import BacktestPortfolio, BacktestBatch, BatchPanels
 from evaluate import PortfolioReturn, SharpeRatio, MaxDrawdown, CAGR
-from filters.macro_analysis import GetSensitivity, GetMacrodata
-from filters.sentiment_analysis import SentimentFilter
+from filters.macro_analysis import AlignMacrodata, GetSensitivity, GetMacrodata
+from filters.sentiment_analysis import SentimentFilter, starter_vader
+from walk_forward import WindowMoments, run_folds, summarise, walk_forward_splits
 
+# macro series in the order of GetSensitivity's result
+MACRO_NAMES = ('GDP', 'Unemployment rate', 'Property price')
 
-def baseline_strategy(symbol, start, end):
+
+def baseline_signals(symbol, start, end):
     """
     Technical analysis: generate signals with MACD crossover strategy.
     Macro and sentiment filters applied before backtest.
+
+    Returns (ticker, df, signals, filtered_signals) where df is the trading
+    window of the price data and filtered_signals is ready for backtesting.
     """
     symbol = safe_symbol(symbol)
-    filename = get_price_path(symbol)
-
-    try:
-        df_whole = pd.read_csv(filename, header=0, index_col="Date", parse_dates=True)
-    except FileNotFoundError:
-        raise FileNotFoundError(f"Price file not found: {filename}") from None
-    except OSError as e:
-        raise OSError(f"Could not read price file {filename}: {e}") from e
+    # load price data (served from the binary price store)
+    df_whole = read_prices(symbol)
 
     # select time range (for trading)
     start_date = pd.Timestamp(start)
@@ -51,14 +53,28 @@ def baseline_strategy(symbol, start, end):
     signal_fig = macd_cross.plot_signals(signals)
     plt.close()  # hide figure
 
+    # get ticker's sensitivity to macro data
+    sensitivities = GetSensitivity(filtered_df)
+
+    signals, filtered_signals = apply_filters(ticker, signals, sensitivities)
+
+    return ticker, df, signals, filtered_signals
+
+
+def apply_filters(ticker, signals, sensitivities, sentiment_scores=None):
+    """
+    Adjust signals with the macro factor, then filter them by sentiment.
+
+    sensitivities: (GDP, unemployment rate, property price) correlations from
+    GetSensitivity. Returns (signals with macro columns, filtered_signals).
+    """
+    s_gdp, s_unemploy, s_property = sensitivities
+
     """
     Macroecnomic analysis
     -
     Adjust bias in signals with macroeconomic data
     """
-    # get ticker's sensitivity to macro data
-    s_gdp, s_unemploy, s_property = GetSensitivity(filtered_df)
-
     # append signals with macro data
     signals = GetMacrodata(signals)
 
@@ -75,13 +91,13 @@ def baseline_strategy(symbol, start, end):
     - 
     Filter out signals that contrast with the sentiment label
     """
-    filtered_signals = SentimentFilter(ticker, signals)
+    filtered_signals = SentimentFilter(ticker, signals, sentiment_scores)
 
-    """
-    Backtesting & evaluation
-    """
-    portfolio, backtest_fig = Backtest(ticker, filtered_signals, df)
-    plt.close()  # hide figure
+    return signals, filtered_signals
+
+
+def report_results(ticker, start, end, portfolio, signals, df):
+    """Print the evaluation summary for one ticker and append it to baseline_results.csv."""
     print("Final total value: {value:.4f} ".format(
         value=portfolio["total"].iloc[-1]))
 
@@ -93,15 +109,6 @@ def baseline_strategy(symbol, start, end):
     print("No. of trade: {value}".format(
         value=trade_signals_num))
 
-    """
-    Plotting figures
-    """
-    
-    backtest_fig.suptitle('Baseline - Portfolio value', fontsize=14)
-    #backtest_filename = "./figures/" + symbol + "-baseline_portfolio-value"
-    #backtest_fig.savefig(backtest_filename)
-    #plt.show()
-
     # Evaluate strategy
 
     # 1. Portfolio return
@@ -110,6 +117,7 @@ def baseline_strategy(symbol, start, end):
     #returns_filename = './figures/' + symbol + '-baseline_portfolo-return'
     #returns_fig.savefig(returns_filename)
     #plt.show()
+    plt.close()  # hide figure
 
     # 2. Sharpe ratio
     sharpe_ratio = SharpeRatio(portfolio)
@@ -121,6 +129,7 @@ def baseline_strategy(symbol, start, end):
     #maxDrawdown_filename = './figures/' + symbol + '-baseline_maximum-drawdown'
     #maxDrawdown_fig.savefig(maxDrawdown_filename)
     #plt.show()
+    plt.close()  # hide figure
 
     # 4. Compound Annual Growth Rate
     cagr = CAGR(portfolio)
@@ -133,16 +142,102 @@ def baseline_strategy(symbol, start, end):
         )
 
 
+def baseline_strategy(symbol, start, end):
+    """Run the baseline pipeline and backtest for a single ticker."""
+    ticker, df, signals, filtered_signals = baseline_signals(symbol, start, end)
+
+    """
+    Backtesting & evaluation
+    """
+    portfolio = BacktestPortfolio(ticker, filtered_signals, df)
+    report_results(ticker, start, end, portfolio, signals, df)
+
+
+def walk_forward_data(symbol):
+    """
+    Inputs shared by every walk-forward fold of one ticker, computed once over its
+    full price history: prices, MACD signals (causal, so one pass serves every test
+    window), WindowMoments of price vs. each macro series for the sensitivities and
+    the ticker's sentiment scores, scored here once rather than in every worker.
+    """
+    symbol = safe_symbol(symbol)
+    df = read_prices(symbol)
+    df = df[~df.index.duplicated(keep='first')]
+
+    macd_cross = macdCrossover(df)
+    macd_cross.cal_MACD()
+    signals = macd_cross.gen_signals()
+
+    close = df['Close'].to_numpy()
+    macro_moments = [WindowMoments(close, AlignMacrodata(df.index, name)) for name in MACRO_NAMES]
+
+    ticker = symbol + ".HK"
+    return {'ticker': ticker, 'df': df, 'signals': signals, 'macro_moments': macro_moments,
+            'sentiment_scores': starter_vader(ticker)}
+
+
+def baseline_fold(data, fold):
+    """Fit macro sensitivities on the fold's training window, then backtest its test window."""
+    ticker = data['ticker']
+    # same values as GetSensitivity on the training window, without re-aligning the macro data
+    sensitivities = [moments.corr(fold.train.start, fold.train.stop) for moments in data['macro_moments']]
+
+    df = data['df'].iloc[fold.test]
+    signals, filtered_signals = apply_filters(ticker, data['signals'].iloc[fold.test].copy(),
+                                              sensitivities, data['sentiment_scores'])
+    portfolio = BacktestPortfolio(ticker, filtered_signals, df)
+
+    return {
+        'start': df.index[0],
+        'end': df.index[-1],
+        'total_return': portfolio['total'].iloc[-1] / portfolio['total'].iloc[0] - 1.0,
+        'sharpe': SharpeRatio(portfolio),
+        'cagr': CAGR(portfolio),
+        'trades': int((signals['positions'] == 1).sum()),
+    }
+
+
+def walk_forward(symbol, train_size=504, test_size=126, expanding=False, processes=None):
+    """
+    Walk-forward evaluation of the baseline strategy for one ticker: macro sensitivities
+    are fitted on each training window (2 years by default) and the strategy is
+    backtested on the following test window (6 months). Returns one row per fold.
+    """
+    data = walk_forward_data(symbol)
+    folds = walk_forward_splits(len(data['df']), train_size, test_size, expanding=expanding)
+    results = run_folds(baseline_fold, data, folds, processes)
+
+    print("############ Ticker: " + data['ticker'] + " (" + str(len(folds)) + " folds) ############")
+    print(summarise(results))
+    return results
+
+
 def main():
     ticker_list = ['0001', '0002', '0003', '0004', '0005', '0016', '0019', '0168', '0175', '0386', '0388', '0669', '0700',
                    '0762', '0823', '0857', '0868', '0883', '0939', '0941', '0968', '1211', '1299', '1818', '2319', '2382', '2688', '2689', '2899']
 
-    for ticker in ticker_list:
-        start = '2020-06-10'
-        end = '2021-03-03'
+    start = '2020-06-10'
+    end = '2021-03-03'
+
+    # Generate filtered signals per ticker, then backtest the whole universe in one pass
+    frames, closes, filtered, raw_signals = {}, {}, {}, {}
+    for symbol in ticker_list:
+        ticker, df, signals, filtered_signals = baseline_signals(symbol, start, end)
+        frames[ticker] = df
+        closes[ticker] = df['Close']
+        filtered[ticker] = filtered_signals['signal']
+        raw_signals[ticker] = signals
+
+    # each ticker keeps only the dates its prices and signals share, as in BacktestPortfolio
+    prices, signal_panel = BatchPanels(closes, filtered)
+    result = BacktestBatch(prices, signal_panel)
+
+    for ticker, signals in raw_signals.items():
+        portfolio = pd.DataFrame({name: frame[ticker] for name, frame in result.items()})
+        portfolio = portfolio.loc[prices[ticker].dropna().index]
 
         print("############ Ticker: " + ticker + " ############")
-        baseline_strategy(ticker, start, end)
+        report_results(ticker, start, end, portfolio, signals, frames[ticker])
         print('\n')
 
 
@@ -1,30 +1,14 @@
-from ibapi.client import EClient
-from ibapi.wrapper import EWrapper
 from ibapi.contract import Contract
 from ibapi.order import *
+from ib_async import IBClient
 from daily_trading_strategy import main as run_daily_trading_strategy
 
-import threading
-import datetime, time
+import asyncio
 from datetime import date
 import os
 import pandas as pd
 
-class App(EWrapper, EClient):
-    def __init__(self):
-        EClient.__init__(self, self)
-
-    def nextValidId(self, orderId: int):
-        super().nextValidId(orderId)
-        self.nextorderId = orderId
-        print('The next valid order id is: ', self.nextorderId)
-
-    def orderStatus(self, orderId, status, filled, remaining, avgFillPrice, permId, parentId, lastFillPrice,
-                    clientId, whyHeld, mktCapPrice):
-        print("OrderStatus. Id: ", orderId, ", Status: ", status, ", Filled: ", filled, ", Remaining: ", remaining,
-                ", AvgFillPrice: ", avgFillPrice, ", PermId: ", permId, ", ParentId: ", parentId, ", LastFillPrice: ",
-              lastFillPrice, ", ClientId: ", clientId, ", WhyHeld: ", whyHeld, ", MktCapPrice: ", mktCapPrice)
-
+class App(IBClient):
     def openOrder(self, orderId, contract, order, orderState):
         print("OpenOrder. PermID: ", order.permId, ", ClientId: ", order.clientId, ", OrderId: ", orderId, ", Account: ", order.account, ", Symbol: ", contract.symbol, ", SecType: ",
               contract.secType, " , Exchange: ", contract.exchange, ", Action: ", order.action, ", OrderType: ",
@@ -37,77 +21,53 @@ class App(EWrapper, EClient):
               " - ", execution.execId, ", ", execution.orderId, ", ", execution.shares , ", ", execution.lastLiquidity)
 
 
-def run_loop():
-    app.run()
-
-# Connect to IB TWS
-app = App()
-app.connect('127.0.0.1', 7497, 0)
-
-app.nextorderId = None
-
-# Start the socket in a thread
-api_thread = threading.Thread(target=run_loop)
-api_thread.start()
-
-# Allow time for server connection
-time.sleep(1)
+async def main():
+    # Call main() function in daily_trading_strategy.py to capture signal
+    run_daily_trading_strategy()
 
-# Call main() function in daily_trading_strategy.py to capture signal
-run_daily_trading_strategy()
+    # Read in today's signal
+    dir_name = os.getcwd() + '/database/daily_trading_data/'
 
-# Read in today's signal
-dir_name = os.getcwd() + '/database/daily_trading_data/'
-    
-# Set ticker to trade
-ticker = "0001"
-result_path = os.path.join(dir_name,'signal/' + ticker.zfill(4) + '-signal.csv')
-df = pd.read_csv(result_path)
+    # Set ticker to trade
+    ticker = "0001"
+    result_path = os.path.join(dir_name,'signal/' + ticker.zfill(4) + '-signal.csv')
+    df = pd.read_csv(result_path)
 
-# Create contracts - HK stock
-today = date.today()
-today = today.strftime("%Y%m%d")
-contract = Contract()
-contract.symbol = "1" # 0001.HK
-contract.secType = "STK"
-contract.exchange = "SEHK"
-contract.currency = "HKD"
+    # Create contracts - HK stock
+    today = date.today()
+    today = today.strftime("%Y%m%d")
+    contract = Contract()
+    contract.symbol = "1" # 0001.HK
+    contract.secType = "STK"
+    contract.exchange = "SEHK"
+    contract.currency = "HKD"
 
-order = Order()
+    order = Order()
 
-print("\n")
-print("############ Summary ############")
-print("Today's signal is: " + str(df['signal'].iloc[0]))
+    print("\n")
+    print("############ Summary ############")
+    print("Today's signal is: " + str(df['signal'].iloc[0]))
 
-# BUY signal detected
-if (df['signal'].iloc[0] == 1):
+    if df['signal'].iloc[0] == 0:
+        print('As signal == 0, no order is made.')
+        return
 
-    # Create BUY order    
-    order.action = 'BUY'
+    # BUY or SELL signal detected
+    order.action = 'BUY' if df['signal'].iloc[0] == 1 else 'SELL'
     order.totalQuantity = 500
     order.orderType = 'MKT'
-    
-    print(today)
-    order.goodAfterTime = today + " 16:29:00 "
-
-    print('Placing BUY order...')
-    app.placeOrder(app.nextorderId, contract, order)
 
-# SELL signal detected
-elif (df['signal'].iloc[0] == -1):
-    
-    # Create SELL order
-    order.action = 'SELL'
-    order.totalQuantity = 500
-    order.orderType = 'MKT'
-    
+    print(today)
     order.goodAfterTime = today + " 16:29:00 "
 
-    print('Placing SELL order...')
-    app.placeOrder(app.nextorderId, contract, order)
+    # Connect to IB TWS (IB_HOST, IB_PORT, IB_CLIENT_ID); ready once the next valid order id arrives
+    async with App() as app:
+        print('The next valid order id is: ', app.nextOrderId)
+        print('Placing ' + order.action + ' order...')
+        # returns as soon as TWS has accepted the order
+        status = await app.place_order(contract, order)
+        print("OrderStatus. Id: ", status.orderId, ", Status: ", status.status, ", Filled: ", status.filled,
+              ", Remaining: ", status.remaining, ", AvgFillPrice: ", status.avgFillPrice)
 
-else:
-    print('As signal == 0, no order is made.')
 
-time.sleep(5)
-app.disconnect()
\ No newline at end of file
+asyncio.run(main())
@@ -7,6 +7,8 @@ import pandas as pd
 import nltk
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
 
+sys.path.append("..")
+
 from models.sentiment.sentiment_vader import starter_vader
 from models.sentiment.sentiment_text_blob import starter_textblob
 from models.sentiment.collect_news_aastock import get_news_aastock
@@ -0,0 +1,95 @@
+"""
+Download daily bars for the HKEX universe from TWS, all tickers concurrently.
+
+The universe is every ticker with a price CSV under the data root
+(microeconomic_data/hkex_ticks_day/hkex_<ticker>.csv). Requests go out through
+IBClient.download_bars, so up to --in-flight of them are outstanding at once
+instead of one blocking connect / request / sleep per contract.
+
+Those CSVs hold split- and dividend-adjusted prices, so the bars are requested
+as ADJUSTED_LAST (adjusted as of today), not raw TRADES. They are merged into
+each CSV, replacing existing dates; the older rows are rescaled so the two
+series agree on the first date both have, which carries any corporate action
+since the CSV was last adjusted back through its history. The price store picks
+the changes up on the next read.
+
+Usage (from this directory, with TWS or IB Gateway running):
+    python download_hkex_bars.py [--duration "1 M"] [--tickers 0001 0005] [--in-flight 50]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from config import get_data_root
+from price_store import HKEX_DAY, PREFIXES, list_symbols
+
+from ibapi.contract import Contract
+from ib_async import MAX_HISTORICAL_IN_FLIGHT, IBClient, bars_frame
+
+
+def hkex_contract(ticker):
+    """SEHK stock contract for a zero-padded ticker such as '0001'."""
+    contract = Contract()
+    contract.symbol = str(int(ticker))
+    contract.secType = "STK"
+    contract.exchange = "SEHK"
+    contract.currency = "HKD"
+    return contract
+
+
+def merge_bars(path, frame):
+    """
+    Merge new adjusted daily bars into a price CSV, replacing rows for dates already present.
+
+    Older rows are multiplied by new / old Close on the first date both have, so
+    the history stays continuous when the adjustment base has moved. Volume is
+    left as stored.
+    """
+    if os.path.exists(path):
+        old = pd.read_csv(path, index_col="Date", parse_dates=True)
+        overlap = old.index.intersection(frame.index)
+        if len(overlap):
+            first = overlap[0]
+            factor = frame.at[first, "Close"] / old.at[first, "Close"]
+            prices = ["Open", "High", "Low", "Close"]
+            old[prices] = old[prices] * factor
+        frame = pd.concat([old[~old.index.isin(frame.index)], frame]).sort_index()
+    frame.to_csv(path, index_label="Date")
+
+
+async def download(tickers, duration, in_flight, timeout):
+    contracts = {ticker: hkex_contract(ticker) for ticker in tickers}
+    async with IBClient(max_in_flight=in_flight) as ib:
+        return await ib.download_bars(contracts, duration=duration, bar_size="1 day",
+                                      what_to_show="ADJUSTED_LAST", timeout=timeout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download HKEX daily bars from TWS in parallel.")
+    parser.add_argument("--duration", default="1 M", help='TWS duration string, e.g. "1 M" or "5 Y"')
+    parser.add_argument("--tickers", nargs="*", help="tickers to download (default: every hkex CSV)")
+    parser.add_argument("--in-flight", type=int, default=MAX_HISTORICAL_IN_FLIGHT)
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds per request once sent")
+    args = parser.parse_args()
+
+    tickers = args.tickers or list_symbols(HKEX_DAY)
+    results = asyncio.run(download(tickers, args.duration, args.in_flight, args.timeout))
+
+    out_dir = os.path.join(get_data_root(), HKEX_DAY)
+    failed = []
+    for ticker, bars in results.items():
+        if isinstance(bars, Exception) or not bars:
+            failed.append((ticker, bars))
+            continue
+        merge_bars(os.path.join(out_dir, f"{PREFIXES[HKEX_DAY]}{ticker}.csv"), bars_frame(bars))
+    print(f"{len(results) - len(failed)} of {len(results)} tickers updated")
+    for ticker, error in failed:
+        print(ticker, error or "no bars")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,22 +6,22 @@ import sys
 import os
 
 import nltk
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
 from nltk.corpus import twitter_samples
 from sklearn.model_selection import train_test_split
 
+from models.sentiment.vader_cache import load_cache, score_headlines
+
 # directory to sentiment data
 dir_name = '../../database_real/sentiment_data/'
 
-# initialise sentiment analyser
-analyser = SentimentIntensityAnalyzer()
-
 # input: @signals, signals dataframe
 # output: @filtered_signals, filtered signals dataframe
 
 
-def SentimentFilter(ticker, signals):
-    sentiment_scores = starter_vader(ticker)
+# sentiment_scores: output of starter_vader(ticker), if already loaded
+def SentimentFilter(ticker, signals, sentiment_scores=None):
+    if sentiment_scores is None:
+        sentiment_scores = starter_vader(ticker)
     sentiment_scores['dates'] = pd.to_datetime(sentiment_scores['dates'])
 
     # check if sentiment label contrasting with buy/sell signals
@@ -65,7 +65,10 @@ def starter_vader(ticker_full):
                         'data-' + ticker.zfill(5) + '-aastock.csv')
     df = pd.read_csv(path, names=['dates', 'news'])
     # read append the compound vader score to the pandas dataframe
+    cached = len(load_cache())
     df = read_news_path(df)
+    # no headline newly scored: the stored scores are still current
+    rescored = len(load_cache()) > cached
     # pass in the threshold to get the vader label
     df = find_news_pred_label(df, 0.01)
 
@@ -77,8 +80,8 @@ def starter_vader(ticker_full):
     # merge the df pandas with the hsi_average
     df = merge_actual_label(df, hsi_movement_path)
 
-    # store to csv file if the dataset is not empty
-    if (df.empty == False):
+    # store to csv file if the dataset is not empty and has changed
+    if (df.empty == False) and (rescored or not os.path.exists(result_path)):
         df.to_csv(result_path, index=False)
 
     return df
@@ -88,12 +91,8 @@ def starter_vader(ticker_full):
 
 def read_news_path(df):
     #print('Reading in datasets...')
-    cs = []
-    # append a compound score to every news row
-    for row in range(len(df)):
-        cs.append(analyser.polarity_scores(df['news'].iloc[row])['compound'])
-    # append the column to original dataset
-    df['compound_vader_score'] = cs
+    # compound score for every news row; only headlines not in the score cache are scored
+    df['compound_vader_score'] = score_headlines(df['news'])
     return df
 
 
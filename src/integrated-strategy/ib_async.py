@@ -0,0 +1,450 @@
+"""
+asyncio client for TWS / IB Gateway on top of the vendored ibapi protocol code.
+
+IBClient reuses EClient's request encoding, comm.FrameBuffer framing and the
+Decoder, but reads the socket on the event loop instead of a reader thread plus
+a message loop thread. Requests are awaitable and complete as soon as TWS has
+answered, so scripts no longer sleep a fixed time for the connection or results:
+
+    async def main():
+        async with IBClient() as ib:                   # connected once nextValidId arrives
+            bars = await ib.historical_data(contract, duration='1 M', bar_size='1 day')
+            quotes = await ib.tick_snapshot(contract)          # {'BID': ..., 'ASK': ..., ...}
+            many = await ib.download_bars({'0001': c1, '0002': c2}, duration='1 Y')
+            summary = await ib.account_summary(tags='$LEDGER:HKD')
+            status = await ib.place_order(contract, order)   # once TWS has accepted it
+            async with aclosing(ib.market_data(contract)) as ticks:   # cancels on exit
+                async for tick in ticks:
+                    ...
+
+    asyncio.run(main())
+
+Each request registers its reqId with a future and an accumulator, which the
+callbacks fill and the matching *End callback (historicalDataEnd,
+accountSummaryEnd, tickSnapshotEnd) or an error for the reqId completes, so any
+number of requests can be outstanding at once. Historical requests pass through
+a Pacer that bounds how many are in flight (TWS allows about 50) and can space
+them out, which lets download_bars fetch a whole universe concurrently.
+
+Connection details default to IB_HOST, IB_PORT and IB_CLIENT_ID from the environment.
+"""
+import asyncio
+import itertools
+import logging
+import os
+from collections import namedtuple
+
+from ibapi import comm
+from ibapi.client import EClient
+from ibapi.common import NO_VALID_ID
+from ibapi.decoder import Decoder
+from ibapi.server_versions import MAX_CLIENT_VER, MIN_CLIENT_VER
+from ibapi.ticktype import TickTypeEnum
+from ibapi.utils import BadMessage
+from ibapi.wrapper import EWrapper
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+IB_HOST = os.environ.get("IB_HOST", "127.0.0.1")
+IB_PORT = int(os.environ.get("IB_PORT", "7497"))
+IB_CLIENT_ID = int(os.environ.get("IB_CLIENT_ID", "0"))
+
+# TWS rejects more than 50 simultaneous open historical data requests
+MAX_HISTORICAL_IN_FLIGHT = 50
+
+# order states after which TWS sends no further status for the order
+DONE_STATES = frozenset(["Filled", "Cancelled", "ApiCancelled", "Inactive"])
+# order states that show TWS has accepted (or already finished) an order
+ACCEPTED_STATES = frozenset(["PreSubmitted", "Submitted"]) | DONE_STATES
+
+Tick = namedtuple("Tick", ["field", "name", "value"])
+Tick.__doc__ = """A market data tick: TickTypeEnum field, its name, and the price or size."""
+
+OrderStatus = namedtuple("OrderStatus", ["orderId", "status", "filled", "remaining", "avgFillPrice",
+                                         "lastFillPrice"])
+
+
+class IBError(Exception):
+    """An error TWS reported for a request."""
+    def __init__(self, reqId, code, message):
+        super().__init__(f"{code}: {message} (request {reqId})")
+        self.reqId = reqId
+        self.code = code
+
+
+def bars_frame(bars):
+    """BarData list from historical_data as an OHLCV DataFrame indexed by Date (daily bars)."""
+    frame = pd.DataFrame({
+        "Date": pd.to_datetime([bar.date for bar in bars], format="%Y%m%d"),
+        "Open": [bar.open for bar in bars],
+        "High": [bar.high for bar in bars],
+        "Low": [bar.low for bar in bars],
+        "Close": [bar.close for bar in bars],
+        "Volume": [bar.volume for bar in bars],
+    })
+    return frame.set_index("Date")
+
+
+class Pacer:
+    """
+    Bounds the requests in flight and spaces their sends.
+
+    Use as `async with pacer:` around sending a request and awaiting its answer:
+    at most `max_in_flight` bodies run at once, and each body starts at least
+    `min_interval` seconds after the previous one actually started.
+    """
+    def __init__(self, max_in_flight=MAX_HISTORICAL_IN_FLIGHT, min_interval=0.0):
+        self.max_in_flight = max_in_flight
+        self.min_interval = min_interval
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._spacing = asyncio.Lock()
+        self._nextStart = 0.0
+
+    async def __aenter__(self):
+        await self._slots.acquire()
+        if self.min_interval > 0:
+            try:
+                async with self._spacing:
+                    loop = asyncio.get_running_loop()
+                    wait = self._nextStart - loop.time()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    # measured from the actual start, as the sleep may wake late
+                    self._nextStart = loop.time() + self.min_interval
+            except BaseException:
+                self._slots.release()
+                raise
+        return self
+
+    async def __aexit__(self, *exc):
+        self._slots.release()
+
+
+# market data notices sent before the data itself: 10167 delayed data is shown instead
+# of live, 10090 part of the requested data is not subscribed
+MARKET_DATA_NOTICES = (10167, 10090)
+
+
+def _is_warning(code):
+    # 2100-2199: data farm and connectivity notices; 399: order message warnings
+    return 2100 <= code < 2200 or code == 399 or code in MARKET_DATA_NOTICES
+
+
+class _Transport:
+    """The part of ibapi.connection.Connection that EClient uses, over an asyncio stream."""
+    def __init__(self, writer):
+        self.writer = writer
+
+    def isConnected(self):
+        return self.writer is not None and not self.writer.is_closing()
+
+    def sendMsg(self, msg):
+        self.writer.write(msg)
+        return len(msg)
+
+    def disconnect(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class IBClient(EWrapper, EClient):
+    """
+    asyncio TWS client: awaitable requests and async iterators over EClient / EWrapper.
+
+    Subclasses can still override EWrapper callbacks; call super() to keep the
+    awaitables working.
+
+    Parameters
+    ----------
+    max_in_flight : int
+        Historical data requests outstanding at once; more wait for a free slot.
+    min_interval : float
+        Minimum seconds between sending historical data requests (0: no spacing),
+        e.g. 10 to stay within the 60 requests per 10 minutes limit on small bars.
+    """
+    def __init__(self, max_in_flight=MAX_HISTORICAL_IN_FLIGHT, min_interval=0.0):
+        EWrapper.__init__(self)
+        EClient.__init__(self, self)
+        # request ids stay clear of order ids, as TWS reports errors for both by id
+        self._reqIds = itertools.count(1000000)
+        self._pending = {}  # reqId -> (future, accumulator: list of items or dict of ticks)
+        self._streams = {}  # reqId -> asyncio.Queue of Tick / IBError
+        self._orders = {}   # orderId -> (future, states that complete it)
+        self._nextId = None
+        self._readTask = None
+        self.nextOrderId = None
+        self.pacer = Pacer(max_in_flight, min_interval)
+
+    async def __aenter__(self):
+        if not self.isConnected():
+            await self.connect()
+        return self
+
+    async def __aexit__(self, *exc):
+        self.disconnect()
+
+    async def connect(self, host=IB_HOST, port=IB_PORT, clientId=IB_CLIENT_ID, timeout=10.0):
+        """Connect and start the API; returns the next valid order id."""
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        self.host, self.port, self.clientId = host, port, clientId
+        self.conn = _Transport(writer)
+        self.setConnState(EClient.CONNECTING)
+        writer.write(b"API\0" + comm.make_msg("v%d..%d" % (MIN_CLIENT_VER, MAX_CLIENT_VER)))
+
+        self.decoder = Decoder(self, self.serverVersion())
+        frames = comm.FrameBuffer()
+        fields = await asyncio.wait_for(self._handshake(reader, frames), timeout)
+        self.serverVersion_ = int(fields[0])
+        self.connTime = fields[1].decode(errors="backslashreplace")
+        self.decoder.serverVersion = self.serverVersion_
+        self.setConnState(EClient.CONNECTED)
+
+        self._nextId = asyncio.get_running_loop().create_future()
+        self._readTask = asyncio.ensure_future(self._read(reader, frames))
+        self.startApi()
+        self.connectAck()
+        return await asyncio.wait_for(asyncio.shield(self._nextId), timeout)
+
+    async def _handshake(self, reader, frames):
+        # sometimes news arrives before the server version, as in EClient.connect
+        while True:
+            for msg in iter(frames.read_frame, None):
+                fields = comm.read_fields(msg)
+                if len(fields) == 2:
+                    return fields
+                self.decoder.interpret(fields)
+            data = await reader.read(65536)
+            if not data:
+                raise ConnectionError("connection closed during the handshake")
+            frames.write(data)
+
+    async def _read(self, reader, frames):
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                frames.write(data)
+                for msg in frames.read_frames():
+                    try:
+                        self.decoder.interpret(comm.read_fields(msg))
+                    except BadMessage:
+                        raise
+                    except Exception:
+                        logger.exception("error handling message %s", msg)
+        except (BadMessage, ConnectionError) as e:
+            logger.info("reader stopped: %s", e)
+        finally:
+            if self.isConnected():
+                self.disconnect()
+            self._failAll(ConnectionError("disconnected from TWS"))
+
+    def disconnect(self):
+        EClient.disconnect(self)
+        if self._readTask is not None and self._readTask is not asyncio.current_task():
+            self._readTask.cancel()
+        self._readTask = None
+
+    def _failAll(self, exc):
+        for future, _ in self._pending.values():
+            if not future.done():
+                future.set_exception(exc)
+        for future, _ in self._orders.values():
+            if not future.done():
+                future.set_exception(exc)
+        for queue in self._streams.values():
+            queue.put_nowait(exc)
+        if self._nextId is not None and not self._nextId.done():
+            self._nextId.set_exception(exc)
+
+    ########################################################################
+    # awaitable requests
+    ########################################################################
+
+    def _request(self, items=None):
+        reqId = next(self._reqIds)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[reqId] = (future, [] if items is None else items)
+        return reqId, future
+
+    async def _result(self, reqId, future, cancel=None):
+        # cancel: EClient method that cancels the request if it is abandoned (e.g. a timeout)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if cancel is not None and self.isConnected():
+                cancel(reqId)
+            raise
+        finally:
+            self._pending.pop(reqId, None)
+
+    async def next_valid_id(self):
+        """The next valid order id (reqIds)."""
+        self._nextId = asyncio.get_running_loop().create_future()
+        self.reqIds(-1)
+        return await self._nextId
+
+    async def historical_data(self, contract, end="", duration="1 M", bar_size="1 day",
+                              what_to_show="TRADES", use_rth=1, format_date=1, timeout=None):
+        """
+        Historical bars (list of BarData), once historicalDataEnd arrives.
+
+        The request waits for a slot in self.pacer before it is sent; `timeout`
+        (seconds) counts from the send, after which the request is cancelled and
+        asyncio.TimeoutError raised.
+        """
+        async with self.pacer:
+            reqId, future = self._request()
+            self.reqHistoricalData(reqId, contract, end, duration, bar_size, what_to_show, use_rth,
+                                   format_date, False, [])
+            result = self._result(reqId, future, self.cancelHistoricalData)
+            return await (result if timeout is None else asyncio.wait_for(result, timeout))
+
+    async def download_bars(self, contracts, **kwargs):
+        """
+        Historical bars for many contracts, requested concurrently.
+
+        Parameters
+        ----------
+        contracts : dict
+            Key (e.g. ticker) -> Contract.
+        **kwargs
+            Passed to historical_data (end, duration, bar_size, timeout, ...).
+
+        Returns
+        -------
+        dict
+            Key -> list of BarData, or the exception (IBError, asyncio.TimeoutError)
+            for contracts that failed, so one bad contract does not stop the rest.
+        """
+        keys = list(contracts)
+        results = await asyncio.gather(*(self.historical_data(contracts[key], **kwargs) for key in keys),
+                                       return_exceptions=True)
+        for result in results:
+            if isinstance(result, ConnectionError):
+                raise result
+        return dict(zip(keys, results))
+
+    async def account_summary(self, group="All", tags="$LEDGER"):
+        """Account summary rows (account, tag, value, currency), once accountSummaryEnd arrives."""
+        reqId, future = self._request()
+        self.reqAccountSummary(reqId, group, tags)
+        try:
+            return await self._result(reqId, future)
+        finally:
+            if self.isConnected():
+                self.cancelAccountSummary(reqId)
+
+    async def tick_snapshot(self, contract, generic_ticks=""):
+        """Snapshot quote: dict of tick name -> price or size, once tickSnapshotEnd arrives."""
+        reqId, future = self._request({})
+        self.reqMktData(reqId, contract, generic_ticks, True, False, [])
+        return await self._result(reqId, future, self.cancelMktData)
+
+    async def place_order(self, contract, order, orderId=None, until=ACCEPTED_STATES):
+        """Place an order; returns the first OrderStatus whose status is in `until`."""
+        if orderId is None:
+            orderId = self.nextOrderId if self.nextOrderId is not None else await self.next_valid_id()
+        self.nextOrderId = orderId + 1
+        return await self._order_status(orderId, until, self.placeOrder, orderId, contract, order)
+
+    async def cancel_order(self, orderId, until=DONE_STATES):
+        """Cancel an order; returns the first OrderStatus whose status is in `until`."""
+        return await self._order_status(orderId, until, self.cancelOrder, orderId)
+
+    async def _order_status(self, orderId, until, send, *args):
+        future = asyncio.get_running_loop().create_future()
+        self._orders[orderId] = (future, frozenset(until))
+        send(*args)
+        try:
+            return await future
+        finally:
+            self._orders.pop(orderId, None)
+
+    async def market_data(self, contract, generic_ticks=""):
+        """
+        Stream price and size ticks (Tick).
+
+        The subscription is cancelled when the generator is closed; wrap it in
+        contextlib.aclosing so that happens as soon as the loop is left.
+        """
+        reqId = next(self._reqIds)
+        queue = self._streams[reqId] = asyncio.Queue()
+        self.reqMktData(reqId, contract, generic_ticks, False, False, [])
+        try:
+            while True:
+                tick = await queue.get()
+                if isinstance(tick, Exception):
+                    raise tick
+                yield tick
+        finally:
+            del self._streams[reqId]
+            if self.isConnected():
+                self.cancelMktData(reqId)
+
+    ########################################################################
+    # EWrapper callbacks that complete the requests
+    ########################################################################
+
+    def nextValidId(self, orderId:int):
+        self.nextOrderId = orderId
+        if self._nextId is not None and not self._nextId.done():
+            self._nextId.set_result(orderId)
+
+    def historicalData(self, reqId, bar):
+        if reqId in self._pending:
+            self._pending[reqId][1].append(bar)
+
+    def historicalDataEnd(self, reqId:int, start:str, end:str):
+        self._complete(reqId)
+
+    def accountSummary(self, reqId:int, account:str, tag:str, value:str, currency:str):
+        if reqId in self._pending:
+            self._pending[reqId][1].append((account, tag, value, currency))
+
+    def accountSummaryEnd(self, reqId:int):
+        self._complete(reqId)
+
+    def _complete(self, reqId):
+        future, items = self._pending.get(reqId, (None, None))
+        if future is not None and not future.done():
+            future.set_result(items)
+
+    def orderStatus(self, orderId, status, filled, remaining, avgFillPrice, permId, parentId,
+                    lastFillPrice, clientId, whyHeld, mktCapPrice):
+        future, until = self._orders.get(orderId, (None, ()))
+        if future is not None and not future.done() and status in until:
+            future.set_result(OrderStatus(orderId, status, filled, remaining, avgFillPrice, lastFillPrice))
+
+    def tickPrice(self, reqId, tickType, price, attrib):
+        self._tick(reqId, tickType, price)
+
+    def tickSize(self, reqId, tickType, size):
+        self._tick(reqId, tickType, size)
+
+    def _tick(self, reqId, tickType, value):
+        if reqId in self._streams:
+            self._streams[reqId].put_nowait(Tick(tickType, TickTypeEnum.to_str(tickType), value))
+        elif reqId in self._pending:
+            self._pending[reqId][1][TickTypeEnum.to_str(tickType)] = value
+
+    def tickSnapshotEnd(self, reqId:int):
+        self._complete(reqId)
+
+    def error(self, reqId, errorCode:int, errorString:str):
+        if reqId == NO_VALID_ID or _is_warning(errorCode):
+            logger.info("TWS message %d: %s", errorCode, errorString)
+            return
+        exc = IBError(reqId, errorCode, errorString)
+        for futures in (self._pending, self._orders):
+            future, _ = futures.get(reqId, (None, None))
+            if future is not None and not future.done():
+                future.set_exception(exc)
+                return
+        if reqId in self._streams:
+            self._streams[reqId].put_nowait(exc)
+            return
+        logger.error("TWS error for request %d: %d %s", reqId, errorCode, errorString)
@@ -45,6 +45,8 @@ class EClient(object):
         self.msg_queue = queue.Queue()
         self.wrapper = wrapper
         self.decoder = None
+        self.batchCallback = None
+        self.batchDispatch = True
         self.reset()
 
 
@@ -149,16 +151,19 @@ class EClient(object):
             self.conn.sendMsg(msg2)
 
             self.decoder = decoder.Decoder(self.wrapper, self.serverVersion())
+            frames = comm.FrameBuffer()
             fields = []
 
             #sometimes I get news before the server version, thus the loop
             while len(fields) != 2:
                 self.decoder.interpret(fields)
-                buf = self.conn.recvMsg()
-                logger.debug("ANSWER %s", buf)
-                if len(buf) > 0:
-                    (size, msg, rest) = comm.read_msg(buf)
-                    logger.debug("size:%d msg:%s rest:%s|", size, msg, rest)
+                msg = frames.read_frame()
+                if msg is None:
+                    buf = self.conn.recvMsg()
+                    logger.debug("ANSWER %s", buf)
+                    frames.write(buf)
+                    msg = frames.read_frame()
+                if msg is not None:
                     fields = comm.read_fields(msg)
                     logger.debug("fields %s", fields)
                 else:
@@ -173,7 +178,8 @@ class EClient(object):
 
             self.setConnState(EClient.CONNECTED)
 
-            self.reader = reader.EReader(self.conn, self.msg_queue)
+            # messages that arrived with the handshake are left in frames for the reader
+            self.reader = reader.EReader(self.conn, self.msg_queue, frames)
             self.reader.start()   # start thread
             logger.info("sent startApi")
             self.startApi()
@@ -203,8 +209,8 @@ class EClient(object):
         """Call this function to check if there is a connection with TWS"""
 
         connConnected = self.conn and self.conn.isConnected()
-        logger.debug("%s isConn: %s, connConnected: %s" % (id(self),
-            self.connState, str(connConnected)))
+        logger.debug("%s isConn: %s, connConnected: %s", id(self),
+            self.connState, connConnected)
         return EClient.CONNECTED == self.connState and connConnected
 
     def keyboardInterrupt(self):
@@ -217,8 +223,17 @@ class EClient(object):
             raise SystemExit()
 
 
-    def run(self):
-        """This is the function that has the message loop."""
+    def run(self, batch=False, coalesce=False):
+        """This is the function that has the message loop.
+
+        batch: on every wakeup take all queued messages and dispatch them
+            together (see setBatchCallback), instead of one per queue get.
+        coalesce: in batch mode, drop price and size ticks superseded by a later tick for
+            the same tickerId and field in the same batch (comm.coalesce_ticks)."""
+
+        if batch:
+            self.runBatched(coalesce)
+            return
 
         try:
             while not self.done and (self.isConnected()
@@ -235,7 +250,8 @@ class EClient(object):
                         logger.debug("queue.get: empty")
                     else:
                         fields = comm.read_fields(text)
-                        logger.debug("fields %s", fields)
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("fields %s", fields)
                         self.decoder.interpret(fields)
                 except (KeyboardInterrupt, SystemExit):
                     logger.info("detected KeyboardInterrupt, SystemExit")
@@ -245,9 +261,76 @@ class EClient(object):
                     logger.info("BadMessage")
                     self.conn.disconnect()
 
-                logger.debug("conn:%d queue.sz:%d",
-                             self.isConnected(),
-                             self.msg_queue.qsize())
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("conn:%d queue.sz:%d",
+                                 self.isConnected(),
+                                 self.msg_queue.qsize())
+        finally:
+            self.disconnect()
+
+
+    def setBatchCallback(self, callback, dispatch=True):
+        """Registers callback(batch) for the batch message loop (run(batch=True)).
+
+        batch is the list of decoded field tuples (comm.read_fields) taken
+        from the queue in one wakeup, after coalescing. With dispatch=False
+        the messages are not passed on to the EWrapper callbacks, so the
+        callback sees them first and alone. callback=None unregisters."""
+
+        self.batchCallback = callback
+        self.batchDispatch = dispatch
+
+
+    def drainQueue(self, timeout=0.2):
+        """Waits up to timeout for a message, then takes every queued message
+        at once under a single lock. Returns a list (empty on timeout)."""
+
+        try:
+            first = self.msg_queue.get(block=True, timeout=timeout)
+        except queue.Empty:
+            return []
+        msgs = [first]
+        q = self.msg_queue
+        with q.mutex:
+            msgs.extend(q.queue)
+            q.queue.clear()
+            q.not_full.notify_all()
+        return msgs
+
+
+    def runBatched(self, coalesce=False):
+        """The batch message loop (see run)."""
+
+        try:
+            while not self.done and (self.isConnected()
+                        or not self.msg_queue.empty()):
+                try:
+                    texts = self.drainQueue()
+                    if not texts:
+                        continue
+                    batch = []
+                    for text in texts:
+                        if len(text) > MAX_MSG_LEN:
+                            self.wrapper.error(NO_VALID_ID, BAD_LENGTH.code(),
+                                "%s:%d:%s" % (BAD_LENGTH.msg(), len(text), text))
+                            self.disconnect()
+                            return
+                        batch.append(comm.read_fields(text))
+                    if coalesce:
+                        batch = comm.coalesce_ticks(batch)
+                    if self.batchCallback is not None:
+                        self.batchCallback(batch)
+                    if self.batchDispatch:
+                        interpret = self.decoder.interpret
+                        for fields in batch:
+                            interpret(fields)
+                except (KeyboardInterrupt, SystemExit):
+                    logger.info("detected KeyboardInterrupt, SystemExit")
+                    self.keyboardInterrupt()
+                    self.keyboardInterruptHard()
+                except BadMessage:
+                    logger.info("BadMessage")
+                    self.conn.disconnect()
         finally:
             self.disconnect()
 
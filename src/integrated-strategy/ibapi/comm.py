@@ -13,6 +13,7 @@ import struct
 import logging
 
 from ibapi.common import UNSET_INTEGER, UNSET_DOUBLE
+from ibapi.message import IN
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +62,86 @@ def read_msg(buf:bytes) -> tuple:
         return (size, "", buf)
 
 
+class FrameBuffer:
+    """
+    Receive buffer for length-prefixed messages.
+
+    Incoming bytes are appended to a growable bytearray and complete frames are
+    parsed in place, so each payload is copied exactly once (into the bytes
+    handed out) instead of re-copying the rest of the buffer per message as
+    read_msg does. Unread bytes are moved to the front only when the tail is
+    full, and the buffer doubles when a partial frame does not fit.
+    """
+
+    _HEADER = struct.Struct("!I")
+
+    def __init__(self, capacity:int=1 << 16):
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._start = 0     # first unread byte
+        self._end = 0       # end of the unread bytes
+
+    def __len__(self):
+        return self._end - self._start
+
+    def write(self, data):
+        """ appends received bytes """
+        n = len(data)
+        if self._end + n > len(self._buf):
+            self._make_room(n)
+        self._view[self._end:self._end + n] = data
+        self._end += n
+
+    def _make_room(self, n):
+        unread = self._end - self._start
+        if unread + n > len(self._buf):
+            capacity = len(self._buf)
+            while unread + n > capacity:
+                capacity *= 2
+            buf = bytearray(capacity)
+            buf[:unread] = self._view[self._start:self._end]
+            self._view.release()
+            self._buf = buf
+            self._view = memoryview(buf)
+        else:
+            # only the tail of a partial frame is moved
+            self._view[:unread] = self._view[self._start:self._end]
+        self._start, self._end = 0, unread
+
+    def read_frame(self):
+        """ the next complete msg payload, or None if more bytes are needed """
+        start = self._start
+        if self._end - start < 4:
+            return None
+        size = self._HEADER.unpack_from(self._buf, start)[0]
+        stop = start + 4 + size
+        if stop > self._end:
+            return None
+        msg = bytes(self._view[start + 4:stop])
+        if stop == self._end:
+            self._start = self._end = 0
+        else:
+            self._start = stop
+        return msg
+
+    def read_frames(self) -> list:
+        """ all complete msg payloads in the buffer """
+        msgs = []
+        buf, view, end, header = self._buf, self._view, self._end, self._HEADER
+        start = self._start
+        while end - start >= 4:
+            stop = start + 4 + header.unpack_from(buf, start)[0]
+            if stop > end:
+                break
+            msgs.append(bytes(view[start + 4:stop]))
+            start = stop
+        if start == end:
+            self._start = self._end = 0
+        else:
+            self._start = start
+        return msgs
+
+
 def read_fields(buf:bytes) -> tuple:
 
     if isinstance(buf, str):
@@ -72,4 +153,23 @@ def read_fields(buf:bytes) -> tuple:
     return tuple(fields[0:-1])   #last one is empty; this may slow dow things though, TODO
 
 
-
+# ticks identified by (msgId, reqId, tickType): a later one supersedes an earlier one.
+# Only price and size ticks are quotes; TICK_STRING and TICK_GENERIC also carry
+# events (RT_VOLUME / RT_TRD_VOLUME trade prints, halts) that must all be kept
+COALESCED_TICKS = frozenset(str(msgId).encode() for msgId in (IN.TICK_PRICE, IN.TICK_SIZE))
+
+
+def coalesce_ticks(batch:list) -> list:
+    """ keeps only the latest tick per (msgId, reqId, tickType) in a batch of
+    read_fields tuples; all other messages and the order are kept """
+    seen = set()
+    kept = []
+    for fields in reversed(batch):
+        if fields and fields[0] in COALESCED_TICKS and len(fields) > 3:
+            key = (fields[0], fields[2], fields[3])
+            if key in seen:
+                continue
+            seen.add(key)
+        kept.append(fields)
+    kept.reverse()
+    return kept
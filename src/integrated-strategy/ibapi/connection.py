@@ -113,15 +113,15 @@ class Connection:
 
     def _recvAllMsg(self):
         cont = True
-        allbuf = b""
+        chunks = []
 
         while cont and self.socket is not None:
             buf = self.socket.recv(4096)
-            allbuf += buf
+            chunks.append(buf)
             logger.debug("len %d raw:%s|", len(buf), buf)
 
             if len(buf) < 4096:
                 cont = False
 
-        return allbuf
+        return b"".join(chunks)
 
@@ -25,11 +25,30 @@ from ibapi.orderdecoder import OrderDecoder
 
 logger = logging.getLogger(__name__)
 
+# size tick reported alongside each price tick (processTickPriceMsg's ver 2 fields)
+PRICE_TO_SIZE_TICK = {
+    TickTypeEnum.BID: TickTypeEnum.BID_SIZE,
+    TickTypeEnum.ASK: TickTypeEnum.ASK_SIZE,
+    TickTypeEnum.LAST: TickTypeEnum.LAST_SIZE,
+    TickTypeEnum.DELAYED_BID: TickTypeEnum.DELAYED_BID_SIZE,
+    TickTypeEnum.DELAYED_ASK: TickTypeEnum.DELAYED_ASK_SIZE,
+    TickTypeEnum.DELAYED_LAST: TickTypeEnum.DELAYED_LAST_SIZE,
+}
+
+
+def decodeUtf8(field):
+    """ str field as interpretWithSignature has always read it """
+    try:
+        return field.decode('UTF-8')
+    except UnicodeDecodeError:
+        return field.decode('latin-1')
+
 
 class HandleInfo(Object):
     def __init__(self, wrap=None, proc=None):
         self.wrapperMeth = wrap
         self.wrapperParams = None
+        self.converters = None  # one per wrapper param, built once by discoverParams
         self.processMeth = proc
         if wrap is None and proc is None:
             raise ValueError("both wrap and proc can't be None")
@@ -41,9 +60,11 @@ class HandleInfo(Object):
 
 
 class Decoder(Object):
-    def __init__(self, wrapper, serverVersion):
+    def __init__(self, wrapper, serverVersion, fast=True):
         self.wrapper = wrapper
         self.serverVersion = serverVersion
+        # fast: use the index-based decoders in msgId2fastProc for the hot messages
+        self.fast = fast
         self.discoverParams()
         #self.printParams()
 
@@ -1210,6 +1231,10 @@ class Decoder(Object):
             handleInfo = meth2handleInfo.get(meth, None)
             if handleInfo is not None:
                 handleInfo.wrapperParams = sig.parameters
+                # int/float fields are parsed straight from bytes, the rest decoded as text
+                handleInfo.converters = tuple(
+                    param.annotation if param.annotation in (int, float) else decodeUtf8
+                    for (pname, param) in sig.parameters.items() if pname != "self")
 
             #for (pname, param) in sig.parameters.items():
             #     logger.debug("\tparam %s %s %s", pname, param.name, param.annotation)
@@ -1225,37 +1250,23 @@ class Decoder(Object):
 
 
     def interpretWithSignature(self, fields, handleInfo):
-        if handleInfo.wrapperParams is None:
+        converters = handleInfo.converters
+        if converters is None:
             logger.debug("%s: no param info in %s", fields, handleInfo)
             return
 
         nIgnoreFields = 2 #bypass msgId and versionId faster this way
-        if len(fields) - nIgnoreFields != len(handleInfo.wrapperParams) - 1:
+        if len(fields) - nIgnoreFields != len(converters):
             logger.error("diff len fields and params %d %d for fields: %s and handleInfo: %s",
                          len(fields), len(handleInfo.wrapperParams), fields,
                          handleInfo)
             return
 
-        fieldIdx = nIgnoreFields
-        args = []
-        for (pname, param) in handleInfo.wrapperParams.items():
-            if pname != "self":
-                logger.debug("field %s ", fields[fieldIdx])
-                try:
-                    arg = fields[fieldIdx].decode('UTF-8')
-                except UnicodeDecodeError:
-                    arg = fields[fieldIdx].decode('latin-1')
-                logger.debug("arg %s type %s", arg, param.annotation)
-                if param.annotation is int:
-                    arg = int(arg)
-                elif param.annotation is float:
-                    arg = float(arg)
-
-                args.append(arg)
-                fieldIdx += 1
+        args = [convert(field) for (convert, field) in zip(converters, fields[nIgnoreFields:])]
 
         method = getattr(self.wrapper, handleInfo.wrapperMeth.__name__)
-        logger.debug("calling %s with %s %s", method, self.wrapper, args)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("calling %s with %s %s", method, self.wrapper, args)
         method(*args)
 
     def interpret(self, fields):
@@ -1266,25 +1277,167 @@ class Decoder(Object):
         sMsgId = fields[0]
         nMsgId = int(sMsgId)
 
-        handleInfo = self.msgId2handleInfo.get(nMsgId, None)
+        try:
+            if self.fast:
+                fastProc = self.msgId2fastProc.get(nMsgId)
+                if fastProc is not None:
+                    fastProc(self, fields)
+                    return
 
-        if handleInfo is None:
-            logger.debug("%s: no handleInfo", fields)
-            return
+            handleInfo = self.msgId2handleInfo.get(nMsgId, None)
+
+            if handleInfo is None:
+                logger.debug("%s: no handleInfo", fields)
+                return
 
-        try:
             if handleInfo.wrapperMeth is not None:
-                logger.debug("In interpret(), handleInfo: %s", handleInfo)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("In interpret(), handleInfo: %s", handleInfo)
                 self.interpretWithSignature(fields, handleInfo)
             elif handleInfo.processMeth is not None:
                 handleInfo.processMeth(self, iter(fields))
         except BadMessage:
-                theBadMsg = ",".join(fields)
+                theBadMsg = ",".join(field.decode(errors='backslashreplace') if isinstance(field, bytes)
+                                     else field for field in fields)
                 self.wrapper.error(NO_VALID_ID, BAD_MESSAGE.code(),
                                    BAD_MESSAGE.msg() + theBadMsg)
                 raise
 
 
+    ########################################################################
+    # Fast decoders for the high-frequency messages.
+    #
+    # They read the fields tuple by position with the converters inlined
+    # (int(f or 0) / float(f or 0) as utils.decode does), instead of going
+    # through an iterator, utils.decode and its per-field debug logging.
+    # Each gives the wrapper exactly what the process*Msg / signature path
+    # gives it.
+    ########################################################################
+
+    def fastTickPriceMsg(self, fields):
+        if len(fields) < 7:
+            raise BadMessage("no more fields")
+        reqId = int(fields[2] or 0)
+        tickType = int(fields[3] or 0)
+        price = float(fields[4] or 0)
+        size = int(fields[5] or 0)
+        attrMask = int(fields[6] or 0)
+
+        attrib = TickAttrib()
+        if self.serverVersion >= MIN_SERVER_VER_PAST_LIMIT:
+            attrib.canAutoExecute = attrMask & 1 != 0
+            attrib.pastLimit = attrMask & 2 != 0
+            if self.serverVersion >= MIN_SERVER_VER_PRE_OPEN_BID_ASK:
+                attrib.preOpen = attrMask & 4 != 0
+        else:
+            attrib.canAutoExecute = attrMask == 1
+
+        self.wrapper.tickPrice(reqId, tickType, price, attrib)
+
+        sizeTickType = PRICE_TO_SIZE_TICK.get(tickType)
+        if sizeTickType is not None:
+            self.wrapper.tickSize(reqId, sizeTickType, size)
+
+    def fastTickSizeMsg(self, fields):
+        if len(fields) != 5:
+            self.interpretWithSignature(fields, self.msgId2handleInfo[IN.TICK_SIZE])
+            return
+        self.wrapper.tickSize(int(fields[2]), int(fields[3]), int(fields[4]))
+
+    def fastMarketDepthMsg(self, fields):
+        if len(fields) != 8:
+            self.interpretWithSignature(fields, self.msgId2handleInfo[IN.MARKET_DEPTH])
+            return
+        self.wrapper.updateMktDepth(int(fields[2]), int(fields[3]), int(fields[4]),
+                                    int(fields[5]), float(fields[6]), int(fields[7]))
+
+    def fastMarketDepthL2Msg(self, fields):
+        smartDepth = self.serverVersion >= MIN_SERVER_VER_SMART_DEPTH
+        if len(fields) < (10 if smartDepth else 9):
+            raise BadMessage("no more fields")
+        isSmartDepth = int(fields[9] or 0) != 0 if smartDepth else False
+        self.wrapper.updateMktDepthL2(int(fields[2] or 0), int(fields[3] or 0),
+                                      fields[4].decode(errors='backslashreplace'),
+                                      int(fields[5] or 0), int(fields[6] or 0),
+                                      float(fields[7] or 0), int(fields[8] or 0), isSmartDepth)
+
+    def fastTickByTickMsg(self, fields):
+        if len(fields) < 4:
+            raise BadMessage("no more fields")
+        reqId = int(fields[1] or 0)
+        tickType = int(fields[2] or 0)
+        time = int(fields[3] or 0)
+
+        if tickType == 1 or tickType == 2:
+            # Last or AllLast
+            if len(fields) < 9:
+                raise BadMessage("no more fields")
+            mask = int(fields[6] or 0)
+            tickAttribLast = TickAttribLast()
+            tickAttribLast.pastLimit = mask & 1 != 0
+            tickAttribLast.unreported = mask & 2 != 0
+            self.wrapper.tickByTickAllLast(reqId, tickType, time, float(fields[4] or 0),
+                                           int(fields[5] or 0), tickAttribLast,
+                                           fields[7].decode(errors='backslashreplace'),
+                                           fields[8].decode(errors='backslashreplace'))
+        elif tickType == 3:
+            # BidAsk
+            if len(fields) < 9:
+                raise BadMessage("no more fields")
+            mask = int(fields[8] or 0)
+            tickAttribBidAsk = TickAttribBidAsk()
+            tickAttribBidAsk.bidPastLow = mask & 1 != 0
+            tickAttribBidAsk.askPastHigh = mask & 2 != 0
+            self.wrapper.tickByTickBidAsk(reqId, time, float(fields[4] or 0), float(fields[5] or 0),
+                                          int(fields[6] or 0), int(fields[7] or 0), tickAttribBidAsk)
+        elif tickType == 4:
+            # MidPoint
+            if len(fields) < 5:
+                raise BadMessage("no more fields")
+            self.wrapper.tickByTickMidPoint(reqId, time, float(fields[4] or 0))
+
+    def fastHistoricalDataMsg(self, fields):
+        old = self.serverVersion < MIN_SERVER_VER_SYNT_REALTIME_BARS
+        i = 2 if old else 1
+        if len(fields) < i + 4:
+            raise BadMessage("no more fields")
+        reqId = int(fields[i] or 0)
+        startDateStr = fields[i + 1].decode(errors='backslashreplace')
+        endDateStr = fields[i + 2].decode(errors='backslashreplace')
+        itemCount = int(fields[i + 3] or 0)
+        i += 4
+
+        width = 9 if old else 8
+        if len(fields) < i + itemCount * width:
+            raise BadMessage("no more fields")
+        historicalData = self.wrapper.historicalData
+        for _ in range(itemCount):
+            bar = BarData()
+            bar.date = fields[i].decode(errors='backslashreplace')
+            bar.open = float(fields[i + 1] or 0)
+            bar.high = float(fields[i + 2] or 0)
+            bar.low = float(fields[i + 3] or 0)
+            bar.close = float(fields[i + 4] or 0)
+            bar.volume = int(fields[i + 5] or 0)
+            bar.average = float(fields[i + 6] or 0)
+            bar.barCount = int(fields[i + width - 1] or 0) # ver 3 field
+            i += width
+            historicalData(reqId, bar)
+
+        # send end of dataset marker
+        self.wrapper.historicalDataEnd(reqId, startDateStr, endDateStr)
+
+
+    msgId2fastProc = {
+        IN.TICK_PRICE: fastTickPriceMsg,
+        IN.TICK_SIZE: fastTickSizeMsg,
+        IN.TICK_BY_TICK: fastTickByTickMsg,
+        IN.HISTORICAL_DATA: fastHistoricalDataMsg,
+        IN.MARKET_DEPTH: fastMarketDepthMsg,
+        IN.MARKET_DEPTH_L2: fastMarketDepthL2Msg,
+    }
+
+
     msgId2handleInfo = {
         IN.TICK_PRICE: HandleInfo(proc=processTickPriceMsg),
         IN.TICK_SIZE: HandleInfo(wrap=EWrapper.tickSize),
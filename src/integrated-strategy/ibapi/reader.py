@@ -21,33 +21,32 @@ logger = logging.getLogger(__name__)
 
 
 class EReader(Thread):
-    def __init__(self, conn, msg_queue):
+    def __init__(self, conn, msg_queue, frames=None):
         super().__init__()
         self.conn = conn
         self.msg_queue = msg_queue
+        # bytes already received (e.g. after the connect handshake) stay in the buffer
+        self.frames = frames if frames is not None else comm.FrameBuffer()
 
     def run(self):
         try:
-            buf = b""
+            frames = self.frames
+            put = self.msg_queue.put
             while self.conn.isConnected():
 
                 data = self.conn.recvMsg()
-                logger.debug("reader loop, recvd size %d", len(data))
-                buf += data
-
-                while len(buf) > 0:
-                    (size, msg, buf) = comm.read_msg(buf)
-                    #logger.debug("resp %s", buf.decode('ascii'))
-                    logger.debug("size:%d msg.size:%d msg:|%s| buf:%s|", size,
-                        len(msg), buf, "|")
-
-                    if msg:
-                        self.msg_queue.put(msg)
-                    else:
-                        logger.debug("more incoming packet(s) are needed ")
-                        break
+                debug = logger.isEnabledFor(logging.DEBUG)
+                if debug:
+                    logger.debug("reader loop, recvd size %d", len(data))
+                frames.write(data)
+
+                for msg in frames.read_frames():
+                    if debug:
+                        logger.debug("msg.size:%d msg:|%s|", len(msg), msg)
+                    put(msg)
+                if debug and len(frames):
+                    logger.debug("more incoming packet(s) are needed ")
 
             logger.debug("EReader thread finished")
         except:
             logger.exception('unhandled exception in EReader thread')
-
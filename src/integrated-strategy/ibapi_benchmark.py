@@ -0,0 +1,82 @@
+"""
+Decoding throughput of the vendored IB API for the high-frequency messages.
+
+Feeds synthetic messages through comm.read_fields and Decoder.interpret, once with
+the generic decoding (process*Msg / wrapper signatures) and once with the fast
+per-message decoders, and prints messages per second for each.
+
+Usage (from this directory):
+    python ibapi_benchmark.py [--messages 200000]
+"""
+import argparse
+import time
+
+from ibapi import comm
+from ibapi.decoder import Decoder
+from ibapi.message import IN
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.wrapper import EWrapper
+
+
+class NullWrapper(EWrapper):
+    """Receives the hot callbacks and does nothing (the default EWrapper logs every call)."""
+    def tickPrice(self, reqId, tickType, price, attrib):
+        pass
+
+    def tickSize(self, reqId, tickType, size):
+        pass
+
+    def tickByTickAllLast(self, reqId, tickType, time, price, size, tickAttribLast, exchange, specialConditions):
+        pass
+
+    def tickByTickBidAsk(self, reqId, time, bidPrice, askPrice, bidSize, askSize, tickAttribBidAsk):
+        pass
+
+    def updateMktDepth(self, reqId, position, operation, side, price, size):
+        pass
+
+    def historicalData(self, reqId, bar):
+        pass
+
+    def historicalDataEnd(self, reqId, start, end):
+        pass
+
+
+def _msg(*values):
+    return b"\0".join(str(v).encode() for v in values) + b"\0"
+
+
+MESSAGES = {
+    "TICK_PRICE": _msg(IN.TICK_PRICE, 6, 1001, 1, 101.25, 3000, 3),
+    "TICK_SIZE": _msg(IN.TICK_SIZE, 6, 1001, 0, 1200),
+    "TICK_BY_TICK": _msg(IN.TICK_BY_TICK, 1001, 1, 1600000000, 101.25, 200, 0, "SEHK", ""),
+    "MARKET_DEPTH": _msg(IN.MARKET_DEPTH, 1, 1001, 3, 1, 0, 101.2, 4000),
+    "HISTORICAL_DATA": _msg(IN.HISTORICAL_DATA, 1001, "20200101", "20201231", 20,
+                            *(["20200102", 10.5, 11, 9.8, 10.9, 123400, 10.4, 321] * 20)),
+}
+
+
+def throughput(msg, n, fast):
+    decoder = Decoder(NullWrapper(), MAX_CLIENT_VER, fast=fast)
+    read_fields, interpret = comm.read_fields, decoder.interpret
+    start = time.perf_counter()
+    for _ in range(n):
+        interpret(read_fields(msg))
+    return n / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark IB API message decoding.")
+    parser.add_argument("--messages", type=int, default=200000)
+    args = parser.parse_args()
+
+    print("%-16s %14s %14s %8s" % ("message", "generic msg/s", "fast msg/s", "speedup"))
+    for name, msg in MESSAGES.items():
+        n = args.messages // 20 if name == "HISTORICAL_DATA" else args.messages
+        generic = throughput(msg, n, fast=False)
+        fast = throughput(msg, n, fast=True)
+        print("%-16s %14.0f %14.0f %7.1fx" % (name, generic, fast, fast / generic))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,22 +2,16 @@
 
 import pandas as pd
 import nltk
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
 nltk.downloader.download('vader_lexicon')
-analyser = SentimentIntensityAnalyzer()
+
+from models.sentiment.vader_cache import score_headlines
 
 
 # read VADER scores
 def read_news_vader_path(df):
     print('Reading in VADER datasets...')
-    cs = []
-
-    # append a compound score to every news row
-    for row in range(len(df)):
-        cs.append(analyser.polarity_scores(df['news'].iloc[row])['compound'])
-
-    # append the column to original dataset
-    df['compound_vader_score'] = cs
+    # compound score for every news row; only headlines not in the score cache are scored
+    df['compound_vader_score'] = score_headlines(df['news'])
 
     return df
 
@@ -0,0 +1,105 @@
+"""
+Persistent cache of VADER compound scores, keyed by a hash of the headline text.
+
+Most of the AAStock news history is the same from one run to the next, so
+score_headlines() looks every headline up in the cache file
+(config.get_vader_cache_path()) first, scores only the misses -- in batches on a
+process pool when there is more than one batch -- and appends the new scores to the file.
+
+config lives in src/; the scripts that import this module put it on sys.path.
+"""
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from config import get_vader_cache_path
+
+# cache file path -> {headline key: compound score}, read once per process
+_CACHE = {}
+
+# VADER analyser of the current process (created by _init_worker on first use)
+_ANALYSER = None
+
+
+def headline_key(text):
+    """Return the cache key of a headline: SHA-1 hex digest of its UTF-8 text."""
+    return hashlib.sha1(str(text).encode("utf-8")).hexdigest()
+
+
+def _init_worker():
+    global _ANALYSER
+    from nltk.sentiment.vader import SentimentIntensityAnalyzer
+    _ANALYSER = SentimentIntensityAnalyzer()
+
+
+def _score_batch(headlines):
+    if _ANALYSER is None:
+        _init_worker()
+    return [_ANALYSER.polarity_scores(text)["compound"] for text in headlines]
+
+
+def load_cache(path=None):
+    """Return the {headline key: compound score} dict for a cache file (empty if it does not exist)."""
+    path = path or get_vader_cache_path()
+    if path not in _CACHE:
+        try:
+            cached = pd.read_csv(path, dtype={"key": str, "compound": np.float64})
+            _CACHE[path] = dict(zip(cached["key"], cached["compound"]))
+        except FileNotFoundError:
+            _CACHE[path] = {}
+    return _CACHE[path]
+
+
+def _append(path, keys, scores):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    new_scores = pd.DataFrame({"key": keys, "compound": scores})
+    new_scores.to_csv(path, mode="a", header=not os.path.exists(path), index=False)
+
+
+def score_headlines(headlines, processes=None, batch_size=512, path=None):
+    """
+    Return the VADER compound score of each headline as a float64 array.
+
+    Parameters
+    ----------
+    headlines : iterable of str
+        Headline texts, e.g. df['news'].
+    processes : int or None
+        Worker processes for scoring cache misses; None uses os.cpu_count(),
+        1 scores in-process. A single batch is always scored in-process.
+    batch_size : int
+        Headlines sent to a worker at a time.
+    path : str or None
+        Cache file; None uses config.get_vader_cache_path().
+
+    Returns
+    -------
+    scores : np.ndarray
+        Compound scores aligned with headlines.
+    """
+    path = path or get_vader_cache_path()
+    cache = load_cache(path)
+    texts = [str(text) for text in headlines]
+    keys = [headline_key(text) for text in texts]
+
+    # unique headlines not scored yet, in first-seen order
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in cache and key not in missing:
+            missing[key] = text
+
+    if missing:
+        pending = list(missing.values())
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        if processes == 1 or len(batches) == 1:
+            scores = [score for batch in batches for score in _score_batch(batch)]
+        else:
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker) as pool:
+                scores = [score for batch in pool.map(_score_batch, batches) for score in batch]
+        cache.update(zip(missing, scores))
+        _append(path, list(missing), scores)
+
+    return np.array([cache[key] for key in keys], dtype=np.float64)
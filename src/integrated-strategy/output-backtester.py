@@ -12,10 +12,10 @@ mpl.use('tkagg')  # issues with Big Sur
 from strategy.macd_crossover import macdCrossover
 from backtest import Backtest
 from evaluate import PortfolioReturn, SharpeRatio, MaxDrawdown, CAGR
+from price_store import read_prices
 
-# load price data
-df_whole = pd.read_csv('../../database/microeconomic_data/hkex_ticks_day/hkex_0001.csv',
-                       header=0, index_col='Date', parse_dates=True)
+# load price data (served from the binary price store)
+df_whole = read_prices('0001')
 
 # select time range (for trading)
 start = '2017-01-03'
@@ -76,7 +76,7 @@ sharpe_ratio = SharpeRatio(portfolio)
 print("Sharpe ratio: {ratio:.4f} ".format(ratio=sharpe_ratio))
 
 # 3. Maximum drawdown
-maxDrawdown_fig, max_daily_drawdown, daily_drawdown = MaxDrawdown(df)
+maxDrawdown_fig, max_daily_drawdown, daily_drawdown = MaxDrawdown(portfolio)
 maxDrawdown_fig.suptitle('Baseline - Maximum drawdown', fontsize=14)
 maxDrawdown_filename = './figures/' + symbol + '-LSTM_maximum-drawdown'
 maxDrawdown_fig.savefig(maxDrawdown_filename)
@@ -9,28 +9,24 @@ sys.path.append("..")
 sys.path.append("../technical-analysis_python/")
 mpl.use("tkagg")  # issues with Big Sur
 
-from config import get_price_path, get_signals_path, safe_symbol
+from config import get_signals_path, safe_symbol
+from price_store import read_prices
 from strategy.macd_crossover import macdCrossover
-from backtest import Backtest
+from backtest import BacktestPortfolio, BacktestBatch, BatchPanels
 from evaluate import PortfolioReturn, SharpeRatio, MaxDrawdown, CAGR
 
 
-def backtest(symbol):
-    symbol = safe_symbol(symbol)
-    price_file = get_price_path(symbol)
+def load_backtest_data(symbol, start, end):
+    """
+    Load the trading window of price data and the LSTM signals for one symbol.
 
-    # load price data
-    try:
-        df_whole = pd.read_csv(price_file, header=0, index_col="Date", parse_dates=True)
-    except FileNotFoundError:
-        raise FileNotFoundError(f"Price file not found: {price_file}") from None
-    except OSError as e:
-        raise OSError(f"Could not read price file {price_file}: {e}") from e
+    Returns (ticker, df, signals) with duplicate dates removed.
+    """
+    symbol = safe_symbol(symbol)
+    # load price data (served from the binary price store)
+    df_whole = read_prices(symbol)
 
     # select time range (for trading)
-    #start = '2017-01-03'
-    start = '2020-06-10'
-    end = '2021-03-03'
     start_date = pd.Timestamp(start)
     end_date = pd.Timestamp(end)
 
@@ -52,14 +48,12 @@ def backtest(symbol):
     signals = signals[~signals.index.duplicated(keep='first')]
 
     df = df[~df.index.duplicated(keep='first')]
-    #print(signals.head())
-    #print(df.head())
 
-    """
-    Backtesting & evaluation
-    """
-    portfolio, backtest_fig = Backtest(ticker, signals, df)
-    plt.close()  # hide figure
+    return ticker, df, signals
+
+
+def report_results(ticker, start, end, portfolio, signals, df):
+    """Print the evaluation summary for one ticker and append it to LSTM_trend_results_MACD.csv."""
     print("Final total value: {value:.4f} ".format(
             value=portfolio["total"].iloc[-1]))
 
@@ -71,14 +65,6 @@ def backtest(symbol):
     print("No. of trade: {value}".format(
         value=trade_signals_num))
 
-
-    """
-    Plotting figures
-    """
-    backtest_fig.suptitle('Portfolio value', fontsize=14)
-    #backtest_fig.savefig('./figures_LSTM-price-only/' + symbol + '-portfolio-value')
-    #plt.show()
-
     # Evaluate strategy
 
     # 1. Portfolio return
@@ -87,6 +73,7 @@ def backtest(symbol):
     #returns_filename = './figures_LSTM-price-only/' + symbol + '-portfolo-return'
     #returns_fig.savefig(returns_filename)
     #plt.show()
+    plt.close()  # hide figure
 
     # 2. Sharpe ratio
     sharpe_ratio = SharpeRatio(portfolio)
@@ -98,6 +85,7 @@ def backtest(symbol):
     #maxDrawdown_filename = './figures/' + symbol + '-LSTM_maximum-drawdown'
     #maxDrawdown_fig.savefig(maxDrawdown_filename)
     #plt.show()
+    plt.close()  # hide figure
 
     # 4. Compound Annual Growth Rate
     cagr = CAGR(portfolio)
@@ -110,16 +98,50 @@ def backtest(symbol):
             f"{ticker},{start},{end},{portfolio_return},{sharpe_ratio},{cagr},{trade_signals_num}\n"
         )
 
+
+def backtest(symbol):
+    # select time range (for trading)
+    #start = '2017-01-03'
+    start = '2020-06-10'
+    end = '2021-03-03'
+
+    ticker, df, signals = load_backtest_data(symbol, start, end)
+
+    """
+    Backtesting & evaluation
+    """
+    portfolio = BacktestPortfolio(ticker, signals, df)
+    report_results(ticker, start, end, portfolio, signals, df)
+
+
 def main():
     ticker_list = ['0001', '0002', '0003', '0004', '0005', '0016', '0019', '0168', '0175', '0386', '0669', '0700',
                    '0762', '0823', '0857', '0868', '0883', '0939', '0941', '0968', '1211', '1299', '1818', '2319', '2382', '2688', '2689', '2899']
 
     #ticker_list = ['0001', '0002', '0003', '0004', '0005']
 
-    for ticker in ticker_list:
+    start = '2020-06-10'
+    end = '2021-03-03'
+
+    # Load every ticker, then backtest the whole universe in one pass
+    frames, closes, signal_series, raw_signals = {}, {}, {}, {}
+    for symbol in ticker_list:
+        ticker, df, signals = load_backtest_data(symbol, start, end)
+        frames[ticker] = df
+        closes[ticker] = df['Close']
+        signal_series[ticker] = signals['signal']
+        raw_signals[ticker] = signals
+
+    # each ticker keeps only the dates its prices and signals share, as in BacktestPortfolio
+    prices, signal_panel = BatchPanels(closes, signal_series)
+    result = BacktestBatch(prices, signal_panel)
+
+    for ticker, signals in raw_signals.items():
+        portfolio = pd.DataFrame({name: frame[ticker] for name, frame in result.items()})
+        portfolio = portfolio.loc[prices[ticker].dropna().index]
 
         print("############ Ticker: " + ticker + " ############")
-        backtest(ticker)
+        report_results(ticker, start, end, portfolio, signals, frames[ticker])
         print('\n')
 
 if __name__ == "__main__":
@@ -0,0 +1,200 @@
+"""
+Checkpointed LSTM training and a process-pool scheduler for per-ticker training jobs.
+
+fit() trains a model and saves model, optimiser and RNG state every few epochs, so an
+interrupted run resumes from its last checkpoint and a finished ticker is not retrained.
+run_jobs() runs one job per ticker on worker processes, each limited to a fixed number
+of torch threads, and keeps going when a ticker fails.
+
+The look-back windows from windowing.py are strided views, so the inputs take O(N)
+memory; the model's activations would still be O(N * look_back) if it ran on every
+window at once. fit() and predict() therefore run the model on at most CHUNK_SIZE
+windows at a time.
+
+Usage (from an LSTM training script):
+    hist = fit(model, optimiser, loss_fn, x_train, y_train, num_epochs=100,
+               checkpoint=checkpoint_path('saved_models', symbol))
+    y_test_pred = predict(model, x_test)
+    ...
+    errors = run_jobs(LSTM_predict, ticker_list, processes=4, torch_threads=2)
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import torch
+
+# windows per forward pass in a full-batch step and in predict()
+CHUNK_SIZE = 1024
+
+
+def checkpoint_path(checkpoint_dir, name):
+    """Return the checkpoint file for a job name (e.g. a ticker) under checkpoint_dir."""
+    return os.path.join(checkpoint_dir, f"{name}_checkpoint.pt")
+
+
+def save_checkpoint(path, model, optimiser, epoch, hist):
+    """Atomically write model/optimiser state after `epoch` completed epochs."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    state = {
+        "epoch": epoch,
+        "model": model.state_dict(),
+        "optimiser": optimiser.state_dict(),
+        "hist": hist[:epoch].copy(),
+        "rng": torch.get_rng_state(),
+    }
+    tmp = f"{path}.{os.getpid()}.tmp"
+    torch.save(state, tmp)
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path, model, optimiser):
+    """Restore state saved by save_checkpoint into model and optimiser; return (epoch, hist)."""
+    state = torch.load(path, weights_only=False)
+    model.load_state_dict(state["model"])
+    optimiser.load_state_dict(state["optimiser"])
+    torch.set_rng_state(state["rng"])
+    return state["epoch"], state["hist"]
+
+
+def fit(model, optimiser, loss_fn, x_train, y_train, num_epochs, batch_size=None,
+        checkpoint=None, checkpoint_every=10, chunk_size=CHUNK_SIZE):
+    """
+    Train model on (x_train, y_train), resuming from a checkpoint if one exists.
+
+    Parameters
+    ----------
+    model, optimiser, loss_fn
+        torch module, optimiser over its parameters, and loss function.
+    x_train, y_train : torch.Tensor
+        Training inputs and targets.
+    num_epochs : int
+        Total epochs; a checkpoint that already reached it means nothing is retrained.
+    batch_size : int or None
+        Mini-batch size (no shuffling); None takes one step on the full set each epoch.
+    checkpoint : str or None
+        Checkpoint file (see checkpoint_path); None disables checkpointing.
+    checkpoint_every : int
+        Save every this many epochs, and after the last one.
+    chunk_size : int
+        With batch_size None, the full-set gradient is accumulated over chunks of
+        this many samples, so activations are held for one chunk at a time. The
+        step is the same as on the whole set when loss_fn averages over samples
+        (e.g. MSELoss).
+
+    Returns
+    -------
+    hist : np.ndarray
+        Training loss per epoch (last mini-batch loss when batch_size is set).
+    """
+    hist = np.zeros(num_epochs)
+    start = 0
+    if checkpoint is not None and os.path.exists(checkpoint):
+        start, saved_hist = load_checkpoint(checkpoint, model, optimiser)
+        start = min(start, num_epochs)
+        hist[:start] = saved_hist[:start]
+        print("Resuming from epoch", start, "of", num_epochs)
+
+    if batch_size is not None:
+        batches = torch.utils.data.DataLoader(dataset=torch.utils.data.TensorDataset(x_train, y_train),
+                                              batch_size=batch_size, shuffle=False)
+
+    for t in range(start, num_epochs):
+        if batch_size is None:
+            hist[t] = _full_batch_step(model, optimiser, loss_fn, x_train, y_train, chunk_size)
+        else:
+            for train_data, train_label in batches:
+                # Forward pass
+                train_pred = model(train_data)
+                loss = loss_fn(train_pred, train_label)
+                hist[t] = loss.item()
+
+                # Zero out gradient, else they will accumulate between epochs
+                optimiser.zero_grad()
+                loss.backward()
+                optimiser.step()
+
+        if t % 10 == 0 and t != 0:
+            print("Epoch ", t, "MSE: ", hist[t])
+
+        if checkpoint is not None and ((t + 1) % checkpoint_every == 0 or t + 1 == num_epochs):
+            save_checkpoint(checkpoint, model, optimiser, t + 1, hist)
+
+    return hist
+
+
+def _full_batch_step(model, optimiser, loss_fn, x_train, y_train, chunk_size):
+    # one optimiser step on the whole set, with gradients summed over chunks weighted by size
+    n = len(x_train)
+    optimiser.zero_grad()
+    total = 0.0
+    for lo in range(0, n, chunk_size):
+        train_data, train_label = x_train[lo:lo + chunk_size], y_train[lo:lo + chunk_size]
+        loss = loss_fn(model(train_data), train_label) * (len(train_data) / n)
+        loss.backward()
+        total += loss.item()
+    optimiser.step()
+    return total
+
+
+def predict(model, x, chunk_size=CHUNK_SIZE):
+    """
+    model(x) evaluated chunk_size samples at a time, without building an autograd graph.
+
+    The model's train / eval mode is left as it is.
+    """
+    with torch.no_grad():
+        return torch.cat([model(x[lo:lo + chunk_size]) for lo in range(0, len(x), chunk_size)])
+
+
+def _init_worker(torch_threads):
+    torch.set_num_threads(torch_threads)
+
+
+def _run_job(job, name):
+    try:
+        job(name)
+    except Exception as e:  # one failing ticker must not stop the others
+        return name, f"{type(e).__name__}: {e}"
+    return name, ""
+
+
+def run_jobs(job, names, processes=None, torch_threads=1):
+    """
+    Run job(name) for every name (e.g. ticker) on a pool of worker processes.
+
+    Parameters
+    ----------
+    job : callable
+        Module-level function taking one name; typically trains with fit() and a
+        per-name checkpoint, so re-running after a crash resumes or skips finished names.
+    names : list of str
+        Job names, scheduled in order.
+    processes : int or None
+        Worker processes; None uses os.cpu_count() // torch_threads, 1 runs in-process.
+    torch_threads : int
+        torch.set_num_threads() for each worker.
+
+    Returns
+    -------
+    errors : dict of str -> str
+        Name -> error message ('' on success).
+    """
+    if processes is None:
+        processes = max(1, (os.cpu_count() or 1) // torch_threads)
+
+    if processes == 1:
+        _init_worker(torch_threads)
+        return dict(_run_job(job, name) for name in names)
+
+    errors = {}
+    # spawn rather than fork: forking after torch has started its thread pools can deadlock
+    with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(torch_threads,)) as pool:
+        futures = [pool.submit(_run_job, job, name) for name in names]
+        for future in as_completed(futures):
+            name, error = future.result()
+            errors[name] = error
+            print("############ Ticker: " + name + (" failed: " + error if error else " done") + " ############")
+    return {name: errors[name] for name in names}
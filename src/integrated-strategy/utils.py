@@ -1,4 +1,5 @@
 import os
+import sys
 import numpy as np
 import random
 import pandas as pd
@@ -7,12 +8,20 @@ import matplotlib.pyplot as plt
 
 from sklearn.preprocessing import MinMaxScaler
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from price_store import read_prices
+from windowing import split_windows
+
 
 def read_data(data_dir, symbol, dates):
+  """Close prices for symbol on dates; data_dir=None reads hkex_ticks_day from the binary price store."""
     
   df = pd.DataFrame(index=dates)
   
-  new_df = pd.read_csv(data_dir+ "hkex_" + symbol  +".csv", index_col='Date', parse_dates=True, usecols=['Date', 'Close'], na_values=['nan'])
+  if data_dir is None:
+    new_df = read_prices(symbol, columns=['Close'])
+  else:
+    new_df = pd.read_csv(data_dir+ "hkex_" + symbol  +".csv", index_col='Date', parse_dates=True, usecols=['Date', 'Close'], na_values=['nan'])
   new_df = new_df.rename(columns={'Close': symbol})
   df = df.join(new_df)
 
@@ -40,23 +49,8 @@ def read_strategy_data(data_dir, symbol, dates, strategy):
 
 # create train, test data given stock data and sequence length
 def load_data(data_raw, look_back):
-    data = []
-    
-    # create all possible sequences of length seq_len
-    for index in range(len(data_raw) - look_back): 
-        data.append(data_raw[index: index + look_back])
-    
-    data = np.array(data)
-    test_set_size = int(np.round(0.2*data.shape[0]))
-    train_set_size = data.shape[0] - (test_set_size)
-    
-    x_train = data[:train_set_size,:-1,:]
-    y_train = data[:train_set_size,-1,:]
-    
-    x_test = data[train_set_size:,:-1]
-    y_test = data[train_set_size:,-1,:]
-    
-    return [x_train, y_train, x_test, y_test]
+    # windows are strided views into one float32 copy of data_raw, see windowing.py
+    return split_windows(data_raw, look_back)
 
 def load_test_data(df):
     
@@ -0,0 +1,194 @@
+"""
+Walk-forward evaluation: rolling or expanding train/test splits, run fold by fold.
+
+walk_forward_splits() cuts N rows of history into folds of (train, test) row ranges.
+run_folds() evaluates every fold on a pool of worker processes and returns one row of
+metrics per fold; summarise() aggregates them.
+
+Work shared between overlapping windows is done once rather than per fold:
+- causal series (indicators, aligned macro data) are computed once over the full
+  history and sliced per fold;
+- WindowMoments answers a window's mean, std and correlation (e.g. macro
+  sensitivities) in O(1) from prefix sums built once;
+- fitted(key, compute) memoises anything else per worker (fitted once, reused by
+  every fold the worker runs).
+The shared data is sent to each worker once, not with every fold.
+
+Usage:
+    folds = walk_forward_splits(len(df), train_size=504, test_size=126)
+    results = run_folds(evaluate, data, folds, processes=4)   # evaluate(data, fold) -> dict
+    summarise(results)
+"""
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+Fold = namedtuple("Fold", ["number", "train", "test"])
+Fold.__doc__ = """One walk-forward fold: train and test are slices of row positions."""
+
+
+def walk_forward_splits(n, train_size, test_size, step=None, expanding=False, gap=0):
+    """
+    Return the folds of a walk-forward over n rows.
+
+    Parameters
+    ----------
+    n : int
+        Rows of history (e.g. len(df)).
+    train_size, test_size : int
+        Rows per training / test window (252 is about one trading year).
+    step : int or None
+        Rows between consecutive folds; None uses test_size (back-to-back test windows).
+    expanding : bool
+        Keep every training window anchored at row 0 (growing by step per fold)
+        instead of rolling a fixed-size window forward.
+    gap : int
+        Rows left out between a training window and its test window.
+
+    Returns
+    -------
+    folds : list of Fold
+        Only folds whose test window fits in the history.
+    """
+    if train_size < 1 or test_size < 1:
+        raise ValueError("train_size and test_size must be at least 1")
+    step = test_size if step is None else step
+    if step < 1:
+        raise ValueError("step must be at least 1")
+
+    folds = []
+    train_stop = train_size
+    while train_stop + gap + test_size <= n:
+        train_start = 0 if expanding else train_stop - train_size
+        test_start = train_stop + gap
+        folds.append(Fold(len(folds), slice(train_start, train_stop), slice(test_start, test_start + test_size)))
+        train_stop += step
+    return folds
+
+
+class WindowMoments:
+    """
+    Count, mean, standard deviation and correlation of x (and y) over any row window.
+
+    Prefix sums of the (mean-centred) values and their products are built once, so each
+    window query is O(1). Like pandas, rows where x or y is NaN are left out.
+    """
+    def __init__(self, x, y=None):
+        x = np.asarray(x, dtype=np.float64)
+        y = x if y is None else np.asarray(y, dtype=np.float64)
+        valid = ~(np.isnan(x) | np.isnan(y))
+        # centring on the overall mean keeps the prefix sums small relative to the variances
+        x = np.where(valid, x - (x[valid].mean() if valid.any() else 0.0), 0.0)
+        y = np.where(valid, y - (y[valid].mean() if valid.any() else 0.0), 0.0)
+
+        def prefix(values):
+            out = np.zeros(len(values) + 1)
+            np.cumsum(values, out=out[1:])
+            return out
+
+        self._n = prefix(valid.astype(np.float64))
+        self._sx, self._sy = prefix(x), prefix(y)
+        self._sxx, self._syy, self._sxy = prefix(x * x), prefix(y * y), prefix(x * y)
+
+    def _sums(self, lo, hi):
+        return tuple(s[hi] - s[lo] for s in (self._n, self._sx, self._sy, self._sxx, self._syy, self._sxy))
+
+    def count(self, lo, hi):
+        return int(round(self._n[hi] - self._n[lo]))
+
+    def std(self, lo, hi, ddof=1):
+        """Standard deviation of x over rows [lo, hi)."""
+        n, sx, _, sxx, _, _ = self._sums(lo, hi)
+        if n - ddof <= 0:
+            return np.nan
+        return float(np.sqrt(max(sxx - sx * sx / n, 0.0) / (n - ddof)))
+
+    def corr(self, lo, hi):
+        """Pearson correlation of x and y over rows [lo, hi) (Series.corr); NaN if either is constant."""
+        n, sx, sy, sxx, syy, sxy = self._sums(lo, hi)
+        if n < 2:
+            return np.nan
+        cov = sxy - sx * sy / n
+        var_x, var_y = sxx - sx * sx / n, syy - sy * sy / n
+        if var_x <= 0 or var_y <= 0:
+            return np.nan
+        return float(np.clip(cov / np.sqrt(var_x * var_y), -1.0, 1.0))
+
+
+# Fitted state memoised in this process (see fitted) and the data shared with run_folds
+_FITTED = {}
+_DATA = None
+
+
+def fitted(key, compute):
+    """Return the state memoised under key in this process, calling compute() the first time."""
+    try:
+        return _FITTED[key]
+    except KeyError:
+        value = _FITTED[key] = compute()
+        return value
+
+
+def clear_fitted():
+    _FITTED.clear()
+
+
+def _init_worker(data):
+    global _DATA
+    _DATA = data
+
+
+def _run_fold(evaluate, fold):
+    row = {"fold": fold.number, "train_start": fold.train.start, "train_stop": fold.train.stop,
+           "test_start": fold.test.start, "test_stop": fold.test.stop}
+    try:
+        row.update(evaluate(_DATA, fold))
+        row["error"] = ""
+    except (ValueError, KeyError, IndexError, ZeroDivisionError) as e:  # one bad fold must not stop the rest
+        row["error"] = f"{type(e).__name__}: {e}"
+    return row
+
+
+def run_folds(evaluate, data, folds, processes=None):
+    """
+    Evaluate every fold, on a pool of worker processes.
+
+    Parameters
+    ----------
+    evaluate : callable
+        Module-level function evaluate(data, fold) -> dict of metrics for the fold's
+        test window (fitting on its training window as needed).
+    data : object
+        Shared inputs (prices, precomputed series, WindowMoments, ...); sent to each
+        worker once.
+    folds : list of Fold
+        From walk_forward_splits.
+    processes : int or None
+        Worker processes; None uses os.cpu_count(), 1 runs in-process.
+
+    Returns
+    -------
+    results : pd.DataFrame
+        One row per fold: its row ranges, the metrics from evaluate and 'error'
+        (empty on success).
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    if processes == 1 or len(folds) <= 1:
+        _init_worker(data)
+        rows = [_run_fold(evaluate, fold) for fold in folds]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(data,)) as pool:
+            rows = list(pool.map(_run_fold, [evaluate] * len(folds), folds))
+    return pd.DataFrame(rows)
+
+
+def summarise(results):
+    """Mean, std, min, median and max of each metric over the successful folds."""
+    ok = results[results["error"] == ""] if "error" in results else results
+    metrics = ok.drop(columns=["fold", "train_start", "train_stop", "test_start", "test_stop"], errors="ignore")
+    return metrics.select_dtypes("number").agg(["mean", "std", "min", "median", "max"])
@@ -0,0 +1,53 @@
+"""
+Look-back windows for the LSTM models as strided views of the raw series.
+
+A series of N rows and F features gives N - look_back windows of shape
+(look_back, F). Window i is data[i:i + look_back]; windows overlap, so they are
+built as views (np.lib.stride_tricks.sliding_window_view) rather than copies and
+take O(N * F) memory instead of O(N * look_back * F).
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def sliding_windows(data, look_back, dtype=np.float32):
+    """
+    Return every look-back window of data as one array of shape (N - look_back, look_back, F).
+
+    data is converted to a contiguous dtype array once (no copy if it already is one);
+    the result is a view into it. The view is flagged writeable so torch.from_numpy
+    accepts it, but windows share memory and must not be written to.
+    """
+    values = np.ascontiguousarray(data, dtype=dtype)
+    if values.ndim == 1:
+        values = values[:, None]
+    if len(values) <= look_back:
+        raise ValueError(f"need more than look_back={look_back} rows, got {len(values)}")
+    windows = sliding_window_view(values, look_back, axis=0, writeable=True)  # (N - look_back + 1, F, look_back)
+    # the final window (ending on the last row) is left out so train/test splits match earlier runs
+    return windows[:-1].swapaxes(1, 2)
+
+
+def split_windows(data, look_back, test_fraction=0.2, dtype=np.float32):
+    """
+    Split the look-back windows of data into LSTM train/test sets.
+
+    Each window's first look_back - 1 rows are the input sequence and its last row the
+    target. The last test_fraction of windows (rounded) form the test set.
+
+    Returns
+    -------
+    [x_train, y_train, x_test, y_test] : list of np.ndarray views
+        x_*: (n, look_back - 1, F), y_*: (n, F).
+    """
+    windows = sliding_windows(data, look_back, dtype)
+    test_set_size = int(np.round(test_fraction * windows.shape[0]))
+    train_set_size = windows.shape[0] - test_set_size
+
+    x_train = windows[:train_set_size, :-1, :]
+    y_train = windows[:train_set_size, -1, :]
+
+    x_test = windows[train_set_size:, :-1, :]
+    y_test = windows[train_set_size:, -1, :]
+
+    return [x_train, y_train, x_test, y_test]
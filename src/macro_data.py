@@ -0,0 +1,71 @@
+"""
+Process-wide cache of the macroeconomic determinant series.
+
+The macro filters (integrated-strategy/filters/macro_analysis.py) align GDP,
+unemployment rate and property price onto every ticker's trading dates. Each CSV under
+database_real/macroeconomic_data/determinants/ is read and converted to numeric arrays
+once; later calls reuse the arrays for as long as the file's size and mtime are unchanged.
+"""
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from config import get_database_real_root
+
+# series name (column name used by the filters) -> (CSV file, value column)
+MACRO_SERIES = {
+    "GDP": ("quarterly_gdp.csv", "GDP_current_market_prices"),
+    "Unemployment rate": ("unemployment_rate.csv", "Unemployment_rate_seasonally_adjusted"),
+    "Property price": ("property_price.csv", "average_price_per_sqft"),
+}
+
+MacroSeries = namedtuple("MacroSeries", ["dates", "values"])
+MacroSeries.__doc__ = """One macro series: sorted datetime64[ns] dates and float64 values (read-only)."""
+
+# CSV path -> ((size, mtime_ns), MacroSeries)
+_CACHE = {}
+
+
+def macro_path(name):
+    """Return the CSV path for a series name (a key of MACRO_SERIES)."""
+    filename, _ = MACRO_SERIES[name]
+    return os.path.join(get_database_real_root(), "macroeconomic_data", "determinants", filename)
+
+
+def _parse(path, value_col):
+    macro_df = pd.read_csv(path, header=0, usecols=["Date", value_col])
+    macro_df["Date"] = pd.to_datetime(macro_df["Date"])
+    macro_df = macro_df.sort_values("Date", kind="stable")
+    # GDP figures are stored with thousands separators, e.g. "703,131"
+    values = pd.to_numeric(macro_df[value_col].astype(str).str.replace(",", ""))
+    series = MacroSeries(macro_df["Date"].to_numpy(dtype="datetime64[ns]"),
+                         values.to_numpy(dtype=np.float64))
+    series.dates.flags.writeable = False
+    series.values.flags.writeable = False
+    return series
+
+
+def get_series(name):
+    """
+    Return the MacroSeries for a series name, parsing its CSV only when it is not
+    cached yet or the file has changed (size or mtime) since it was cached.
+    """
+    path = macro_path(name)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Macro data file not found: {path}") from None
+    stamp = (st.st_size, st.st_mtime_ns)
+
+    cached = _CACHE.get(path)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, _parse(path, MACRO_SERIES[name][1]))
+        _CACHE[path] = cached
+    return cached[1]
+
+
+def clear_cache():
+    """Drop all cached series."""
+    _CACHE.clear()
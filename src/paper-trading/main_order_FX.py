@@ -1,53 +1,19 @@
-from ibapi.client import EClient
-from ibapi.wrapper import EWrapper
-from ibapi.contract import Contract
-from ibapi.order import *
-
-import threading
-import time
-
-
-class App(EWrapper, EClient):
-    def __init__(self):
-        EClient.__init__(self, self)
-
-    def nextValidId(self, orderId: int):
-        super().nextValidId(orderId)
-        self.nextorderId = orderId
-        print('The next valid order id is: ', self.nextorderId)
-
-    def orderStatus(self, orderId, status, filled, remaining, avgFillPrice, permId, parentId, lastFillPrice,
-                    clientId, whyHeld, mktCapPrice):
-        print("OrderStatus. Id: ", orderId, ", Status: ", status, ", Filled: ", filled, ", Remaining: ", remaining,
-                ", AvgFillPrice: ", avgFillPrice, ", PermId: ", permId, ", ParentId: ", parentId, ", LastFillPrice: ",
-              lastFillPrice, ", ClientId: ", clientId, ", WhyHeld: ", whyHeld, ", MktCapPrice: ", mktCapPrice)
-
-    def openOrder(self, orderId, contract, order, orderState):
-        print("OpenOrder. PermID: ", order.permId, ", ClientId: ", order.clientId, ", OrderId: ", orderId, ", Account: ", order.account, ", Symbol: ", contract.symbol, ", SecType: ",
-              contract.secType, " , Exchange: ", contract.exchange, ", Action: ", order.action, ", OrderType: ",
-              order.orderType, ", TotalQty: ", order.totalQuantity, ", CashQty: ", order.cashQty, ", LmtPrice: ",
-              order.lmtPrice, ", AuxPrice: ", order.auxPrice, ", Status: ", orderState.status)
-
-
-    def execDetails(self, reqId, contract, execution):
-        print("ExecDetails. ", reqId, " - ", contract.symbol, ", ", contract.secType, ", ", contract.currency,
-              " - ", execution.execId, ", ", execution.orderId, ", ", execution.shares , ", ", execution.lastLiquidity)
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'integrated-strategy'))
 
+import asyncio
 
-def run_loop():
-    app.run()
-
-app = App()
-app.connect('127.0.0.1', 7497, 0)
+from ibapi.contract import Contract
+from ibapi.order import *
+from ib_async import IBClient
 
-app.nextorderId = None
 
-# Start the socket in a thread
-api_thread = threading.Thread(target=run_loop)
-api_thread.start()
+def print_status(status):
+    print("OrderStatus. Id: ", status.orderId, ", Status: ", status.status, ", Filled: ", status.filled,
+          ", Remaining: ", status.remaining, ", AvgFillPrice: ", status.avgFillPrice,
+          ", LastFillPrice: ", status.lastFillPrice)
 
-# Allow time for server connection
-time.sleep(1)
 
 # Create contracts - fx pairs
 eurgbp_contract = Contract()
@@ -63,32 +29,30 @@ order.totalQuantity = 20000
 order.orderType = 'LMT'
 order.lmtPrice = '0.84'
 
-# Place order
-# placeOrder(orderId, contract, order)
-print('Placing order')
-app.placeOrder(app.nextorderId, eurgbp_contract, order)
-
-time.sleep(5)
-
-"""
-# Modify order
-print('Modifying order')
-order_id = 20
-order.lmtPrice = '0.82'
-app.placeOrder(order_id, eurgbp_contract, order)
-
-time.sleep(5)
-"""
-
-# Cancel order by order Id
-print('Cancelling order')
-app.cancelOrder(app.nextorderId)
-
-"""
-# Cancel all open orders
-print('Cancelling all open orders')
-app.reqGlobalCancel()
-"""
-
-time.sleep(5)
-app.disconnect()
\ No newline at end of file
+async def main():
+    async with IBClient() as app:
+        print('The next valid order id is: ', app.nextOrderId)
+
+        # Place order; returns once TWS has accepted it
+        print('Placing order')
+        status = await app.place_order(eurgbp_contract, order)
+        print_status(status)
+
+        """
+        # Modify order
+        print('Modifying order')
+        order.lmtPrice = '0.82'
+        print_status(await app.place_order(eurgbp_contract, order, orderId=status.orderId))
+        """
+
+        # Cancel order by order Id; returns once it is cancelled
+        print('Cancelling order')
+        print_status(await app.cancel_order(status.orderId))
+
+        """
+        # Cancel all open orders
+        print('Cancelling all open orders')
+        app.reqGlobalCancel()
+        """
+
+asyncio.run(main())
@@ -1,35 +1,18 @@
-from ibapi.client import EClient
-from ibapi.wrapper import EWrapper
-from ibapi.contract import Contract
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'integrated-strategy'))
 
-import threading
-import time
+import asyncio
 
-class App(EWrapper, EClient):
-    def __init__(self):
-        EClient.__init__(self, self)
+from ib_async import IBClient
 
-    def accountSummary(self, reqId:int, account:str, tag:str, value:str, currency:str):
-        print("Acct Summary. ReqId:" , reqId , "Acct:", account, "Tag: ", tag, "Value:", value, "Currency:", currency)
+async def main():
+    # Connection: IB_HOST, IB_PORT and IB_CLIENT_ID from the environment
+    async with IBClient() as app:
+        # Account summary in base currency, then in HKD;
+        # each returns once accountSummaryEnd arrives
+        for tags in ("$LEDGER", "$LEDGER:HKD"):
+            for account, tag, value, currency in await app.account_summary("All", tags):
+                print("Acct Summary. Acct:", account, "Tag: ", tag, "Value:", value, "Currency:", currency)
 
-def run_loop():
-    app.run()
-
-app = App()
-app.connect('127.0.0.1', 7497, 0)
-
-# Start the socket in a thread
-api_thread = threading.Thread(target=run_loop)
-api_thread.start()
-
-time.sleep(1)
-
-# Account summary in base currency
-app.reqAccountSummary(9002, "All", "$LEDGER");
-
-# Account summary in HKD
-app.reqAccountSummary(9002, "All", "$LEDGER:HKD");
-
-
-time.sleep(3)
-app.disconnect()
\ No newline at end of file
+asyncio.run(main())
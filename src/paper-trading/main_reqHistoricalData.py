@@ -1,33 +1,11 @@
-from ibapi.client import EClient
-from ibapi.wrapper import EWrapper
-from ibapi.contract import Contract
-
-import threading
-import time
-
-class App(EWrapper, EClient):
-    def __init__(self):
-        EClient.__init__(self, self)
-
-    def historicalData(self, reqId, bar):
-        print("HistoricalData. ", reqId, " - Time: ", bar.date, ", Open: ", bar.open, ", High: ", bar.high,
-              ", Low: ", bar.low, ", Close: ", bar.close, ", Volume: ", bar.volume)
-
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'integrated-strategy'))
 
-def run_loop():
-	app.run()
+import asyncio
 
-# Establish API connection
-# connect(ip address, port number, client id)
-app = App()
-app.connect('127.0.0.1', 7497, 0)
-
-# Start the socket in a thread
-api_thread = threading.Thread(target=run_loop)
-api_thread.start()
-
-# Allow time for server connection
-time.sleep(1)
+from ibapi.contract import Contract
+from ib_async import IBClient
 
 # Create contracts - stocks
 tsla_contract = Contract()
@@ -43,11 +21,14 @@ eurgbp_contract.secType = "CASH"
 eurgbp_contract.currency = "GBP"
 eurgbp_contract.exchange = "IDEALPRO"
 
-# Request historical bar data
-# reqHistoricalData(tickerId, contract, endDateTime, durationString, barSizeSetting, whatToShow, useRTH, formatDate, keepUpToDate)
-app.reqHistoricalData(1, eurgbp_contract, '', '1 M', '1 day', 'ASK', 1, 1, False, None)
-
-# Wait for incoming data
-time.sleep(10)
-
-app.disconnect()
\ No newline at end of file
+async def main():
+    # Establish API connection (IB_HOST, IB_PORT, IB_CLIENT_ID)
+    async with IBClient() as app:
+        # Request historical bar data; returns once historicalDataEnd arrives
+        # historical_data(contract, end, duration, bar_size, what_to_show, use_rth, format_date)
+        bars = await app.historical_data(eurgbp_contract, '', '1 M', '1 day', 'ASK', 1, 1)
+        for bar in bars:
+            print("HistoricalData. Time: ", bar.date, ", Open: ", bar.open, ", High: ", bar.high,
+                  ", Low: ", bar.low, ", Close: ", bar.close, ", Volume: ", bar.volume)
+
+asyncio.run(main())
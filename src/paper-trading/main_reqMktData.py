@@ -1,43 +1,15 @@
-from ibapi.client import EClient
-from ibapi.wrapper import EWrapper
-from ibapi.contract import Contract
-from ibapi.ticktype import TickTypeEnum
-
 import os
-import threading
-import time
-
-# Connection: set IB_HOST and IB_PORT in environment to override (e.g. for paper trading)
-IB_HOST = os.environ.get("IB_HOST", "127.0.0.1")
-IB_PORT = int(os.environ.get("IB_PORT", "7497"))
-IB_CLIENT_ID = int(os.environ.get("IB_CLIENT_ID", "0"))
-
-class App(EWrapper, EClient):
-    def __init__(self):
-        EClient.__init__(self, self)
-
-    def tickPrice(self, tickerId, field, price, attribs):
-        print("Tick Price. Ticker Id:", tickerId, ", Field: ", field, ", TickType: ", TickTypeEnum.to_str(field),
-              ", Price: ", price, ", CanAutoExecute: ", attribs.canAutoExecute, ", PastLimit: ", attribs.pastLimit,
-              ", PreOpen: ", attribs.preOpen)
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'integrated-strategy'))
 
-def run_loop():
-    app.run()
+import asyncio
+from contextlib import aclosing
 
-# Establish API connection
-app = App()
-app.connect(IB_HOST, IB_PORT, IB_CLIENT_ID)
-
-# Start the socket in a thread
-api_thread = threading.Thread(target=run_loop)
-api_thread.start()
-
-# Allow time for server connection
-time.sleep(1)
+from ibapi.contract import Contract
+from ib_async import IBClient
 
-# Switch market data type
-# 3 for delayed data
-app.reqMarketDataType(3)
+# Number of ticks to print before disconnecting
+N_TICKS = 20
 
 # Create contracts - stocks
 tsla_contract = Contract()
@@ -53,11 +25,20 @@ sunhungkai_contract.secType = 'STK'
 sunhungkai_contract.exchange = 'SEHK'
 sunhungkai_contract.currency = 'HKD'
 
-# Request Market Data
-# reqMktData(tickerId, contract, genericTickList, snapshot, regulatorySnaphsot, mktDataOptions)
-app.reqMktData(1, tsla_contract, '', False, False, None)
-
-# Wait for incoming data
-time.sleep(5)
-
-app.disconnect()
\ No newline at end of file
+async def main():
+    # Connection: set IB_HOST and IB_PORT in environment to override (e.g. for paper trading)
+    async with IBClient() as app:
+        # Switch market data type
+        # 3 for delayed data
+        app.reqMarketDataType(3)
+
+        # Stream market data; the subscription is cancelled when the block is left
+        async with aclosing(app.market_data(tsla_contract)) as ticks:
+            n = 0
+            async for tick in ticks:
+                print("Tick. Field: ", tick.field, ", TickType: ", tick.name, ", Value: ", tick.value)
+                n += 1
+                if n == N_TICKS:
+                    break
+
+asyncio.run(main())
@@ -0,0 +1,171 @@
+"""
+Binary columnar price store.
+
+Converts the per-ticker price CSVs under the data root (e.g.
+microeconomic_data/hkex_ticks_day/hkex_0001.csv) once into NumPy files and serves
+memory-mapped, zero-copy slices by ticker and date range afterwards.
+
+Layout per ticker, under config.get_price_store_dir()/<subdir>/:
+    <name>.dates.npy   int64 nanoseconds since epoch, sorted ascending
+    <name>.values.npy  float64, shape (n_columns, n_rows): each column is contiguous
+    <name>.json        column names and CSV dtypes plus the source CSV's size and mtime
+
+A ticker is rebuilt automatically when its source CSV's size or mtime changes.
+"""
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from config import get_data_root, get_price_store_dir, safe_symbol
+
+HKEX_DAY = "microeconomic_data/hkex_ticks_day"
+
+# Market subdirectory -> CSV file prefix
+PREFIXES = {
+    HKEX_DAY: "hkex_",
+    "microeconomic_data/nasdaq_ticks_day": "nasdaq_",
+    "microeconomic_data/nyse_ticks_day": "nyse_",
+    "microeconomic_data/jp_ticks_day": "jp_",
+}
+
+PriceArrays = namedtuple("PriceArrays", ["dates", "columns", "values", "dtypes"])
+PriceArrays.__doc__ = """Price data for one ticker.
+
+dates: datetime64[ns] array; columns: tuple of column names;
+values: float64 array of shape (len(columns), len(dates));
+dtypes: column name -> dtype in the source CSV (e.g. 'int64' for Volume).
+"""
+
+
+def _source_path(symbol, subdir):
+    return os.path.join(get_data_root(), subdir, f"{PREFIXES[subdir]}{safe_symbol(symbol)}.csv")
+
+
+def _store_base(symbol, subdir):
+    return os.path.join(get_price_store_dir(), subdir, f"{PREFIXES[subdir]}{safe_symbol(symbol)}")
+
+
+def _source_stamp(csv_path):
+    st = os.stat(csv_path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _is_fresh(base, stamp):
+    try:
+        with open(base + ".json", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return meta.get("source") == stamp and os.path.exists(base + ".values.npy")
+
+
+def _save_atomic(path, array):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
+
+def build(symbol, subdir=HKEX_DAY):
+    """Convert one ticker's CSV into the binary store (always rebuilds). Returns the store base path."""
+    csv_path = _source_path(symbol, subdir)
+    try:
+        stamp = _source_stamp(csv_path)
+        df = pd.read_csv(csv_path, header=0, na_values=["nan", "null"])
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Price file not found: {csv_path}") from None
+
+    dates = pd.to_datetime(df.pop("Date"))
+    order = np.argsort(dates.to_numpy(), kind="stable")
+    columns = list(df.columns)
+    dtypes = {name: str(dtype) for name, dtype in df.dtypes.items()}
+    values = np.ascontiguousarray(df.to_numpy(dtype=np.float64)[order].T)
+
+    base = _store_base(symbol, subdir)
+    os.makedirs(os.path.dirname(base), exist_ok=True)
+    _save_atomic(base + ".dates.npy", dates.to_numpy(dtype="datetime64[ns]")[order].view(np.int64))
+    _save_atomic(base + ".values.npy", values)
+    tmp = f"{base}.json.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"columns": columns, "dtypes": dtypes, "source": stamp}, f)
+    os.replace(tmp, base + ".json")
+
+    return base
+
+
+def load(symbol, subdir=HKEX_DAY):
+    """
+    Return PriceArrays for a ticker, memory-mapped read-only from the store.
+
+    The store entry is (re)built first if it is missing or its CSV has changed.
+    """
+    csv_path = _source_path(symbol, subdir)
+    base = _store_base(symbol, subdir)
+    try:
+        stamp = _source_stamp(csv_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Price file not found: {csv_path}") from None
+    if not _is_fresh(base, stamp):
+        build(symbol, subdir)
+
+    with open(base + ".json", encoding="utf-8") as f:
+        meta = json.load(f)
+    dates = np.load(base + ".dates.npy", mmap_mode="r").view("datetime64[ns]")
+    values = np.load(base + ".values.npy", mmap_mode="r")
+    return PriceArrays(dates, tuple(meta["columns"]), values, meta["dtypes"])
+
+
+def get_arrays(symbol, start=None, end=None, subdir=HKEX_DAY):
+    """
+    Return PriceArrays restricted to [start, end] (inclusive, either may be None).
+
+    dates and values are read-only views into the memory map; nothing is copied.
+    """
+    prices = load(symbol, subdir)
+    lo = 0 if start is None else np.searchsorted(prices.dates, np.datetime64(pd.Timestamp(start), "ns"), side="left")
+    hi = len(prices.dates) if end is None else np.searchsorted(prices.dates, np.datetime64(pd.Timestamp(end), "ns"), side="right")
+    return PriceArrays(prices.dates[lo:hi], prices.columns, prices.values[:, lo:hi], prices.dtypes)
+
+
+def read_prices(symbol, start=None, end=None, subdir=HKEX_DAY, columns=None):
+    """
+    Return a price DataFrame (DatetimeIndex named 'Date') for [start, end].
+
+    Equivalent to pd.read_csv(path, index_col='Date', parse_dates=True).loc[start:end]
+    but served from the binary store. The frame owns its data, so callers may add or
+    modify columns freely.
+    """
+    prices = get_arrays(symbol, start, end, subdir)
+    names = list(prices.columns) if columns is None else list(columns)
+    data = {
+        name: prices.values[prices.columns.index(name)].astype(prices.dtypes[name])
+        for name in names
+    }
+    return pd.DataFrame(data, index=pd.DatetimeIndex(np.array(prices.dates), name="Date"))
+
+
+def list_symbols(subdir=HKEX_DAY):
+    """Return the sorted symbols that have a price CSV in a market subdirectory."""
+    prefix = PREFIXES[subdir]
+    return [
+        name[len(prefix):-len(".csv")]
+        for name in sorted(os.listdir(os.path.join(get_data_root(), subdir)))
+        if name.startswith(prefix) and name.endswith(".csv")
+    ]
+
+
+def build_all(subdir=HKEX_DAY):
+    """Build (or refresh) the store for every CSV in a market subdirectory. Returns the symbols."""
+    symbols = list_symbols(subdir)
+    for symbol in symbols:
+        load(symbol, subdir)
+    return symbols
+
+
+if __name__ == "__main__":
+    for market in PREFIXES:
+        if os.path.isdir(os.path.join(get_data_root(), market)):
+            print(market, len(build_all(market)), "tickers")
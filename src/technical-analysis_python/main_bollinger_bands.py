@@ -11,12 +11,10 @@ import matplotlib.pyplot as plt
 from strategy.bollinger_bands import bollinger_bands
 from backtest import Backtest
 from evaluate import PortfolioReturn, SharpeRatio, MaxDrawdown, CAGR
+from price_store import read_prices
 
-# load data
-df = pd.read_csv('../../database/microeconomic_data/hkex_ticks_day/hkex_0005.csv', header=0, index_col='Date', parse_dates=True)
-
-# select time range
-df = df.loc[pd.Timestamp('2018-01-01'):pd.Timestamp('2020-01-01')]
+# load data (served from the binary price store)
+df = read_prices('0005', '2018-01-01', '2020-01-01')
 
 ticker = "0005.HK"
 
@@ -53,7 +51,7 @@ sharpe_ratio = SharpeRatio(portfolio)
 print("Sharpe ratio: {ratio:.4f} ".format(ratio = sharpe_ratio))
 
 # 3. Maximum drawdown
-maxDrawdown_fig, max_daily_drawdown, daily_drawdown = MaxDrawdown(df)
+maxDrawdown_fig, max_daily_drawdown, daily_drawdown = MaxDrawdown(portfolio)
 maxDrawdown_fig.suptitle('Bollinger Bands - Maximum drawdown', fontsize=14)
 maxDrawdown_fig.savefig('./figures/volatility/01-bollinger-bands_maximum-drawdown')
 plt.show()
@@ -10,12 +10,10 @@ import matplotlib.pyplot as plt
 from strategy.moving_average_crossover import MovingAverageCrossover
 from backtest import Backtest
 from evaluate import SharpeRatio, MaxDrawdown, CAGR
+from price_store import read_prices
 
-# load data
-df = pd.read_csv('../../database/microeconomic_data/hkex_ticks_day/hkex_0005.csv', header=0, index_col='Date', parse_dates=True)
-
-# select time range
-df = df.loc[pd.Timestamp('2017-01-01'):pd.Timestamp('2019-01-01')]
+# load data (served from the binary price store)
+df = read_prices('0005', '2017-01-01', '2019-01-01')
 
 ticker = "0005.HK"
 
@@ -47,7 +45,7 @@ sharpe_ratio = SharpeRatio(portfolio)
 print("Sharpe ratio: {ratio:.4f} ".format(ratio = sharpe_ratio))
 
 # 2. Maximum drawdown
-maxDrawdown_fig, max_daily_drawdown, daily_drawdown = MaxDrawdown(df)
+maxDrawdown_fig, max_daily_drawdown, daily_drawdown = MaxDrawdown(portfolio)
 maxDrawdown_fig.suptitle('Moving average crossover - Maximum drawdown', fontsize=14)
 maxDrawdown_fig.savefig('./figures/trend/01-moving-average-crossover_maximum-drawdown', dpi=100)
 plt.show()
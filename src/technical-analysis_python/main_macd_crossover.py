@@ -10,18 +10,10 @@ import matplotlib.pyplot as plt
 from strategy.macd_crossover import macdCrossover
 from backtest import Backtest
 from evaluate import PortfolioReturn, SharpeRatio, MaxDrawdown, CAGR
+from price_store import read_prices
 
-# load data
-_data_path = "../../database/microeconomic_data/hkex_ticks_day/hkex_0005.csv"
-try:
-    df = pd.read_csv(_data_path, header=0, index_col="Date", parse_dates=True)
-except FileNotFoundError:
-    raise FileNotFoundError(f"Data file not found: {_data_path}") from None
-except OSError as e:
-    raise OSError(f"Could not read {_data_path}: {e}") from e
-
-# select time range
-df = df.loc[pd.Timestamp('2017-01-01'):pd.Timestamp('2021-01-01')]
+# load data (served from the binary price store)
+df = read_prices('0005', '2017-01-01', '2021-01-01')
 
 ticker = "0005.HK"
 
@@ -68,7 +60,7 @@ sharpe_ratio = SharpeRatio(portfolio)
 print("Sharpe ratio: {ratio:.4f} ".format(ratio = sharpe_ratio))
 
 # 3. Maximum drawdown
-maxDrawdown_fig, max_daily_drawdown, daily_drawdown = MaxDrawdown(df)
+maxDrawdown_fig, max_daily_drawdown, daily_drawdown = MaxDrawdown(portfolio)
 maxDrawdown_fig.suptitle('MACD crossovers - Maximum drawdown', fontsize=14)
 maxDrawdown_fig.savefig('./figures/trend/02-macd-crossover_maximum-drawdown')
 plt.show()
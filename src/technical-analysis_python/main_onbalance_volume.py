@@ -10,12 +10,10 @@ import matplotlib.pyplot as plt
 from strategy.onbalance_volume import obv
 from backtest import Backtest
 from evaluate import SharpeRatio, MaxDrawdown, CAGR
+from price_store import read_prices
 
-# load data
-df = pd.read_csv('../../database/microeconomic_data/hkex_ticks_day/hkex_0005.csv', header=0, index_col='Date', parse_dates=True)
-
-# select time range
-df = df.loc[pd.Timestamp('2018-01-01'):pd.Timestamp('2020-01-01')]
+# load data (served from the binary price store)
+df = read_prices('0005', '2018-01-01', '2020-01-01')
 
 ticker = "0005.HK"
 
@@ -0,0 +1,251 @@
+"""
+Universe-wide indicator screener.
+
+Loads every ticker of one or more markets (hkex_*.csv, and optionally nasdaq_*, nyse_*,
+jp_*) from the binary price store into an aligned (date x ticker) panel, evaluates a
+set of strategies on all tickers at once, backtests every signal column in one
+vectorised pass and returns a table of current signals and backtest metrics ranked
+by Sharpe ratio.
+
+Most strategies have a panel rule in PANEL_SIGNALS: the module-level *_signal
+function its strategy class builds gen_signals from, so the maths lives in one
+place and takes whole (row x ticker) frames as well as single series. Windows must
+run over each ticker's own rows, never across the NaN rows of another calendar or
+a gap, so each ticker's rows are packed to the top of one dense panel, the rule
+runs once on it and the results are scattered back to the ticker's dates.
+Strategies without a panel rule (the loop-based CCI overbought/oversold and
+Parabolic SAR) run their class per ticker.
+
+Usage (from this directory):
+    python screener.py --markets hkex nasdaq --strategies macd_crossover rsi --top 20
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+_THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(_THIS_DIR)
+sys.path.append(os.path.dirname(_THIS_DIR))
+
+import price_store
+from backtest import BacktestBatch
+from evaluate import PerformanceMetrics
+from strategy.bollinger_bands import bollinger_bands_signal
+from strategy.cci_emerging_trends import cci_emerging_trends_signal
+from strategy.chaikin_oscillator import co_signal
+from strategy.frame_cache import FrameCache
+from strategy.macd_crossover import macd_crossover_signal
+from strategy.money_flow_index import mfi_signal
+from strategy.moving_average_crossover import moving_average_crossover_signal
+from strategy.pipeline import STRATEGIES, run_strategy
+from strategy.rate_of_change import roc_signal
+from strategy.relative_strength_index import rsi_signal
+from strategy.stochastic_oscillator import stc_oscillator_signal
+from strategy.true_strength_index import tsi_signal
+from strategy.volume_roc import volume_roc_signal
+from strategy.williams_R import williams_r_signal
+
+# market name -> (price store subdirectory, ticker suffix)
+MARKETS = {
+    "hkex": (price_store.HKEX_DAY, ".HK"),
+    "nasdaq": ("microeconomic_data/nasdaq_ticks_day", ""),
+    "nyse": ("microeconomic_data/nyse_ticks_day", ""),
+    "jp": ("microeconomic_data/jp_ticks_day", ".T"),
+}
+
+PANEL_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+
+def load_panel(markets=("hkex",), start=None, end=None, columns=PANEL_COLUMNS, symbols=None):
+    """
+    Load every ticker of the given markets into aligned (date x ticker) frames.
+
+    Parameters
+    ----------
+    markets : sequence of str
+        Keys of MARKETS.
+    start, end : str or None
+        Inclusive date range (either may be None).
+    columns : sequence of str
+        Price columns to load.
+    symbols : dict of str -> list of str, or None
+        Market -> symbols to load instead of every CSV in the market.
+
+    Returns
+    -------
+    panel : dict of str -> pd.DataFrame
+        Column name -> frame indexed by the union of all tickers' dates, one column
+        per ticker (e.g. '0005.HK'); NaN where a ticker has no row for a date.
+    """
+    loaded = []
+    for market in markets:
+        subdir, suffix = MARKETS[market]
+        names = price_store.list_symbols(subdir) if symbols is None else symbols.get(market, [])
+        for symbol in names:
+            prices = price_store.get_arrays(symbol, start, end, subdir)
+            if len(prices.dates):
+                loaded.append((symbol + suffix, prices))
+
+    dates = np.unique(np.concatenate([prices.dates for _, prices in loaded])) if loaded \
+        else np.array([], dtype="datetime64[ns]")
+    index = pd.DatetimeIndex(dates, name="Date")
+    tickers = [ticker for ticker, _ in loaded]
+
+    panel = {}
+    for column in columns:
+        values = np.full((len(dates), len(tickers)), np.nan)
+        for j, (_, prices) in enumerate(loaded):
+            rows = np.searchsorted(dates, prices.dates)
+            values[rows, j] = prices.values[prices.columns.index(column)]
+        panel[column] = pd.DataFrame(values, index=index, columns=tickers)
+    return panel
+
+
+# strategy name -> panel rule(cache, **params) returning the signal values of every ticker
+PANEL_SIGNALS = {
+    "bollinger_bands": bollinger_bands_signal,
+    "cci_emerging_trends": cci_emerging_trends_signal,
+    "chaikin_oscillator": co_signal,
+    "macd_crossover": macd_crossover_signal,
+    "mfi": mfi_signal,
+    "moving_average_crossover": moving_average_crossover_signal,
+    "roc": roc_signal,
+    "rsi": rsi_signal,
+    "stc_oscillator": stc_oscillator_signal,
+    "tsi": tsi_signal,
+    "volume_roc": volume_roc_signal,
+    "williams_R": williams_r_signal,
+}
+
+
+def _pack(panel):
+    # each ticker's valid rows (Close present), moved up to start at row 0 of a dense
+    # (row x ticker) panel and NaN-padded at the end; windows then cover the same rows
+    # as on the ticker's own frame
+    valid = panel['Close'].notna().to_numpy()
+    dates, tickers = np.nonzero(valid)
+    rows = (np.cumsum(valid, axis=0) - 1)[dates, tickers]
+    length = int(valid.sum(axis=0).max()) if valid.size else 0
+
+    packed = {}
+    for column, frame in panel.items():
+        values = np.full((length, frame.shape[1]), np.nan)
+        values[rows, tickers] = frame.to_numpy(dtype=np.float64)[dates, tickers]
+        packed[column] = pd.DataFrame(values, columns=frame.columns)
+    return packed, (dates, rows, tickers)
+
+
+def _panel_rule_signals(panel, rule, params):
+    packed, (dates, rows, tickers) = _pack(panel)
+    values = np.asarray(rule(FrameCache(packed), **params), dtype=np.float64)
+
+    close = panel['Close']
+    signals = np.full(close.shape, np.nan)
+    signals[dates, tickers] = values[rows, tickers]
+    return pd.DataFrame(signals, index=close.index, columns=close.columns)
+
+
+def _per_ticker_signals(panel, strategy, params):
+    packed, (dates, _, tickers) = _pack(panel)
+    close = panel['Close']
+    signals = np.full(close.shape, np.nan)
+    for j, ticker in enumerate(close.columns):
+        ticker_dates = dates[tickers == j]
+        df = pd.DataFrame({column: frame[ticker].to_numpy()[:len(ticker_dates)]
+                           for column, frame in packed.items()}, index=close.index[ticker_dates])
+        try:
+            signals[ticker_dates, j] = run_strategy(df, strategy, params)['signal'].fillna(0.0)
+        except (ValueError, KeyError, IndexError, ZeroDivisionError):
+            signals[ticker_dates, j] = 0.0  # too little history for this strategy: the ticker stays flat
+    return pd.DataFrame(signals, index=close.index, columns=close.columns)
+
+
+def panel_signals(panel, strategy, params=None):
+    """
+    Return the (date x ticker) signal frame of one strategy (a key of STRATEGIES) on a panel.
+
+    Each ticker's signals are computed on its own dates (rows where its Close is
+    present) and are NaN on the other rows of the panel.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"unknown strategy {strategy!r}; choose from {sorted(STRATEGIES)}")
+    if strategy in PANEL_SIGNALS:
+        return _panel_rule_signals(panel, PANEL_SIGNALS[strategy], params or {})
+    return _per_ticker_signals(panel, strategy, params)
+
+
+def _metrics(result, signals, close, shares=100):
+    positions = shares * signals.ffill().fillna(0.0)
+    table = PerformanceMetrics(result, positions=positions, prices=close.ffill().bfill())
+    table['trades'] = (signals.ffill().fillna(0.0).diff() > 0).sum().astype(int)
+    return table
+
+
+def screen(panel, strategies=None, params=None, initial_capital=float(100000.0), rank_by='sharpe'):
+    """
+    Evaluate strategies on every ticker of a panel and rank the results.
+
+    Parameters
+    ----------
+    panel : dict of str -> pd.DataFrame
+        As returned by load_panel; needs 'Close', plus 'High', 'Low' and 'Volume'
+        for the strategies that use them.
+    strategies : list of str or None
+        Keys of STRATEGIES; None screens every strategy with a panel rule.
+    params : dict or None
+        Strategy name -> keyword arguments for its indicator class.
+    initial_capital : float
+        Starting cash for each backtest.
+    rank_by : str
+        Result column to sort by, descending.
+
+    Returns
+    -------
+    results : pd.DataFrame
+        One row per (ticker, strategy) with the latest 'signal', the 'date' it was
+        produced on, the evaluate.METRICS (total_return, sharpe, cagr,
+        max_drawdown, ...) and trades.
+    """
+    if strategies is None:
+        strategies = list(PANEL_SIGNALS)
+    params = params or {}
+    close = panel['Close']
+
+    tables = []
+    for strategy in strategies:
+        signals = panel_signals(panel, strategy, params.get(strategy))
+        result = BacktestBatch(close, signals, initial_capital=initial_capital)
+        table = _metrics(result, signals, close)
+
+        # latest signal of each ticker on its own last trading day
+        last = close.notna()[::-1].idxmax()
+        table.insert(0, 'date', last)
+        table.insert(1, 'signal', [signals.at[date, ticker] for ticker, date in last.items()])
+        table.insert(0, 'strategy', strategy)
+        tables.append(table.rename_axis('ticker').reset_index())
+
+    results = pd.concat(tables, ignore_index=True)
+    return results.sort_values(rank_by, ascending=False, kind='stable').reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Screen indicator strategies across a market universe.")
+    parser.add_argument('--markets', nargs='+', default=['hkex'], choices=sorted(MARKETS))
+    parser.add_argument('--strategies', nargs='+', default=None, choices=sorted(STRATEGIES))
+    parser.add_argument('--start', default=None)
+    parser.add_argument('--end', default=None)
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--out', default='screen_results.csv')
+    args = parser.parse_args()
+
+    panel = load_panel(args.markets, args.start, args.end)
+    results = screen(panel, args.strategies)
+    print(results.head(args.top).to_string(index=False))
+    results.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
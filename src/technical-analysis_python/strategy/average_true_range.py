@@ -1,4 +1,5 @@
 from .indicator import Indicator
+from .cumulative import average_true_range
 import sys
 import numpy as np
 import pandas as pd
@@ -13,39 +14,25 @@ class atr(Indicator):
         super().__init__(df)
         self.df = df
         self.window = window # signal line window size
-        self.array_high = list(self.df['High'])
-        self.array_low = list(self.df['Low'])
 
     """
     Formula
     -
-    Current ATR = [(Prior ATR x 13) + Current TR] / n
+    Current ATR = [(Prior ATR x (n-1)) + Current TR] / n
 
+    TR = max(High - Low, |High - Prior Close|, |Low - Prior Close|)
     1st TR value = High - Low
-    1st n-day ATR = average of the daily TR values for the last n days
+    1st n-day ATR = average of the daily TR values for the first n days
     """
 
     def cal_ATR(self, window=14):
         self.window = window
-
-        # compute TR
-        tr = [None] * len(self.df)
-
-        for i in range(len(self.df)):
-            tr[i] = self.array_high[i] - self.array_low[i]
-
-        atr = [None] * len(self.df)
-        atr[15] = sum(tr[0:15]) / self.window
-        
-        for i in range(16,len(self.df)):
-            atr[i] = (atr[i-1] * (self.window-1) + tr[i]) / self.window
-        
-        self.df['ATR'] = atr
+        self.results['ATR'] = average_true_range(self.df['High'], self.df['Low'], self.df['Close'], self.window)
 
     def plot_ATR(self):
         # Plot graph
         fig = plt.figure()
-        self.df['ATR'].plot(lw=1.2, color='blue', label='Average True Range (ATR)')
+        self.results['ATR'].plot(lw=1.2, color='blue', label='Average True Range (ATR)')
         plt.legend()
 
         return fig
@@ -56,11 +43,11 @@ class atr(Indicator):
     [50-day EMA > 200-day EMA]  AND  [(250-day ATR / 20-day SMA) * 100 < 4] 
     """
     def high_volatility(self):
-        exp1 = self.df['Close'].ewm(span=50, adjust=False).mean().tail(1).item()
-        exp2 = self.df['Close'].ewm(span=200, adjust=False).mean().tail(1).item()
+        exp1 = self.cache.ema(50).tail(1).item()
+        exp2 = self.cache.ema(200).tail(1).item()
 
-        exp3 = self.df['Close'].rolling(window=20, min_periods=1, center=False).mean().tail(1).item()
-        atr = self.df['ATR'].tail(1).item()
+        exp3 = self.cache.sma(20, min_periods=1).tail(1).item()
+        atr = self.results['ATR'].tail(1).item()
 
         # debug
         # print(exp1)
@@ -1,4 +1,4 @@
-from .indicator import Indicator
+from .indicator import Indicator, threshold_signal
 import sys
 import numpy as np
 import pandas as pd
@@ -27,23 +27,21 @@ class bollinger_bands(Indicator):
     Lower Band = 20-day SMA - (20-day standard deviation of price x 2)
     """
 
-    def plot_BB(self):
-        # Compute middle band
-        self.df['Middle band'] = self.df['Close'].rolling(self.window).mean()
-
-        # Compute 20-day s.d.
-        self._mstd = self.df['Close'].rolling(self.window).std(ddof=0)
+    def cal_BB(self):
+        middle, upper, lower = _bands(self.cache, self.window)
+        self.results['Middle band'] = middle
+        self.results['Upper band'] = upper
+        self.results['Lower band'] = lower
 
-        # Computer upper and lower bands
-        self.df['Upper band'] = self.df['Middle band']  + self._mstd * 2
-        self.df['Lower band'] = self.df['Middle band']  - self._mstd * 2
+    def plot_BB(self):
+        self.cal_BB()
 
         # Plot graph
         fig = plt.figure()
         self.df['Close'].plot(lw=0.8, label='Closing price')
-        self.df['Upper band'].plot(lw=1.2, color='blue', label='Upper band')
-        self.df['Lower band'].plot(lw=1.2, color='red', label='Lower band')
-        self.df['Middle band'].plot(lw=1.2, color='black', label='Middle band')
+        self.results['Upper band'].plot(lw=1.2, color='blue', label='Upper band')
+        self.results['Lower band'].plot(lw=1.2, color='red', label='Lower band')
+        self.results['Middle band'].plot(lw=1.2, color='black', label='Middle band')
         
         plt.legend()
 
@@ -52,13 +50,7 @@ class bollinger_bands(Indicator):
     def gen_signals(self):
         # Initialize the `signals` DataFrame with the `signal` column
         signals = pd.DataFrame(index=self.df.index)
-        signals['signal'] = 0.0
-
-        # Generate buy signal
-        signals.loc[self.df['Close'] < self.df['Lower band'], 'signal'] = 1.0
-
-        # Generate sell signal
-        signals.loc[self.df['Close'] > self.df['Upper band'], 'signal'] = -1.0
+        signals['signal'] = _signal(self.df['Close'], self.results['Upper band'], self.results['Lower band'])
 
         # Generate trading order
         signals['positions'] = signals['signal'].diff()
@@ -68,3 +60,23 @@ class bollinger_bands(Indicator):
         self.signals = signals
 
         return signals
+
+
+def _bands(cache, window):
+    # Middle band and its 20-day s.d.
+    middle = cache.sma(window)
+    mstd = cache.rolling_std(window, ddof=0)
+
+    # Upper and lower bands
+    return middle, middle + mstd * 2, middle - mstd * 2
+
+
+def _signal(close, upper, lower):
+    # buy below the lower band, sell above the upper band
+    return threshold_signal(close < lower, close > upper)
+
+
+def bollinger_bands_signal(cache, window=20):
+    """Signal values of bollinger_bands from a FrameCache of one frame or a (row x ticker) panel."""
+    _, upper, lower = _bands(cache, window)
+    return _signal(cache.series('Close'), upper, lower)
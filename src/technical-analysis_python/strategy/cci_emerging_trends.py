@@ -1,4 +1,4 @@
-from .indicator import Indicator 
+from .indicator import Indicator, threshold_signal
 import sys
 import numpy as np
 import pandas as pd
@@ -53,23 +53,13 @@ class cciEmergingTrends(Indicator):
         signals = pd.DataFrame(index=self.df.index)
         signals['signal'] = 0.0
 
-        signals['Typical price'] = (
-            self.df['High'] + self.df['Low'] + self.df['Close']) / 3
+        tp, sma, mean_deviation, cci = _cci(self.cache, self.window_size, self.constant)
+        signals['Typical price'] = tp
+        signals['SMA'] = sma
+        signals['mean_deviation'] = mean_deviation
+        signals['CCI'] = cci
 
-        signals['SMA'] = signals['Typical price'].rolling(
-            window=self.window_size, min_periods=1, center=False).mean()
-
-        signals['mean_deviation'] = signals['Typical price'].rolling(
-            window=20, min_periods=1, center=False).std()
-
-        signals['CCI'] = (signals['Typical price'] - signals['SMA']) / \
-        (self.constant * signals['mean_deviation'])
-
-        # Generate buy signal
-        signals.loc[signals['CCI'] > 100, 'signal'] = 1.0
-
-        # Generate sell signal
-        signals.loc[signals['CCI'] < -100, 'signal'] = -1.0
+        signals['signal'] = _signal(signals['CCI'])
 
         # Generate trading order
         signals['positions'] = signals['signal'].diff()
@@ -77,3 +67,20 @@ class cciEmergingTrends(Indicator):
         self.signals = signals
 
         return signals
+
+
+def _cci(cache, window_size, constant):
+    tp = cache.typical_price()
+    sma = cache.sma(window_size, 'Typical price', min_periods=1)
+    mean_deviation = cache.rolling_std(20, 'Typical price', min_periods=1)
+    return tp, sma, mean_deviation, (tp - sma) / (constant * mean_deviation)
+
+
+def _signal(cci):
+    # buy when CCI surges above +100, sell when it plunges below -100
+    return threshold_signal(cci > 100, cci < -100)
+
+
+def cci_emerging_trends_signal(cache, window_size=14, constant=0.015):
+    """Signal values of cciEmergingTrends from a FrameCache of one frame or a (row x ticker) panel."""
+    return _signal(_cci(cache, window_size, constant)[3])
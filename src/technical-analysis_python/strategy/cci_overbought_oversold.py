@@ -56,14 +56,11 @@ class cciOverboughtOversold(Indicator):
         signals['label'] = 0.0
         signals['signal'] = 0.0
 
-        signals['Typical price'] = (
-            self.df['High'] + self.df['Low'] + self.df['Close']) / 3
+        signals['Typical price'] = self.cache.typical_price()
 
-        signals['SMA'] = signals['Typical price'].rolling(
-            window=self.window_size, min_periods=1, center=False).mean()
+        signals['SMA'] = self.cache.sma(self.window_size, 'Typical price', min_periods=1)
 
-        signals['mean_deviation'] = signals['Typical price'].rolling(
-            window=20, min_periods=1, center=False).std()
+        signals['mean_deviation'] = self.cache.rolling_std(20, 'Typical price', min_periods=1)
 
         signals['CCI'] = (signals['Typical price'] - signals['SMA']) / \
         (self.constant * signals['mean_deviation'])
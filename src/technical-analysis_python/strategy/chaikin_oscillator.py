@@ -1,4 +1,5 @@
-from .indicator import Indicator
+from .indicator import Indicator, threshold_signal
+from .cumulative import accumulation_distribution, chaikin_oscillator
 import sys
 import numpy as np
 import pandas as pd
@@ -32,30 +33,19 @@ class co(Indicator):
    
     """
 
+    def cal_CO(self):
+        # Compute ADL (cumulative money flow volume)
+        self.results['ADL'] = accumulation_distribution(self.df['High'], self.df['Low'],
+                                                   self.df['Close'], self.df['Volume'])
+        self.results['Chaikin'] = chaikin_oscillator(self.df['High'], self.df['Low'], self.df['Close'],
+                                                self.df['Volume'], self.short_w, self.long_w)
+
     def plot_CO(self):
-        # Compute money flow multiplier
-        self.df['MFM'] = ((self.df['Close'] - self.df['Low']) - self.df['High'] - self.df['Close']) / (self.df['High'] - self.df['Low'])
-        # Compute money flow volume
-        self.df['MFV'] = self.df['MFM'] * self.df['Volume']
-        
-        # mfm = self.df['MFM']
-        
-        # adl = [None] * len(self.df)
-        # adl[0] = self.df['Close'][0] * self.df['Volume'][0]
-        # for i in range (1,len(self.df)):
-        #     adl[i] = adl[i-1] + mfm[i]
-        # self.df['ADL'] = adl
-
-        # Compute ADL
-        self.df['ADL'] = self.df['Close'].shift(1) + self.df['MFV']
-
-        ema_long = self.df['ADL'].ewm(ignore_na=False, min_periods=0, com=self.short_w, adjust=True).mean()
-        ema_short = self.df['ADL'].ewm(ignore_na=False, min_periods=0, com=self.long_w, adjust=True).mean()
-        self.df['Chaikin'] = ema_short - ema_long
+        self.cal_CO()
 
         # Plot graph
         fig = plt.figure()
-        self.df['Chaikin'].plot(lw=1.2, color='blue', label='Chaikin Oscillator')
+        self.results['Chaikin'].plot(lw=1.2, color='blue', label='Chaikin Oscillator')
         plt.legend()
 
         return fig
@@ -63,13 +53,7 @@ class co(Indicator):
     def gen_signals(self):
         # Initialize the `signals` DataFrame with the `signal` column
         signals = pd.DataFrame(index=self.df.index)
-        signals['signal'] = 0.0
-
-        # Generate buy signal
-        signals.loc[self.df['Chaikin'] > 0, 'signal'] = 1.0
-
-        # Generate sell signal
-        signals.loc[self.df['Chaikin'] < 0, 'signal'] = -1.0
+        signals['signal'] = _signal(self.results['Chaikin'])
 
         # Generate trading order
         signals['positions'] = signals['signal'].diff()
@@ -79,3 +63,14 @@ class co(Indicator):
         self.signals = signals
 
         return signals
+
+
+def _signal(chaikin):
+    # buy when the oscillator is positive, sell when it is negative
+    return threshold_signal(chaikin > 0, chaikin < 0)
+
+
+def co_signal(cache, short_w=3, long_w=10):
+    """Signal values of co from a FrameCache of one frame or a (row x ticker) panel."""
+    return _signal(chaikin_oscillator(cache.series('High'), cache.series('Low'), cache.series('Close'),
+                                      cache.series('Volume'), short_w, long_w))
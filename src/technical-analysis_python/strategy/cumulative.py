@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+"""
+Cumulative indicators
+-
+On-Balance Volume, Average True Range and the Accumulation Distribution Line (with
+the Chaikin Oscillator on top of it) as array kernels: sign-weighted cumulative sums
+and a Wilder IIR filter instead of per-element Python loops.
+
+Every function takes NumPy arrays (or Series / DataFrames) and works along axis 0,
+so a 1-D series gives one ticker and a 2-D (date x ticker) array a whole universe
+in one pass. Results are float64 arrays of the same shape.
+"""
+
+
+def _as_float(values):
+    return np.asarray(values, dtype=np.float64)
+
+
+def _prior(values):
+    """values shifted down one row (first row NaN)."""
+    prior = np.empty_like(values)
+    prior[:1] = np.nan
+    prior[1:] = values[:-1]
+    return prior
+
+
+def _ewm(values, **kwargs):
+    """pandas ewm(...).mean() along axis 0 for 1-D or 2-D arrays."""
+    frame = pd.DataFrame(values.reshape(len(values), -1))
+    return frame.ewm(**kwargs).mean().to_numpy().reshape(values.shape)
+
+
+"""
+Formula
+-
+OBV = Previous OBV + sign(Close - Prior Close) x Volume, starting at 0
+"""
+def on_balance_volume(close, volume):
+    close = _as_float(close)
+    direction = np.zeros_like(close)
+    direction[1:] = np.sign(close[1:] - close[:-1])
+    direction[np.isnan(direction)] = 0.0  # missing prices leave OBV unchanged
+    return np.cumsum(direction * _as_float(volume), axis=0)
+
+
+"""
+Formula
+-
+TR = max(High - Low, |High - Prior Close|, |Low - Prior Close|)  (1st TR = High - Low)
+"""
+def true_range(high, low, close=None):
+    high, low = _as_float(high), _as_float(low)
+    tr = high - low
+    if close is not None:
+        prior_close = _prior(_as_float(close))
+        gaps = np.fmax(np.abs(high - prior_close), np.abs(low - prior_close))  # NaN on the 1st row
+        tr = np.fmax(tr, gaps)
+    return tr
+
+
+"""
+Formula (Wilder smoothing)
+-
+1st value = average of the first n values (at row n - 1)
+Current = [(Prior x (n - 1)) + Current value] / n
+
+i.e. a first-order IIR filter, y[i] = (1 - 1/n) y[i-1] + (1/n) x[i], run by pandas' ewm.
+"""
+def wilder_smooth(values, n):
+    values = _as_float(values)
+    out = np.full(values.shape, np.nan)
+    if n < 1:
+        raise ValueError("n must be at least 1")
+    if len(values) < n:
+        return out
+
+    seeded = values[n - 1:].copy()
+    seeded[0] = values[:n].mean(axis=0)
+    out[n - 1:] = _ewm(seeded, alpha=1.0 / n, adjust=False)
+    return out
+
+
+def average_true_range(high, low, close, n=14):
+    """n-period ATR: Wilder-smoothed true range (NaN for the first n - 1 rows)."""
+    return wilder_smooth(true_range(high, low, close), n)
+
+
+"""
+Formula
+-
+Money Flow Multiplier = [(Close - Low) - (High - Close)] / (High - Low)  (0 when High = Low)
+Money Flow Volume = Money Flow Multiplier x Volume
+ADL = Previous ADL + Money Flow Volume
+"""
+def accumulation_distribution(high, low, close, volume):
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    span = high - low
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mfm = np.where(span != 0, ((close - low) - (high - close)) / span, 0.0)
+    mfv = np.nan_to_num(mfm * _as_float(volume))
+    return np.cumsum(mfv, axis=0)
+
+
+"""
+Formula
+-
+Chaikin Oscillator = (short_w-day EMA of ADL) - (long_w-day EMA of ADL)
+"""
+def chaikin_oscillator(high, low, close, volume, short_w=3, long_w=10):
+    adl = accumulation_distribution(high, low, close, volume)
+    return _ewm(adl, span=short_w, adjust=False) - _ewm(adl, span=long_w, adjust=False)
@@ -0,0 +1,100 @@
+from .rolling import rolling_max, rolling_min
+
+"""
+Per-frame memo of shared intermediates
+-
+Several indicators build the same intermediates from one price frame: typical price
+(both CCIs, MFI), price changes (RSI, TSI), EMAs of Close (MACD, ATR volatility
+check), rolling means / standard deviations (CCI, Bollinger Bands, moving average
+crossover) and rolling extrema (stochastic oscillator, Williams %R).
+
+A FrameCache computes each of these once per frame and hands the same object to
+every indicator that asks for it, keyed by what was computed and its parameters.
+Indicators reach it through Indicator.cache; strategy.pipeline shares one cache across
+all strategies run on a frame.
+
+Cached values are shared between indicators, so treat them as read-only. The cache
+assumes the frame is not modified after it is created (indicators only read it).
+
+The frame may also be a panel: a dict of column name -> (row x ticker) DataFrame, as
+packed by screener.py. Every intermediate then comes out as a frame (or 2-D array)
+with one column per ticker, which the module-level *_signal rules of the strategies
+accept in place of single series.
+
+source: a column of the frame ('Close', 'High', ...) or 'Typical price'.
+"""
+
+
+class FrameCache:
+    def __init__(self, df):
+        self.df = df
+        self._memo = {}
+        self.computed = []  # keys in the order they were computed (for inspection / tests)
+
+    def __len__(self):
+        return len(self._memo)
+
+    def __contains__(self, key):
+        return key in self._memo
+
+    def get(self, key, compute):
+        """Return the value memoised under key, calling compute() the first time."""
+        try:
+            return self._memo[key]
+        except KeyError:
+            value = self._memo[key] = compute()
+            self.computed.append(key)
+            return value
+
+    def clear(self):
+        self._memo.clear()
+        self.computed.clear()
+
+    def series(self, source):
+        if source == 'Typical price':
+            return self.typical_price()
+        return self.df[source]
+
+    """
+    Typical Price (TP) = (High + Low + Close) / 3
+    """
+    def typical_price(self):
+        return self.get(('Typical price',),
+                        lambda: (self.df['High'] + self.df['Low'] + self.df['Close']) / 3)
+
+    """
+    Change = Current value - value `periods` rows earlier (NaN for the first rows)
+    """
+    def change(self, source='Close', periods=1):
+        def compute():
+            values = self.series(source)
+            return values - values.shift(periods)
+        return self.get(('change', source, periods), compute)
+
+    def ema(self, span, source='Close', adjust=False):
+        """Series.ewm(span=span, adjust=adjust).mean() of source."""
+        return self.get(('ema', source, span, adjust),
+                        lambda: self.series(source).ewm(span=span, adjust=adjust).mean())
+
+    def sma(self, window, source='Close', min_periods=None):
+        """Series.rolling(window, min_periods).mean() of source."""
+        return self.get(('sma', source, window, min_periods),
+                        lambda: self.series(source).rolling(window=window, min_periods=min_periods).mean())
+
+    def rolling_std(self, window, source='Close', min_periods=None, ddof=1):
+        """Series.rolling(window, min_periods).std(ddof) of source."""
+        return self.get(('std', source, window, min_periods, ddof),
+                        lambda: self.series(source).rolling(window=window, min_periods=min_periods).std(ddof=ddof))
+
+    def rolling_max(self, window, source='High'):
+        """Rolling maximum of source as a read-only float64 array (see rolling.rolling_max)."""
+        return self.get(('max', source, window), lambda: _read_only(rolling_max(self.series(source), window)))
+
+    def rolling_min(self, window, source='Low'):
+        """Rolling minimum of source as a read-only float64 array (see rolling.rolling_min)."""
+        return self.get(('min', source, window), lambda: _read_only(rolling_min(self.series(source), window)))
+
+
+def _read_only(values):
+    values.setflags(write=False)
+    return values
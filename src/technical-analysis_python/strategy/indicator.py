@@ -2,11 +2,47 @@ import sys
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from .frame_cache import FrameCache
+
+
+def threshold_signal(buy, sell):
+    """
+    Signal values from boolean buy / sell conditions: 1.0 where buy, -1.0 where sell
+    (sell wins where both hold, as gen_signals assigns it last), 0.0 elsewhere.
+
+    Works element-wise on Series, (date x ticker) frames or arrays, so the same rule
+    serves one ticker or a whole panel; returns a float64 array.
+    """
+    return np.where(sell, -1.0, np.where(buy, 1.0, 0.0))
+
 
 class Indicator:
     def __init__(self, df):
         self.df = df
 
+    @property
+    def cache(self):
+        # shared intermediates of self.df (see frame_cache.py); a pipeline may assign
+        # one cache to several indicators on the same frame
+        cache = getattr(self, '_cache', None)
+        if cache is None or cache.df is not self.df:
+            cache = self._cache = FrameCache(self.df)
+        return cache
+
+    @cache.setter
+    def cache(self, cache):
+        self._cache = cache
+
+    @property
+    def results(self):
+        # computed series (MACD, %K, ...) indexed like self.df; indicators write here
+        # instead of adding columns to self.df, so the price frame is only ever read
+        df, results = getattr(self, '_results', (None, None))
+        if df is not self.df:
+            results = pd.DataFrame(index=self.df.index)
+            self._results = (self.df, results)
+        return results
+
     def plot_signals(self, signals):
         # Initialize the plot figure
         fig = plt.figure(figsize=(8, 6))
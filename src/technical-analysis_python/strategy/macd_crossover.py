@@ -11,8 +11,11 @@ Buy when MACD crosses above the signal line, (bullish crossover)
 sell when MACD crosses below the signal line. (bearish crossover)
 """
 class macdCrossover(Indicator):
-    def __init__(self, df):
+    def __init__(self, df, short_span=12, long_span=26, signal_span=9):
         self.df = df
+        self.short_span = short_span
+        self.long_span = long_span
+        self.signal_span = signal_span
 
     """
     Formula
@@ -21,15 +24,17 @@ class macdCrossover(Indicator):
 
     EMA: Exponential Moving Average
     """
+    def cal_MACD(self):
+        macd, signal_line = _macd(self.cache, self.short_span, self.long_span, self.signal_span)
+        self.results['MACD'] = macd
+        self.results['Signal line'] = signal_line
+
     def plot_MACD(self):
-        exp1 = self.df['Close'].ewm(span=12, adjust=False).mean()
-        exp2 = self.df['Close'].ewm(span=26, adjust=False).mean()
-        self.df['MACD'] = exp1 - exp2
-        self.df['Signal line'] = self.df['MACD'].ewm(span=9, adjust=False).mean()
+        self.cal_MACD()
 
         fig = plt.figure()
-        plt.plot(self.df.index, self.df['MACD'], label='MACD', color = '#CA0020')
-        plt.plot(self.df.index, self.df['Signal line'], label='Signal Line', color='#0571b0')
+        plt.plot(self.df.index, self.results['MACD'], label='MACD', color = '#CA0020')
+        plt.plot(self.df.index, self.results['Signal line'], label='Signal Line', color='#0571b0')
         plt.legend(loc='upper left')
 
         return fig
@@ -40,7 +45,7 @@ class macdCrossover(Indicator):
         signals['signal'] = 0.0
 
         # Generate signals
-        signals['signal'] = np.where(self.df['MACD'] > self.df['Signal line'], 1.0, 0.0)   
+        signals['signal'] = _signal(self.results['MACD'], self.results['Signal line'])
         
         # Generate trading order, buy signal = 1, sell signal = -1
         signals['positions'] = signals['signal'].diff()
@@ -57,9 +62,9 @@ class macdCrossover(Indicator):
         ax1 = fig.add_subplot(111,  ylabel='Price in $')
 
         # Plot MACD and signal line
-        self.df[['MACD', 'Signal line']].plot(ax=ax1, lw=1.2)
+        self.results[['MACD', 'Signal line']].plot(ax=ax1, lw=1.2)
 
-        MACD_array = self.df['MACD'].to_numpy()
+        MACD_array = self.results['MACD'].to_numpy()
 
         # Plot the buy signals
         ax1.plot(self.signals.loc[self.signals.positions == 1.0].index, 
@@ -72,3 +77,18 @@ class macdCrossover(Indicator):
                 'v', markersize=8, color='r')
 
         return fig
+
+
+def _macd(cache, short_span, long_span, signal_span):
+    macd = cache.ema(short_span) - cache.ema(long_span)
+    return macd, macd.ewm(span=signal_span, adjust=False).mean()
+
+
+def _signal(macd, signal_line):
+    # long while MACD is above the signal line
+    return np.where(macd > signal_line, 1.0, 0.0)
+
+
+def macd_crossover_signal(cache, short_span=12, long_span=26, signal_span=9):
+    """Signal values of macdCrossover from a FrameCache of one frame or a (row x ticker) panel."""
+    return _signal(*_macd(cache, short_span, long_span, signal_span))
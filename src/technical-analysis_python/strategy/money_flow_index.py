@@ -1,4 +1,5 @@
-from .indicator import Indicator
+from .indicator import Indicator, threshold_signal
+from .rolling import rolling_sum
 import sys
 import numpy as np
 import pandas as pd
@@ -30,30 +31,21 @@ class mfi(Indicator):
     Money Flow Ratio = (14-period Positive Money Flow) / (14-period Negative Money Flow)
     """
 
-    def plot_MFI(self):
-        # Typical price
-        tp = (self.df['High'] + self.df['Low'] + self.df['Close']) / 3.0
-
+    def cal_MFI(self):
+        sign, money_flow = _signed_money_flow(self.cache.typical_price(), self.df['Volume'])
         # positive = 1, negative = -1
-        self.df['Sign'] = np.where(tp > tp.shift(
-            1), 1, np.where(tp < tp.shift(1), -1, 0))
-
+        self.results['Sign'] = sign
         # Raw money flow
-        self.df['Money flow'] = tp * self.df['Volume'] * self.df['Sign']
-
-        # Positive and negative money flow with n periods
-        n_positive_mf = self.df['Money flow'].rolling(
-            self.n).apply(lambda x: np.sum(np.where(x >= 0.0, x, 0.0)), raw=True)
-        n_negative_mf = abs(
-            self.df['Money flow'].rolling(self.n).apply(lambda x: np.sum(np.where(x < 0.0, x, 0.0)), raw=True))
-
+        self.results['Money flow'] = money_flow
         # Money flow index
-        mf_ratio = n_positive_mf / n_negative_mf
-        self.df['MFI'] = (100 - (100 / (1 + mf_ratio)))
+        self.results['MFI'] = _mfi_from_flow(money_flow, self.n)
+
+    def plot_MFI(self):
+        self.cal_MFI()
 
         # Plot graph
         fig = plt.figure()
-        self.df['MFI'].plot(lw=1.2, label='Money Flow Index (MFI)')
+        self.results['MFI'].plot(lw=1.2, label='Money Flow Index (MFI)')
         plt.legend()
 
         return fig
@@ -61,13 +53,7 @@ class mfi(Indicator):
     def gen_signals(self):
         # Initialize the `signals` DataFrame with the `signal` column
         signals = pd.DataFrame(index=self.df.index)
-        signals['signal'] = 0.0
-
-        # Generate buy signal
-        signals.loc[self.df['MFI'] > self.upper, 'signal'] = 1.0
-
-        # Generate sell signal
-        signals.loc[self.df['MFI'] < self.lower, 'signal'] = -1.0
+        signals['signal'] = _signal(self.results['MFI'], self.lower, self.upper)
 
         # Generate trading order
         signals['positions'] = signals['signal'].diff()
@@ -77,3 +63,53 @@ class mfi(Indicator):
         self.signals = signals
 
         return signals
+
+
+def _typical_price(high, low, close):
+    return (np.asarray(high, dtype=np.float64) + np.asarray(low, dtype=np.float64)
+            + np.asarray(close, dtype=np.float64)) / 3.0
+
+
+def _signed_money_flow(tp, volume):
+    # Direction of the typical price vs the prior bar (0 on the first bar)
+    tp = np.asarray(tp, dtype=np.float64)
+    prior_tp = np.full_like(tp, np.nan)
+    prior_tp[1:] = tp[:-1]
+    sign = np.where(tp > prior_tp, 1, np.where(tp < prior_tp, -1, 0))
+
+    return sign, tp * np.asarray(volume) * sign
+
+
+def _mfi_from_flow(money_flow, n):
+    # Positive and negative money flow with n periods (NaN flows stay NaN)
+    n_positive_mf = rolling_sum(np.where(money_flow < 0.0, 0.0, money_flow), n)
+    n_negative_mf = np.abs(rolling_sum(np.where(money_flow >= 0.0, 0.0, money_flow), n))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mf_ratio = n_positive_mf / n_negative_mf
+        return 100 - (100 / (1 + mf_ratio))
+
+
+def _signal(values, lower, upper):
+    # buy above the upper threshold, sell below the lower one
+    return threshold_signal(values > upper, values < lower)
+
+
+def money_flow_index(high, low, close, volume, n=14):
+    """
+    n-period Money Flow Index from price / volume arrays, vectorised.
+
+    Accepts 1-D series or 2-D (date x ticker) arrays / DataFrames; a DataFrame `close`
+    gives a DataFrame with its index and columns, otherwise a float64 array.
+    """
+    _, money_flow = _signed_money_flow(_typical_price(high, low, close), volume)
+    result = _mfi_from_flow(money_flow, n)
+    if isinstance(close, pd.DataFrame):
+        return pd.DataFrame(result, index=close.index, columns=close.columns)
+    return result
+
+
+def mfi_signal(cache, n=14, lower=20, upper=80):
+    """Signal values of mfi from a FrameCache of one frame or a (row x ticker) panel."""
+    _, money_flow = _signed_money_flow(cache.typical_price(), cache.series('Volume'))
+    return _signal(_mfi_from_flow(money_flow, n), lower, upper)
@@ -21,20 +21,31 @@ class MovingAverageCrossover(Indicator):
         signals = pd.DataFrame(index=self.df.index)
         signals['signal'] = 0.0
 
-        # Create short simple moving average over the short window
-        signals['short_mavg'] = self.df['Close'].rolling(window=self.short_window, min_periods=1, center=False).mean()
-
-        # Create long simple moving average over the long window
-        signals['long_mavg'] = self.df['Close'].rolling(window=self.long_window, min_periods=1, center=False).mean()
+        # Create short and long simple moving averages over the short and long windows
+        signals['short_mavg'], signals['long_mavg'] = _mavgs(self.cache, self.short_window, self.long_window)
 
         # Generate signals
-        if (len(signals['short_mavg']) > self.short_window and len(signals['long_mavg']) > self.short_window):
-            signals['signal'][self.short_window:] = np.where(signals['short_mavg'][self.short_window:] 
-                                                    > signals['long_mavg'][self.short_window:], 1.0, 0.0)   
+        signals['signal'] = _signal(signals['short_mavg'], signals['long_mavg'], self.short_window)
         
         # Generate trading order, buy signal = 1, sell signal = -1
         signals['positions'] = signals['signal'].diff()
 
         self.signals = signals
 
-        return signals
\ No newline at end of file
+        return signals
+
+
+def _mavgs(cache, short_window, long_window):
+    return cache.sma(short_window, min_periods=1), cache.sma(long_window, min_periods=1)
+
+
+def _signal(short_mavg, long_mavg, short_window):
+    # long while the short average is above the long one, flat for the first short_window rows
+    signal = np.where(short_mavg > long_mavg, 1.0, 0.0)
+    signal[:short_window] = 0.0
+    return signal
+
+
+def moving_average_crossover_signal(cache, short_window=40, long_window=100):
+    """Signal values of MovingAverageCrossover from a FrameCache of one frame or a (row x ticker) panel."""
+    return _signal(*_mavgs(cache, short_window, long_window), short_window)
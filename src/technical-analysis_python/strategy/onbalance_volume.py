@@ -1,4 +1,5 @@
 from .indicator import Indicator
+from .cumulative import on_balance_volume
 import sys
 import numpy as np
 import pandas as pd
@@ -30,24 +31,15 @@ class obv(Indicator):
     Current OBV = Previous OBV (no change)  
     """
 
-    def plot_OBV(self):
-        obv = [0] * len(self.df)
-        array_close = list(self.df['Close'])
-        array_volume = list(self.df['Volume'])
-
-        for i in range(1, len(self.df)):
-            if (array_close[i] > array_close[i-1]):
-                obv[i] = obv[i-1] + array_volume[i]
-            elif (array_close[i] < array_close[i-1]):
-                obv[i] = obv[i-1] - array_volume[i]
-            else:
-                obv[i] = obv[i-1]
+    def cal_OBV(self):
+        self.results['OBV'] = on_balance_volume(self.df['Close'], self.df['Volume'])
 
-        self.df['OBV'] = obv
+    def plot_OBV(self):
+        self.cal_OBV()
 
         # Plot graph
         fig = plt.figure()
-        self.df['OBV'].plot(lw=1.2, color='blue', label='On-Balance Volume (OBV)')
+        self.results['OBV'].plot(lw=1.2, color='blue', label='On-Balance Volume (OBV)')
         plt.legend()
 
         return fig
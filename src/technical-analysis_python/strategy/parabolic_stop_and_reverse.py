@@ -50,114 +50,43 @@ class ParabolicSAR(Indicator):
     Note that SAR can never be below the prior two periods' highs. Should SAR be 
     below one of those highs, use the highest of the two for SAR. 
     """
-    def plot_PSAR(self):
-        length = len(self.df)
-        array_dates = list(self.df.index)
-        array_high = list(self.df['High'])
-        array_low = list(self.df['Low'])
-        array_close = list(self.df['Close'])
-
-        psar = self.df['Close'].copy()
-        psarbull = [None] * len(self.df)
-        psarbear = [None] * len(self.df)
-        
-        bull = True
-        af = self.initial_af # initialise acceleration factor
-
-        if length > 0:
-            ep = array_low[0] # extreme price
-            hp = array_high[0] # extreme high
-            lp = array_low[0] # extreme low
-
-        for i in range(2, len(self.df)):
-            if bull:
-                # Rising SAR
-                psar[i] = psar[i-1] + af * (hp - psar[i-1])
-            else:
-                # Falling SAR
-                psar[i] = psar[i-1] + af * (lp - psar[i-1])
-
-            reverse = False
+    def cal_PSAR(self):
+        psar, psarbull, psarbear = psar_arrays(self.df['High'], self.df['Low'], self.df['Close'],
+                                               self.initial_af, self.max_af)
+        self.results['psar'] = psar
+        self.results['psarbull'] = psarbull
+        self.results['psarbear'] = psarbear
 
-            # Check reversion point
-            if bull:
-                if array_low[i] < psar[i]:
-                    bull = False
-                    reverse = True
-                    psar[i] = hp
-                    lp = array_low[i]
-                    af = self.initial_af
-            else:
-                if array_high[i] > psar[i]:
-                    bull = True
-                    reverse = True
-                    psar[i] = lp
-                    hp = array_high[i]
-                    af = self.initial_af
-
-            if not reverse:
-                if bull:
-                    # Extreme high makes a new high
-                    if array_high[i] > hp:
-                        hp = array_high[i]
-                        af = min(af + self.initial_af, self.max_af)
-
-                    # Check if SAR goes abov prior two periods' lows. 
-                    # If so, use the lowest of the two for SAR.
-                    if array_low[i-1] < psar[i]:
-                        psar[i] = array_low[i-1]
-                    if array_low[i-2] < psar[i]:
-                        psar[i] = array_low[i-2]
-
-                else:
-                    # Extreme low makes a new low
-                    if array_low[i] < lp:
-                        lp = array_low[i]
-                        af = min(af + self.initial_af, self.max_af)
-
-                    # Check if SAR goes below prior two periods' highs. 
-                    # If so, use the highest of the two for SAR.
-                    if array_high[i-1] > psar[i]:
-                        psar[i] = array_high[i-1]
-                    if array_high[i-2] > psar[i]:
-                        psar[i] = array_high[i-2]
-
-            # Save rising SAR
-            if bull:
-                psarbull[i] = psar[i]
-            # Save falling SAR
-            else:
-                psarbear[i] = psar[i]
-
-        self.df['psar'] = psar
-        self.df['psarbull'] = psarbull
-        self.df['psarbear'] = psarbear
+    def plot_PSAR(self):
+        self.cal_PSAR()
 
         # Plot graph
         fig = plt.figure()
 
         self.df['Close'].plot(lw=0.8, color='black', label='Closing price')
 
-        if (self.df['psarbull'].size > 0):
-            self.df['psarbull'].plot(lw=1.2, color='green', label='Rising SAR')
+        if (self.results['psarbull'].size > 0):
+            self.results['psarbull'].plot(lw=1.2, color='green', label='Rising SAR')
 
-        if (self.df['psarbear'].size > 0):
-            self.df['psarbear'] = self.df['psarbear'].astype(float)
-            self.df['psarbear'].plot(lw=1.2, color='red', label='Falling SAR')
+        if (self.results['psarbear'].size > 0):
+            self.results['psarbear'].plot(lw=1.2, color='red', label='Falling SAR')
 
         plt.legend()
 
         return fig
 
     def gen_signals(self):
+        if 'psarbull' not in self.results:
+            self.cal_PSAR()
+
         signals = pd.DataFrame(index=self.df.index)
         signals['signal'] = 0.0
 
         # Generate buy signal
-        signals.loc[self.df['psarbull'].notnull(), 'signal'] = 1.0
+        signals.loc[self.results['psarbull'].notnull(), 'signal'] = 1.0
         
         # Generate sell signal
-        signals.loc[self.df['psarbear'].notnull(), 'signal'] = -1.0
+        signals.loc[self.results['psarbear'].notnull(), 'signal'] = -1.0
 
         # Generate trading order
         signals['positions'] = signals['signal'].diff()
@@ -166,4 +95,111 @@ class ParabolicSAR(Indicator):
 
         self.signals = signals
 
-        return signals
\ No newline at end of file
+        return signals
+
+
+def _psar_loop(high, low, psar, psarbull, psarbear, initial_af, max_af):
+    # SAR recursion; psar holds the closing prices on entry, psarbull / psarbear NaN.
+    # Written for both Python lists and NumPy arrays so numba can compile it unchanged.
+    n = len(psar)
+    if n == 0:
+        return
+
+    bull = True
+    af = initial_af  # initialise acceleration factor
+    hp = high[0]  # extreme high
+    lp = low[0]  # extreme low
+
+    for i in range(2, n):
+        if bull:
+            # Rising SAR
+            psar[i] = psar[i-1] + af * (hp - psar[i-1])
+        else:
+            # Falling SAR
+            psar[i] = psar[i-1] + af * (lp - psar[i-1])
+
+        reverse = False
+
+        # Check reversion point
+        if bull:
+            if low[i] < psar[i]:
+                bull = False
+                reverse = True
+                psar[i] = hp
+                lp = low[i]
+                af = initial_af
+        else:
+            if high[i] > psar[i]:
+                bull = True
+                reverse = True
+                psar[i] = lp
+                hp = high[i]
+                af = initial_af
+
+        if not reverse:
+            if bull:
+                # Extreme high makes a new high
+                if high[i] > hp:
+                    hp = high[i]
+                    af = min(af + initial_af, max_af)
+
+                # Check if SAR goes above prior two periods' lows.
+                # If so, use the lowest of the two for SAR.
+                if low[i-1] < psar[i]:
+                    psar[i] = low[i-1]
+                if low[i-2] < psar[i]:
+                    psar[i] = low[i-2]
+
+            else:
+                # Extreme low makes a new low
+                if low[i] < lp:
+                    lp = low[i]
+                    af = min(af + initial_af, max_af)
+
+                # Check if SAR goes below prior two periods' highs.
+                # If so, use the highest of the two for SAR.
+                if high[i-1] > psar[i]:
+                    psar[i] = high[i-1]
+                if high[i-2] > psar[i]:
+                    psar[i] = high[i-2]
+
+        # Save rising / falling SAR
+        if bull:
+            psarbull[i] = psar[i]
+        else:
+            psarbear[i] = psar[i]
+
+
+try:
+    from numba import njit
+    _psar_loop_jit = njit(cache=True)(_psar_loop)
+except ImportError:  # numba is optional
+    _psar_loop_jit = None
+
+
+def psar_arrays(high, low, close, initial_af=0.02, max_af=0.2):
+    """
+    Parabolic SAR over plain arrays.
+
+    Returns (psar, psarbull, psarbear) float64 arrays: psarbull / psarbear hold the SAR
+    on rising / falling bars and NaN elsewhere; the first two bars are the close and NaN.
+    Compiled with numba when it is installed, otherwise runs over Python floats.
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    n = len(close)
+
+    if _psar_loop_jit is not None:
+        psar = close.copy()
+        psarbull = np.full(n, np.nan)
+        psarbear = np.full(n, np.nan)
+        _psar_loop_jit(high, low, psar, psarbull, psarbear, float(initial_af), float(max_af))
+        return psar, psarbull, psarbear
+
+    # Python floats in lists are much cheaper to index than NumPy scalars
+    psar = close.tolist()
+    psarbull = [np.nan] * n
+    psarbear = [np.nan] * n
+    _psar_loop(high.tolist(), low.tolist(), psar, psarbull, psarbear, initial_af, max_af)
+    return np.array(psar), np.array(psarbull), np.array(psarbear)
@@ -0,0 +1,95 @@
+from .frame_cache import FrameCache
+from .bollinger_bands import bollinger_bands
+from .cci_emerging_trends import cciEmergingTrends
+from .cci_overbought_oversold import cciOverboughtOversold
+from .chaikin_oscillator import co
+from .macd_crossover import macdCrossover
+from .money_flow_index import mfi
+from .moving_average_crossover import MovingAverageCrossover
+from .parabolic_stop_and_reverse import ParabolicSAR
+from .rate_of_change import roc
+from .relative_strength_index import rsi
+from .stochastic_oscillator import stc_oscillator
+from .true_strength_index import tsi
+from .volume_roc import volume_roc
+from .williams_R import williamsR
+
+"""
+Indicator pipeline
+-
+Runs several strategies on one price frame with a single FrameCache, so typical
+price, price changes, EMAs and rolling windows that more than one strategy needs are
+computed once for the frame instead of once per strategy.
+
+Usage:
+    signals = run_strategies(df)                             # every strategy
+    signals = run_strategies(df, ['macd_crossover', 'tsi'],
+                             params={'tsi': {'window': 9}})
+    signals['macd_crossover']['positions']
+"""
+
+# strategy name -> (indicator class, compute method run before gen_signals, or None)
+STRATEGIES = {
+    "bollinger_bands": (bollinger_bands, "cal_BB"),
+    "cci_emerging_trends": (cciEmergingTrends, None),
+    "cci_overbought_oversold": (cciOverboughtOversold, None),
+    "chaikin_oscillator": (co, "cal_CO"),
+    "macd_crossover": (macdCrossover, "cal_MACD"),
+    "mfi": (mfi, "cal_MFI"),
+    "moving_average_crossover": (MovingAverageCrossover, None),
+    "parabolic_sar": (ParabolicSAR, "cal_PSAR"),
+    "roc": (roc, "cal_ROC"),
+    "rsi": (rsi, "cal_RSI"),
+    "stc_oscillator": (stc_oscillator, "cal_KD"),
+    "tsi": (tsi, "cal_TSI"),
+    "volume_roc": (volume_roc, "cal_VROC"),
+    "williams_R": (williamsR, "cal_wr"),
+}
+
+
+def run_strategy(df, strategy, params=None, cache=None):
+    """Run one strategy (a key of STRATEGIES) on df and return its signals DataFrame."""
+    if strategy not in STRATEGIES:
+        raise ValueError(f"unknown strategy {strategy!r}; choose from {sorted(STRATEGIES)}")
+    indicator_cls, compute = STRATEGIES[strategy]
+
+    indicator = indicator_cls(df, **(params or {}))
+    if cache is not None:
+        indicator.cache = cache
+    if compute is not None:
+        getattr(indicator, compute)()
+    return indicator.gen_signals()
+
+
+def run_strategies(df, strategies=None, params=None, cache=None):
+    """
+    Run several strategies on one price frame, sharing intermediates between them.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        OHLCV frame; only read, so it can be shared between concurrent runs.
+    strategies : list of str or None
+        Keys of STRATEGIES, run in order; None runs all of them.
+    params : dict or None
+        Strategy name -> keyword arguments for its indicator class.
+    cache : FrameCache or None
+        Cache of df to use (e.g. to keep intermediates for further runs on the same
+        frame); None creates one for this call.
+
+    Returns
+    -------
+    signals : dict of str -> pd.DataFrame
+        Strategy name -> signals from gen_signals().
+    """
+    if strategies is None:
+        strategies = list(STRATEGIES)
+    params = params or {}
+
+    if cache is None:
+        cache = FrameCache(df)
+    elif cache.df is not df:
+        raise ValueError("cache belongs to a different frame")
+
+    return {strategy: run_strategy(df, strategy, params.get(strategy), cache)
+            for strategy in strategies}
@@ -1,4 +1,4 @@
-from .indicator import Indicator 
+from .indicator import Indicator, threshold_signal
 import sys
 import numpy as np
 import pandas as pd
@@ -14,7 +14,7 @@ class roc(Indicator):
     def __init__(self, df, n=12):
         super().__init__(df)
         self.df = df
-        self.n = 12 # short-term smaller e.g. 9, long-term larger e.g. 200
+        self.n = n # short-term smaller e.g. 9, long-term larger e.g. 200
         self.lower = -8 # thresholds vary by asset traded
         self.upper = 8
 
@@ -23,19 +23,15 @@ class roc(Indicator):
     -
     ROC = [(Closing price - Closing price n periods ago) / (Closing price n periods ago)] * 100
     """
-    def plot_ROC(self):
-        # Calculate difference between closing price and 
-        # closing price n period ago
-        diff = self.df['Close'].diff(self.n - 1)
-
-        # Calculate closing price n periods ago
-        closing = self.df['Close'].shift(self.n - 1)
+    def cal_ROC(self):
+        self.results['ROC'] = _roc(self.df['Close'], self.n)
 
-        self.df['ROC'] = (diff / closing) * 100
+    def plot_ROC(self):
+        self.cal_ROC()
 
         # Plot graph
         fig = plt.figure()
-        self.df['ROC'].plot(lw=1.2, label='Rate of Change (ROC)')
+        self.results['ROC'].plot(lw=1.2, label='Rate of Change (ROC)')
         plt.legend()
 
         return fig
@@ -44,17 +40,34 @@ class roc(Indicator):
         # Initialize the `signals` DataFrame with the `signal` column
         signals = pd.DataFrame(index=self.df.index)
         signals['signal'] = 0.0
-        signals['ROC'] = self.df['ROC']
+        signals['ROC'] = self.results['ROC']
 
-        # Generate buy signal
-        signals.loc[signals['ROC'] < self.lower, 'signal'] = 1.0
-        
-        # Generate sell signal
-        signals.loc[signals['ROC'] > self.upper, 'signal'] = -1.0
+        signals['signal'] = _signal(signals['ROC'], self.lower, self.upper)
 
         # Generate trading order
         signals['positions'] = signals['signal'].diff()
 
         self.signals = signals
 
-        return signals
\ No newline at end of file
+        return signals
+
+
+def _roc(close, n):
+    # Calculate difference between closing price and
+    # closing price n period ago
+    diff = close.diff(n - 1)
+
+    # Calculate closing price n periods ago
+    closing = close.shift(n - 1)
+
+    return (diff / closing) * 100
+
+
+def _signal(values, lower, upper):
+    # buy below the lower threshold, sell above the upper one
+    return threshold_signal(values < lower, values > upper)
+
+
+def roc_signal(cache, n=12, lower=-8, upper=8):
+    """Signal values of roc from a FrameCache of one frame or a (row x ticker) panel."""
+    return _signal(_roc(cache.series('Close'), n), lower, upper)
@@ -1,4 +1,4 @@
-from .indicator import Indicator 
+from .indicator import Indicator, threshold_signal
 import sys
 import numpy as np
 import pandas as pd
@@ -26,37 +26,12 @@ class rsi(Indicator):
 
     RS = Average Gain / Average Loss
     """
+    def cal_RSI(self):
+        self.RSI = _rsi(self.cache.change('Close'), self.window_size, self.mean)
+
     def plot_RSI(self):
-        # Get just the adjusted close
-        close = self.df['Close']
-        # Get the difference in price from previous step
-        delta = close.diff()
-        # Get rid of the first row
-        delta = delta[1:] 
-
-        # Make the positive gains (up) and negative gains (down) Series
-        up, down = delta.copy(), delta.copy()
-        up[up < 0] = 0
-        down[down > 0] = 0
-
-        if self.mean == 'ewma':
-            # Calculate the EWMA
-            roll_up = up.ewm(span=self.window_size).mean()
-            roll_down = down.abs().ewm(span=self.window_size).mean()
-
-            # Calculate the RSI based on EWMA
-            RS = roll_up / roll_down
-            self.RSI = 100.0 - (100.0 / (1.0 + RS))
-
-        else:
-            # Calculate the SMA
-            roll_up = up.rolling(self.window_size).mean()
-            roll_down = down.abs().rolling(self.window_size).mean()
-
-            # Calculate the RSI based on SMA
-            RS = roll_up / roll_down
-            self.RSI = 100.0 - (100.0 / (1.0 + RS))
-        
+        self.cal_RSI()
+
         # Plot graph
         fig = plt.figure()
         self.RSI.plot(lw=1.2, label='Relative Strength Index (RSI)')
@@ -72,15 +47,52 @@ class rsi(Indicator):
         self.RSI = pd.concat([pd.Series([0.0]), self.RSI])
         signals['RSI'] = self.RSI.values
 
-        # Generate buy signal
-        signals.loc[signals['RSI'] < self.lower, 'signal'] = 1.0
-        
-        # Generate sell signal
-        signals.loc[signals['RSI'] > self.upper, 'signal'] = -1.0
+        signals['signal'] = _signal(signals['RSI'], self.lower, self.upper)
 
         # Generate trading order
         signals['positions'] = signals['signal'].diff()
 
         self.signals = signals
 
-        return signals
\ No newline at end of file
+        return signals
+
+
+def _rsi(change, window_size, mean):
+    # change: difference in price from previous step; get rid of the first row
+    delta = change[1:]
+
+    # Make the positive gains (up) and negative gains (down) Series
+    up, down = delta.copy(), delta.copy()
+    up[up < 0] = 0
+    down[down > 0] = 0
+
+    if mean == 'ewma':
+        # Calculate the EWMA
+        roll_up = up.ewm(span=window_size).mean()
+        roll_down = down.abs().ewm(span=window_size).mean()
+
+        # Calculate the RSI based on EWMA
+        RS = roll_up / roll_down
+        return 100.0 - (100.0 / (1.0 + RS))
+
+    else:
+        # Calculate the SMA
+        roll_up = up.rolling(window_size).mean()
+        roll_down = down.abs().rolling(window_size).mean()
+
+        # Calculate the RSI based on SMA
+        RS = roll_up / roll_down
+        return 100.0 - (100.0 / (1.0 + RS))
+
+
+def _signal(values, lower, upper):
+    # buy below the lower threshold, sell above the upper one
+    return threshold_signal(values < lower, values > upper)
+
+
+def rsi_signal(cache, window_size=14, lower=30, upper=70):
+    """Signal values of rsi from a FrameCache of one frame or a (row x ticker) panel."""
+    values = np.asarray(_rsi(cache.change('Close'), window_size, 'ewma'), dtype=np.float64)
+    # the first bar has no RSI; gen_signals reads it as 0
+    values = np.concatenate([np.zeros((1,) + values.shape[1:]), values])
+    return _signal(values, lower, upper)
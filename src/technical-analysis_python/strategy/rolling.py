@@ -0,0 +1,72 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+"""
+Rolling extrema and sums
+-
+Rolling maximum / minimum over the last `window` rows, shared by the stochastic
+oscillator, Williams %R and channel indicators (Donchian, Aroon), and a rolling sum
+for flow-based indicators (MFI).
+
+Uses the van Herk / Gil-Werman scheme: the series is cut into blocks of `window` rows,
+and running maxima are taken forwards and backwards within each block. Any window
+then spans at most two blocks, so its maximum is max(backward[start], forward[end]).
+That is O(N) vectorised work for any window length (vs O(N * window)), and works on
+1-D series or 2-D (date x ticker) arrays along axis 0.
+
+Matches Series.rolling(window).max() / .min(): the first window - 1 rows are NaN,
+and so is any window containing a NaN.
+"""
+
+
+def _rolling_extreme(values, window, ufunc, identity):
+    a = np.asarray(values, dtype=np.float64)
+    window = int(window)
+    if window < 1:
+        raise ValueError("window must be at least 1")
+
+    n = a.shape[0]
+    out = np.full(a.shape, np.nan)
+    if n < window:
+        return out
+
+    # pad to whole blocks with the identity element so padding never wins
+    pad = (-n) % window
+    padded = np.concatenate([a, np.full((pad,) + a.shape[1:], identity)])
+    blocks = padded.reshape((-1, window) + a.shape[1:])
+
+    forward = ufunc.accumulate(blocks, axis=1).reshape(padded.shape)
+    backward = ufunc.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(padded.shape)
+
+    # window ending at row i starts at row i - window + 1
+    out[window - 1:] = ufunc(backward[:n - window + 1], forward[window - 1:n])
+    return out
+
+
+def rolling_max(values, window):
+    """Rolling maximum of the last `window` rows (axis 0); returns a float64 array."""
+    return _rolling_extreme(values, window, np.maximum, -np.inf)
+
+
+def rolling_min(values, window):
+    """Rolling minimum of the last `window` rows (axis 0); returns a float64 array."""
+    return _rolling_extreme(values, window, np.minimum, np.inf)
+
+
+def rolling_sum(values, window):
+    """
+    Rolling sum of the last `window` rows (axis 0); returns a float64 array.
+
+    NaN for the first window - 1 rows and any window containing a NaN, as
+    Series.rolling(window).sum(). Each window is summed directly over a strided view
+    rather than with a running total, so windows of zeros sum to exactly 0.
+    """
+    a = np.asarray(values, dtype=np.float64)
+    window = int(window)
+    if window < 1:
+        raise ValueError("window must be at least 1")
+
+    out = np.full(a.shape, np.nan)
+    if a.shape[0] >= window:
+        out[window - 1:] = sliding_window_view(a, window, axis=0).sum(axis=-1)
+    return out
@@ -24,14 +24,14 @@ class sd(Indicator):
     def cal_SD(self, window=21, r_demeaned=True):
         self.window = window
 
-        self.df['SD'] = self.df['Close'].rolling(self.window).std(ddof=0)
+        self.results['SD'] = self.cache.rolling_std(self.window, ddof=0)
 
-        return self.df['SD'].tail(1).item()
+        return self.results['SD'].tail(1).item()
 
     def plot_SD(self):
         # Plot graph
         fig = plt.figure()
-        self.df['SD'].plot(lw=1.2, color='blue', label='Standard Deviation (SD)')
+        self.results['SD'].plot(lw=1.2, color='blue', label='Standard Deviation (SD)')
         self.df['Close'].plot(lw=0.8, color='black', label='Closing price')
         plt.legend()
 
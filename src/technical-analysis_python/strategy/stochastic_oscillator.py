@@ -1,4 +1,4 @@
-from .indicator import Indicator
+from .indicator import Indicator, threshold_signal
 import sys
 import numpy as np
 import pandas as pd
@@ -30,58 +30,16 @@ class stc_oscillator(Indicator):
     %K is multiplied by 100 to move the decimal point two places
     """
 
+    def cal_KD(self):
+        self.results['%K'], self.results['%D'] = _kd(self.cache, self.k, self.d)
+
     def plot_KD(self):
-        length = len(self.df)
-        array_dates = list(self.df.index)
-        array_high = list(self.df['High'])
-        array_low = list(self.df['Low'])
-        array_close = list(self.df['Close'])
-        array_open = list(self.df['Open'])
-        array_volume = list(self.df['Volume'])
-
-        array_highest = [0] * length # store highest highs
-
-        for i in range(self.k - 1, length):
-            highest = array_high[i]
-
-            for j in range(i - 13, i + 1): # k-day lookback period
-                if array_high[j] > highest:
-                    highest = array_high[j]
-            
-            array_highest[i] = highest
-        
-        array_lowest = [0] * length # store lowest lows
-
-        for i in range(self.k - 1, length):
-            lowest = array_low[i]
-
-            for j in range(i - 13, i + 1): # k-day lookback period
-                if array_low[j] < lowest:
-                    lowest = array_low[j]
-            
-            array_lowest[i] = lowest
-
-        # find %K line values
-        kvalues = [0] * length
-
-        for i in range(self.k - 1, length):
-            if (array_highest[i] - array_lowest[i]) != 0: # check division by zero
-                k = ((array_close[i] - array_lowest[i]) * 100 ) / (array_highest[i] - array_lowest[i])
-            else:
-                k = 0.0
-                
-            # Kvalue.append(k)
-            kvalues[i] = k
-
-        self.df['%K'] = kvalues
-
-        # %D = 3-day SMA of %K
-        self.df['%D'] = self.df['%K'].rolling(window=3, min_periods=1, center=False).mean()
+        self.cal_KD()
 
         # Plot graph
         fig = plt.figure()
-        self.df['%K'].plot(lw=1.2, color='red', label='%K line')
-        self.df['%D'].plot(lw=1.2, color='blue', label='%D line')
+        self.results['%K'].plot(lw=1.2, color='red', label='%K line')
+        self.results['%D'].plot(lw=1.2, color='blue', label='%D line')
 
         return fig
 
@@ -89,14 +47,10 @@ class stc_oscillator(Indicator):
         # Initialize the `signals` DataFrame with the `signal` column
         signals = pd.DataFrame(index=self.df.index)
         signals['signal'] = 0.0
-        signals['%K'] = self.df['%K']
-        signals['%D'] = self.df['%D']
-
-        # Generate buy signal
-        signals.loc[signals['%K'] > signals['%D'], 'signal'] = 1.0
+        signals['%K'] = self.results['%K']
+        signals['%D'] = self.results['%D']
 
-        # Generate sell signal
-        signals.loc[signals['%K'] < signals['%D'], 'signal'] = -1.0
+        signals['signal'] = _signal(signals['%K'], signals['%D'])
 
         # Generate trading order
         signals['positions'] = signals['signal'].diff()
@@ -106,3 +60,30 @@ class stc_oscillator(Indicator):
         self.signals = signals
 
         return signals
+
+
+def _kd(cache, k, d):
+    # highest high / lowest low over the k-day lookback period
+    highest = cache.rolling_max(k, 'High')
+    lowest = cache.rolling_min(k, 'Low')
+    close = np.asarray(cache.series('Close'), dtype=np.float64)
+
+    # find %K line values (0 where the range is zero, and before the first full period)
+    span = highest - lowest
+    with np.errstate(divide='ignore', invalid='ignore'):
+        kvalues = np.where(span != 0, ((close - lowest) * 100) / span, 0.0)
+    kvalues[:k - 1] = 0.0
+
+    # %D = d-day (default 3) SMA of %K
+    dvalues = pd.DataFrame(kvalues.reshape(len(kvalues), -1)).rolling(window=d, min_periods=1).mean()
+    return kvalues, dvalues.to_numpy().reshape(kvalues.shape)
+
+
+def _signal(kline, dline):
+    # buy while %K is above %D, sell while it is below
+    return threshold_signal(kline > dline, kline < dline)
+
+
+def stc_oscillator_signal(cache, k=14, d=3):
+    """Signal values of stc_oscillator from a FrameCache of one frame or a (row x ticker) panel."""
+    return _signal(*_kd(cache, k, d))
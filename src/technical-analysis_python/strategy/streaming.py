@@ -0,0 +1,248 @@
+import math
+from collections import deque
+
+import numpy as np
+
+"""
+Streaming indicators
+-
+Incremental counterparts of the batch indicators for the live (one new bar a day)
+path. Each class keeps only the state its indicator needs -- EMA values, a
+fixed-length window with running moments, or monotonic deques of extreme points --
+and folds in one bar with update(bar) in constant (amortised) time, instead of
+recomputing the whole history.
+
+Values match the batch calculations bar for bar:
+    StreamingMACD       macdCrossover.cal_MACD   ('MACD', 'Signal line')
+    StreamingRSI        rsi.cal_RSI              (RSI, NaN on the first bar)
+    StreamingBollinger  bollinger_bands.cal_BB   ('Middle band', 'Upper band', 'Lower band')
+    StreamingWilliamsR  williamsR.cal_wr         ('%R')
+
+bar: a mapping with the fields the indicator reads ('Close'; 'High' and 'Low' for %R),
+e.g. a row of the price DataFrame or a dict. After update(), .signal holds the
+strategy's signal (1.0 buy, -1.0 sell, 0.0 otherwise) for that bar, equal to the
+batch gen_signals()['signal']. RSI has no value on the first bar; like
+rsi.gen_signals, the signal reads it as 0 there (a buy).
+"""
+
+
+class EMA:
+    """
+    Exponential moving average, equal to Series.ewm(span=span, adjust=adjust).mean().
+
+    Uses the same update as pandas (weighted average of the previous value and the new
+    observation), so results agree to the last bit.
+    """
+    def __init__(self, span, adjust=False):
+        self.alpha = 2.0 / (span + 1.0)
+        self.adjust = adjust
+        self.value = np.nan
+        self._old_wt = 1.0
+
+    def update(self, x):
+        if math.isnan(self.value):
+            self.value = x
+            self._old_wt = 1.0
+            return self.value
+
+        new_wt = 1.0 if self.adjust else self.alpha
+        self._old_wt *= 1.0 - self.alpha
+        if self.value != x:  # as pandas: avoids rounding drift on constant input
+            self.value = (self._old_wt * self.value + new_wt * x) / (self._old_wt + new_wt)
+        self._old_wt = self._old_wt + new_wt if self.adjust else 1.0
+        return self.value
+
+
+class RollingWindow:
+    """
+    Mean and population / sample variance of the last `window` values
+    (Series.rolling(window).mean() / .std(ddof)), NaN until the window is full.
+
+    Running moments use Welford's add/remove updates. As in pandas, a window of
+    identical values gives exactly that value and zero variance.
+    """
+    def __init__(self, window):
+        self.window = window
+        self._values = deque()
+        self._mean = 0.0
+        self._ssqdm = 0.0  # sum of squared deviations from the mean
+        self._same = 0  # length of the run of identical values ending at the latest one
+
+    def update(self, x):
+        self._same = self._same + 1 if self._values and self._values[-1] == x else 1
+        self._values.append(x)
+        n = len(self._values)
+        delta = x - self._mean
+        self._mean += delta / n
+        self._ssqdm += delta * (x - self._mean)
+
+        if n > self.window:
+            old = self._values.popleft()
+            n -= 1
+            delta = old - self._mean
+            self._mean -= delta / n
+            self._ssqdm -= delta * (old - self._mean)
+
+        if self._same >= self.window:
+            # constant window: re-anchor the moments so no rounding residue is left behind
+            self._mean, self._ssqdm = x, 0.0
+        return self.mean
+
+    @property
+    def full(self):
+        return len(self._values) == self.window
+
+    @property
+    def mean(self):
+        return self._mean if self.full else np.nan
+
+    def std(self, ddof=1):
+        if not self.full or self.window - ddof <= 0:
+            return np.nan
+        return math.sqrt(max(self._ssqdm, 0.0) / (self.window - ddof))
+
+
+class RollingExtreme:
+    """
+    Maximum (or minimum) of the last `window` values, as Series.rolling(window).max()
+    (.min()); NaN until the window is full.
+
+    A monotonic deque of (bar number, value) keeps only values that can still become
+    the extreme, so each update is amortised O(1).
+    """
+    def __init__(self, window, mode='max'):
+        if mode not in ('max', 'min'):
+            raise ValueError("mode must be 'max' or 'min'")
+        self.window = window
+        self._better = (lambda a, b: a >= b) if mode == 'max' else (lambda a, b: a <= b)
+        self._deque = deque()
+        self._count = 0
+        self.value = np.nan
+
+    def update(self, x):
+        while self._deque and self._better(x, self._deque[-1][1]):
+            self._deque.pop()
+        self._deque.append((self._count, x))
+        if self._deque[0][0] <= self._count - self.window:
+            self._deque.popleft()
+        self._count += 1
+        self.value = self._deque[0][1] if self._count >= self.window else np.nan
+        return self.value
+
+
+class StreamingMACD:
+    def __init__(self, short_span=12, long_span=26, signal_span=9):
+        self._short = EMA(short_span)
+        self._long = EMA(long_span)
+        self._signal_line = EMA(signal_span)
+        self.macd = np.nan
+        self.signal_line = np.nan
+        self.signal = 0.0
+
+    """
+    MACD = short-span EMA - long-span EMA; Signal line = signal-span EMA of MACD
+    """
+    def update(self, bar):
+        close = float(bar['Close'])
+        self.macd = self._short.update(close) - self._long.update(close)
+        self.signal_line = self._signal_line.update(self.macd)
+        self.signal = 1.0 if self.macd > self.signal_line else 0.0
+        return self.macd, self.signal_line
+
+
+class StreamingRSI:
+    def __init__(self, window_size=14, mean='ewma', lower=30, upper=70):
+        self.mean = mean
+        self.lower = lower
+        self.upper = upper
+        if mean == 'ewma':
+            self._up, self._down = EMA(window_size, adjust=True), EMA(window_size, adjust=True)
+        else:
+            self._up, self._down = RollingWindow(window_size), RollingWindow(window_size)
+        self._prev_close = None
+        self.RSI = np.nan
+        self.signal = 0.0
+
+    """
+    RSI = 100 - 100 / (1 + RS), RS = average gain / average loss
+    """
+    def update(self, bar):
+        close = float(bar['Close'])
+        if self._prev_close is not None:
+            delta = close - self._prev_close
+            roll_up = self._up.update(delta if delta > 0 else 0.0)
+            roll_down = self._down.update(-delta if delta < 0 else 0.0)
+            self.RSI = 100.0 - 100.0 / (1.0 + _divide(roll_up, roll_down))
+        # the first bar has no RSI; rsi.gen_signals reads it as 0
+        rsi = 0.0 if self._prev_close is None else self.RSI
+        self._prev_close = close
+
+        if rsi < self.lower:
+            self.signal = 1.0
+        elif rsi > self.upper:
+            self.signal = -1.0
+        else:
+            self.signal = 0.0
+        return self.RSI
+
+
+class StreamingBollinger:
+    def __init__(self, window=20):
+        self._window = RollingWindow(window)
+        self.middle = self.upper = self.lower = np.nan
+        self.signal = 0.0
+
+    """
+    Middle band = SMA; upper / lower band = SMA +/- 2 x population s.d.
+    """
+    def update(self, bar):
+        close = float(bar['Close'])
+        self.middle = self._window.update(close)
+        mstd = self._window.std(ddof=0)
+        self.upper = self.middle + mstd * 2
+        self.lower = self.middle - mstd * 2
+
+        if close < self.lower:
+            self.signal = 1.0
+        elif close > self.upper:
+            self.signal = -1.0
+        else:
+            self.signal = 0.0
+        return self.middle, self.upper, self.lower
+
+
+class StreamingWilliamsR:
+    def __init__(self, lbp=14):
+        self._hh = RollingExtreme(lbp, 'max')
+        self._ll = RollingExtreme(lbp, 'min')
+        self.wr = np.nan
+        self.signal = 0.0
+
+    """
+    %R = (Highest High - Close) / (Highest High - Lowest Low) * -100
+    """
+    def update(self, bar):
+        hh = self._hh.update(float(bar['High']))
+        ll = self._ll.update(float(bar['Low']))
+        self.wr = _divide(-100 * (hh - float(bar['Close'])), hh - ll)
+
+        if self.wr < -80:
+            self.signal = 1.0
+        elif self.wr > -20:
+            self.signal = -1.0
+        else:
+            self.signal = 0.0
+        return self.wr
+
+
+def _divide(a, b):
+    """a / b with NumPy semantics (inf or NaN instead of ZeroDivisionError)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return float(np.float64(a) / np.float64(b))
+
+
+def replay(indicator, df):
+    """Feed every row of df to indicator.update() (e.g. to warm it up on history); return indicator."""
+    for _, bar in df.iterrows():
+        indicator.update(bar)
+    return indicator
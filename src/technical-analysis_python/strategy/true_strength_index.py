@@ -1,4 +1,4 @@
-from .indicator import Indicator
+from .indicator import Indicator, threshold_signal
 import sys
 import numpy as np
 import pandas as pd
@@ -39,25 +39,18 @@ class tsi(Indicator):
     Second Smoothing = 13-period EMA of 25-period EMA of |PC|
     """
 
-    def plot_TSI(self):
-        # Compute TSI
-        pc = self.df['Close'] - self.df['Close'].shift(1) # price change
-
-        self.df['Double Smoothed PC'] = pc.ewm(span=25, adjust=False).mean().ewm(
-            span=13, adjust=False).mean()
-
-        self.df['Double Smoothed Abs PC'] = abs(pc).ewm(span=25, adjust=False).mean().ewm(
-            span=13, adjust=False).mean()
-
-        self.df['TSI'] =  self.df['Double Smoothed PC'] / self.df['Double Smoothed Abs PC'] * 100
+    def cal_TSI(self):
+        # Compute TSI and its signal line
+        (self.results['Double Smoothed PC'], self.results['Double Smoothed Abs PC'],
+         self.results['TSI'], self.results['Signal line']) = _tsi(self.cache.change('Close'), self.window)
 
-        # Signal line
-        self.df['Signal line'] = self.df['TSI'].ewm(span=self.window, adjust=False).mean()
+    def plot_TSI(self):
+        self.cal_TSI()
 
         # Plot graph
         fig = plt.figure()
-        self.df['TSI'].plot(lw=1.2, color='blue', label='True Strength Index (TSI)')
-        self.df['Signal line'].plot(lw=1.2, color='red', label='Signal line')
+        self.results['TSI'].plot(lw=1.2, color='blue', label='True Strength Index (TSI)')
+        self.results['Signal line'].plot(lw=1.2, color='red', label='Signal line')
         plt.legend()
 
         return fig
@@ -65,13 +58,7 @@ class tsi(Indicator):
     def gen_signals(self):
         # Initialize the `signals` DataFrame with the `signal` column
         signals = pd.DataFrame(index=self.df.index)
-        signals['signal'] = 0.0
-
-        # Generate buy signal
-        signals.loc[self.df['TSI'] > self.df['Signal line'], 'signal'] = 1.0
-
-        # Generate sell signal
-        signals.loc[self.df['TSI'] < self.df['Signal line'], 'signal'] = -1.0
+        signals['signal'] = _signal(self.results['TSI'], self.results['Signal line'])
 
         # Generate trading order
         signals['positions'] = signals['signal'].diff()
@@ -81,3 +68,23 @@ class tsi(Indicator):
         self.signals = signals
 
         return signals
+
+
+def _tsi(pc, window):
+    # pc: price change
+    double_smoothed_pc = pc.ewm(span=25, adjust=False).mean().ewm(span=13, adjust=False).mean()
+    double_smoothed_abs_pc = abs(pc).ewm(span=25, adjust=False).mean().ewm(span=13, adjust=False).mean()
+    values = double_smoothed_pc / double_smoothed_abs_pc * 100
+
+    # Signal line
+    return double_smoothed_pc, double_smoothed_abs_pc, values, values.ewm(span=window, adjust=False).mean()
+
+
+def _signal(values, signal_line):
+    # buy while the TSI is above its signal line, sell while it is below
+    return threshold_signal(values > signal_line, values < signal_line)
+
+
+def tsi_signal(cache, window=12):
+    """Signal values of tsi from a FrameCache of one frame or a (row x ticker) panel."""
+    return _signal(*_tsi(cache.change('Close'), window)[2:])
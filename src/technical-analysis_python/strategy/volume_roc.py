@@ -1,4 +1,4 @@
-from .indicator import Indicator
+from .indicator import Indicator, threshold_signal
 import sys
 import numpy as np
 import pandas as pd
@@ -23,12 +23,15 @@ class volume_roc(Indicator):
     ( Volume [today] - Volume [n days ago] ) / Volume [n days ago]
     """
 
+    def cal_VROC(self):
+        self.results['Volume ROC'] = _vroc(self.df['Close'], self.n)
+
     def plot_VROC(self):
-        self.df['Volume ROC'] = ((self.df['Close'] - self.df['Close'].shift(self.n)) / self.df['Close'].shift(self.n))
+        self.cal_VROC()
 
         # Plot graph
         fig = plt.figure()
-        self.df['Volume ROC'].plot(lw=1.2, color='blue', label='Volume Rate of Change')
+        self.results['Volume ROC'].plot(lw=1.2, color='blue', label='Volume Rate of Change')
         plt.legend()
 
         return fig
@@ -36,13 +39,7 @@ class volume_roc(Indicator):
     def gen_signals(self):
         # Initialize the `signals` DataFrame with the `signal` column
         signals = pd.DataFrame(index=self.df.index)
-        signals['signal'] = 0.0
-
-        # Generate buy signal
-        signals.loc[self.df['Volume ROC'] < 0, 'signal'] = 1.0
-
-        # Generate sell signal
-        signals.loc[self.df['Volume ROC'] > 0, 'signal'] = -1.0
+        signals['signal'] = _signal(self.results['Volume ROC'])
 
         # Generate trading order
         signals['positions'] = signals['signal'].diff()
@@ -52,3 +49,17 @@ class volume_roc(Indicator):
         self.signals = signals
 
         return signals
+
+
+def _vroc(values, n):
+    return (values - values.shift(n)) / values.shift(n)
+
+
+def _signal(vroc):
+    # buy below zero, sell above zero
+    return threshold_signal(vroc < 0, vroc > 0)
+
+
+def volume_roc_signal(cache, n=25):
+    """Signal values of volume_roc from a FrameCache of one frame or a (row x ticker) panel."""
+    return _signal(_vroc(cache.series('Close'), n))
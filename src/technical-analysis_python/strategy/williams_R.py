@@ -1,4 +1,4 @@
-from .indicator import Indicator
+from .indicator import Indicator, threshold_signal
 import sys
 import numpy as np
 import pandas as pd
@@ -28,15 +28,15 @@ class williamsR(Indicator):
     Note: %R is multiplied by -100 to correct the inversion and move the decimal
     """
 
+    def cal_wr(self):
+        self.results['%R'] = _wr(self.cache, self.lbp)
+
     def plot_wr(self):
-        # Compute %R
-        hh = self.df['High'].rolling(self.lbp).max()  # highest high over lookback period
-        ll = self.df['Low'].rolling(self.lbp).min()  # lowest low over lookback period
-        self.df['%R'] = -100 * (hh - self.df['Close']) / (hh - ll)
+        self.cal_wr()
 
         # Plot graph
         fig = plt.figure()
-        self.df['%R'].plot(lw=1.2, color='blue', label='Williams %R')
+        self.results['%R'].plot(lw=1.2, color='blue', label='Williams %R')
         plt.legend()
 
         return fig
@@ -44,13 +44,7 @@ class williamsR(Indicator):
     def gen_signals(self):
         # Initialize the `signals` DataFrame with the `signal` column
         signals = pd.DataFrame(index=self.df.index)
-        signals['signal'] = 0.0
-
-        # Generate buy signal
-        signals.loc[self.df['%R'] < -80, 'signal'] = 1.0
-
-        # Generate sell signal
-        signals.loc[self.df['%R'] > -20, 'signal'] = -1.0
+        signals['signal'] = _signal(self.results['%R'])
 
         # Generate trading order
         signals['positions'] = signals['signal'].diff()
@@ -60,3 +54,21 @@ class williamsR(Indicator):
         self.signals = signals
 
         return signals
+
+
+def _wr(cache, lbp):
+    # Compute %R
+    hh = cache.rolling_max(lbp, 'High')  # highest high over lookback period
+    ll = cache.rolling_min(lbp, 'Low')  # lowest low over lookback period
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return -100 * (hh - np.asarray(cache.series('Close'), dtype=np.float64)) / (hh - ll)
+
+
+def _signal(wr):
+    # buy below -80 (oversold), sell above -20 (overbought)
+    return threshold_signal(wr < -80, wr > -20)
+
+
+def williams_r_signal(cache, lbp=14):
+    """Signal values of williamsR from a FrameCache of one frame or a (row x ticker) panel."""
+    return _signal(_wr(cache, lbp))
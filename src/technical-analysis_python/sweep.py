@@ -0,0 +1,194 @@
+"""
+Parameter sweep (grid search) for the technical indicator strategies.
+
+Runs every combination of a declared parameter grid for one strategy across a set
+of tickers and date windows on a process pool, and collects Sharpe ratio, CAGR,
+maximum drawdown and the other evaluate.PerformanceMetrics into one results table.
+
+Price frames are copied once into a shared memory block; workers attach to it by
+name and wrap read-only, zero-copy frames around it, so neither the pool
+initializer nor a task pickles any prices (a task only carries ticker, window and
+params). Columns come back as float64.
+
+Usage (from this directory):
+    python sweep.py
+"""
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+_THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(_THIS_DIR)
+sys.path.append(os.path.dirname(_THIS_DIR))
+
+from backtest import BacktestPortfolio
+from evaluate import METRICS, PerformanceMetrics
+from strategy.pipeline import STRATEGIES, run_strategy
+
+# Read-only price frames for the current worker (set by _init_worker), and the shared
+# memory block they are views of
+_PRICES = {}
+_SHARED = None
+
+
+def param_grid(grid):
+    """
+    Expand a grid declaration into a list of parameter dicts.
+
+    grid: dict of parameter name -> list of values,
+    e.g. {'short_span': [8, 12], 'long_span': [26, 30]} gives 4 combinations.
+    """
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def _share(prices):
+    """
+    Copy price frames into one shared memory block.
+
+    Returns the block and its layout: per ticker (ticker, byte offset, rows, columns,
+    index name), with the dates (int64 ns) followed by the values, one float64
+    column after another.
+    """
+    layout, size = [], 0
+    for ticker, df in prices.items():
+        layout.append((ticker, size, len(df), tuple(df.columns), df.index.name))
+        size += 8 * len(df) * (1 + len(df.columns))
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    for (ticker, offset, rows, columns, _), df in zip(layout, prices.values()):
+        dates = np.ndarray(rows, dtype=np.int64, buffer=block.buf, offset=offset)
+        dates[:] = df.index.to_numpy(dtype="datetime64[ns]").view(np.int64)
+        values = np.ndarray((len(columns), rows), dtype=np.float64, buffer=block.buf, offset=offset + 8 * rows)
+        values[:] = df.to_numpy(dtype=np.float64).T
+    return block, layout
+
+
+def _frames(buffer, layout):
+    """Read-only price frames viewing a block written by _share (nothing is copied)."""
+    frames = {}
+    for ticker, offset, rows, columns, index_name in layout:
+        dates = np.ndarray(rows, dtype=np.int64, buffer=buffer, offset=offset)
+        values = np.ndarray((len(columns), rows), dtype=np.float64, buffer=buffer, offset=offset + 8 * rows)
+        dates.flags.writeable = values.flags.writeable = False
+        index = pd.DatetimeIndex(dates.view("datetime64[ns]"), name=index_name)
+        frames[ticker] = pd.DataFrame(values.T, index=index, columns=list(columns), copy=False)
+    return frames
+
+
+def _init_worker(name, layout):
+    global _PRICES, _SHARED
+    _SHARED = shared_memory.SharedMemory(name=name)
+    _PRICES = _frames(_SHARED.buf, layout)
+
+
+def _set_prices(prices):
+    global _PRICES
+    _PRICES = prices
+
+
+def run_one(strategy, ticker, start, end, params, initial_capital=float(100000.0)):
+    """
+    Run one strategy/parameter combination on one ticker and date window.
+
+    Returns a dict with the inputs plus the evaluate.METRICS ('sharpe', 'cagr',
+    'max_drawdown', ...), 'trades' and 'error' (empty on success; metrics are NaN
+    on failure).
+    """
+    row = {"strategy": strategy, "ticker": ticker, "start": start, "end": end}
+    row.update(params)
+
+    # indicators only read their input, so the window can be a view of the shared frame
+    df = _PRICES[ticker].loc[pd.Timestamp(start):pd.Timestamp(end)]
+
+    try:
+        signals = run_strategy(df, strategy, params)
+        portfolio = BacktestPortfolio(ticker, signals, df, initial_capital=initial_capital)
+    except (ValueError, KeyError, IndexError, ZeroDivisionError) as e:
+        row.update(dict.fromkeys(METRICS, np.nan), trades=0, error=str(e))
+        return row
+
+    positions = 100 * signals["signal"].reindex(portfolio.index).ffill().fillna(0.0)
+    row.update(PerformanceMetrics(portfolio, positions=positions, prices=df["Close"].reindex(portfolio.index)).to_dict())
+    row.update(trades=int((signals["signal"].diff() > 0).sum()), error="")
+    return row
+
+
+def _run_task(task):
+    return run_one(*task)
+
+
+def run_sweep(prices, strategy, grid, windows, processes=None, chunksize=16,
+              initial_capital=float(100000.0)):
+    """
+    Run a parameter grid for one strategy across tickers and date windows.
+
+    Parameters
+    ----------
+    prices : dict of str -> pd.DataFrame
+        Ticker -> OHLCV frame with DatetimeIndex.
+    strategy : str
+        Key of STRATEGIES.
+    grid : dict
+        Parameter name -> list of values (see param_grid).
+    windows : list of (start, end)
+        Date windows to test each combination on.
+    processes : int or None
+        Worker processes; None uses os.cpu_count(), 1 runs in-process.
+    chunksize : int
+        Tasks sent to a worker at a time.
+    initial_capital : float
+        Starting cash for each backtest.
+
+    Returns
+    -------
+    results : pd.DataFrame
+        One row per (ticker, window, params) with the evaluate.METRICS, trades and error.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"unknown strategy {strategy!r}; choose from {sorted(STRATEGIES)}")
+
+    tasks = [
+        (strategy, ticker, start, end, params, initial_capital)
+        for params in param_grid(grid)
+        for ticker in prices
+        for start, end in windows
+    ]
+
+    if processes == 1:
+        _set_prices(prices)
+        rows = [_run_task(task) for task in tasks]
+    else:
+        block, layout = _share(prices)
+        try:
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                     initargs=(block.name, layout)) as pool:
+                rows = list(pool.map(_run_task, tasks, chunksize=chunksize))
+        finally:
+            block.close()
+            block.unlink()
+
+    return pd.DataFrame(rows)
+
+
+def main():
+    from price_store import read_prices
+
+    ticker_list = ['0001', '0002', '0003', '0004', '0005']
+    prices = {symbol + ".HK": read_prices(symbol) for symbol in ticker_list}
+
+    windows = [('2017-01-01', '2018-12-31'), ('2019-01-01', '2020-12-31')]
+    grid = {'short_span': [8, 12, 16], 'long_span': [21, 26, 34], 'signal_span': [5, 9]}
+
+    results = run_sweep(prices, 'macd_crossover', grid, windows)
+    results = results.sort_values('sharpe', ascending=False)
+    print(results.head(10))
+    results.to_csv('sweep_results.csv', index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -19,7 +19,7 @@ import matplotlib.pyplot as plt
 import matplotlib
 matplotlib.use("Agg")
 
-from backtest import Backtest
+from backtest import Backtest, BacktestBatch, BacktestPortfolio, BatchPanels, PlotPortfolio
 
 
 def _make_price_df(index):
@@ -40,6 +40,27 @@ def _make_signals(index, seed=42):
     return signals
 
 
+# Two tickers worked by hand: 1000 starting cash, 100 shares held while the signal
+# is 1, filled at Close. The first row books no trade, so a 1 there is held for free.
+HAND_DATES = pd.date_range("2020-01-01", periods=5, freq="B")
+HAND_PRICES = pd.DataFrame({"A.HK": [10.0, 11.0, 12.0, 11.0, 13.0],
+                            "B.HK": [20.0, 21.0, 19.0, 18.0, 20.0]}, index=HAND_DATES)
+HAND_SIGNALS = pd.DataFrame({"A.HK": [0.0, 1.0, 1.0, 0.0, 1.0],
+                             "B.HK": [1.0, 1.0, 0.0, 0.0, 1.0]}, index=HAND_DATES)
+HAND_PORTFOLIOS = {
+    # A: buy 100 @ 11, sell @ 11, buy @ 13
+    "A.HK": {"holdings": [0.0, 1100.0, 1200.0, 0.0, 1300.0],
+             "cash": [1000.0, -100.0, -100.0, 1000.0, -300.0],
+             "total": [1000.0, 1000.0, 1100.0, 1000.0, 1000.0],
+             "returns": [np.nan, 0.0, 0.1, -1.0 / 11.0, 0.0]},
+    # B: holds 100 from the start, sells @ 19, buys @ 20
+    "B.HK": {"holdings": [2000.0, 2100.0, 0.0, 0.0, 2000.0],
+             "cash": [1000.0, 1000.0, 2900.0, 2900.0, 900.0],
+             "total": [3000.0, 3100.0, 2900.0, 2900.0, 2900.0],
+             "returns": [np.nan, 1.0 / 30.0, -2.0 / 31.0, 0.0, 0.0]},
+}
+
+
 def test_backtest_returns_portfolio_and_fig():
     """Smoke test: Backtest runs and returns portfolio DataFrame and figure."""
     dates = pd.date_range("2020-01-02", periods=100, freq="B")
@@ -106,3 +127,105 @@ def test_backtest_return_formula():
     assert initial > 0 and np.isfinite(final)
     return_pct = (final - initial) / initial * 100
     assert np.isfinite(return_pct)
+
+
+def test_backtest_matches_hand_computed_portfolio():
+    """Backtest's holdings/cash/total/returns for a small fixed signal series."""
+    for ticker, expected in HAND_PORTFOLIOS.items():
+        signals = pd.DataFrame({"signal": HAND_SIGNALS[ticker]})
+        signals["positions"] = signals["signal"].diff()
+        portfolio, fig = Backtest(ticker, signals, HAND_PRICES[[ticker]].set_axis(["Close"], axis=1),
+                                  initial_capital=1000.0)
+        plt.close(fig)
+
+        for column, values in expected.items():
+            np.testing.assert_allclose(portfolio[column].to_numpy(), values, equal_nan=True)
+
+
+def test_backtest_batch_matches_hand_computed_portfolios():
+    """BacktestBatch gives each ticker's hand-computed holdings/cash/total/returns in one pass."""
+    result = BacktestBatch(HAND_PRICES, HAND_SIGNALS, initial_capital=1000.0)
+
+    assert set(result) == {"holdings", "cash", "total", "returns"}
+    for ticker, expected in HAND_PORTFOLIOS.items():
+        for column, values in expected.items():
+            np.testing.assert_allclose(result[column][ticker].to_numpy(), values, equal_nan=True)
+
+
+def test_backtest_batch_shorter_history_starts_like_its_own_backtest():
+    """A ticker with leading NaNs in the panel has no portfolio before its first price."""
+    dates = pd.date_range("2020-01-01", periods=10, freq="B")
+    prices = pd.DataFrame({"A.HK": np.linspace(10.0, 19.0, 10), "B.HK": np.linspace(5.0, 14.0, 10)}, index=dates)
+    prices.iloc[:4, 1] = np.nan
+    signals = pd.DataFrame({"A.HK": 1.0, "B.HK": 1.0}, index=dates)
+
+    result = BacktestBatch(prices, signals, initial_capital=1000.0)
+
+    for column in ["holdings", "cash", "total", "returns"]:
+        assert result[column]["B.HK"].iloc[:4].isna().all()
+    # as Backtest on B alone: the position held on its first row books no trade
+    assert result["cash"]["B.HK"].iloc[-1] == 1000.0
+    assert result["total"]["B.HK"].iloc[4] == 1000.0 + 100 * 9.0
+    assert np.isnan(result["returns"]["B.HK"].iloc[4])
+
+
+def test_batch_panels_match_single_ticker_backtest_on_ragged_histories():
+    """Tickers with different dates, gaps and unmatched signal dates backtest as they do alone."""
+    dates = pd.date_range("2020-01-01", periods=40, freq="B")
+    frames = {
+        "A.HK": dates,
+        "B.HK": dates[10:],  # lists later
+        "C.HK": dates[:25].delete([5, 6]),  # delists early, with a gap
+    }
+    prices, signals, expected = {}, {}, {}
+    for i, (ticker, index) in enumerate(frames.items()):
+        df = _make_price_df(index)
+        # signals on dates without a price, and prices without a signal
+        sig = _make_signals(dates[3 * i:3 * i + 35], seed=i)
+        prices[ticker] = df["Close"]
+        signals[ticker] = sig["signal"]
+        expected[ticker] = BacktestPortfolio(ticker, sig, df)
+
+    result = BacktestBatch(*BatchPanels(prices, signals))
+
+    for ticker, portfolio in expected.items():
+        for column in ["holdings", "cash", "total", "returns"]:
+            np.testing.assert_allclose(
+                result[column][ticker].loc[portfolio.index].to_numpy(), portfolio[column].to_numpy(),
+                equal_nan=True,
+            )
+
+
+def test_backtest_batch_raises_on_no_common_ticker():
+    """BacktestBatch raises when the panels share no ticker."""
+    dates = pd.date_range("2020-01-01", periods=5, freq="B")
+    prices = pd.DataFrame({"A.HK": 1.0}, index=dates)
+    signals = pd.DataFrame({"B.HK": 1.0}, index=dates)
+    with pytest.raises(ValueError, match="no common ticker"):
+        BacktestBatch(prices, signals)
+
+
+def test_backtest_portfolio_is_headless_and_matches_hand_computed_portfolio():
+    """BacktestPortfolio returns the hand-computed portfolio without creating a figure."""
+    signals = pd.DataFrame({"signal": HAND_SIGNALS["A.HK"]})
+    df = HAND_PRICES[["A.HK"]].set_axis(["Close"], axis=1)
+
+    open_figs = plt.get_fignums()
+    portfolio = BacktestPortfolio("A.HK", signals, df, initial_capital=1000.0)
+
+    assert plt.get_fignums() == open_figs
+    assert list(portfolio.columns) == ["A.HK", "holdings", "cash", "total", "returns"]
+    np.testing.assert_allclose(portfolio["A.HK"].to_numpy(), HAND_PORTFOLIOS["A.HK"]["holdings"])
+    for column, values in HAND_PORTFOLIOS["A.HK"].items():
+        np.testing.assert_allclose(portfolio[column].to_numpy(), values, equal_nan=True)
+
+
+def test_plot_portfolio_returns_fig():
+    """PlotPortfolio renders the equity curve on request."""
+    dates = pd.date_range("2020-01-01", periods=20, freq="B")
+    df = _make_price_df(dates)
+    signals = _make_signals(dates)
+    portfolio = BacktestPortfolio("P.HK", signals, df)
+    fig = PlotPortfolio(portfolio, signals)
+    assert fig is not None
+    plt.close(fig)
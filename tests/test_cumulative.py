@@ -0,0 +1,108 @@
+"""
+Tests for the cumulative indicator kernels (strategy/cumulative.py).
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+TA_PY = SRC / "technical-analysis_python"
+sys.path.insert(0, str(SRC))
+sys.path.insert(0, str(TA_PY))
+
+import numpy as np
+import pandas as pd
+import pytest
+import matplotlib
+matplotlib.use("Agg")
+
+from strategy.cumulative import (accumulation_distribution, average_true_range, chaikin_oscillator,
+                                 on_balance_volume, true_range, wilder_smooth)
+from strategy.average_true_range import atr
+from strategy.chaikin_oscillator import co
+from strategy.onbalance_volume import obv
+
+
+@pytest.fixture
+def panel():
+    """OHLCV for 3 tickers x 400 days as 2-D arrays."""
+    rng = np.random.default_rng(5)
+    close = 100 + np.cumsum(np.round(rng.normal(0, 1, (400, 3)), 1), axis=0)
+    high = close + rng.uniform(0, 1, close.shape)
+    low = close - rng.uniform(0, 1, close.shape)
+    high[50, 1] = low[50, 1]  # zero range day
+    volume = rng.integers(1000, 5000, close.shape).astype(float)
+    return high, low, close, volume
+
+
+def _loop_obv(close, volume):
+    out = [0.0] * len(close)
+    for i in range(1, len(close)):
+        step = volume[i] if close[i] > close[i - 1] else -volume[i] if close[i] < close[i - 1] else 0.0
+        out[i] = out[i - 1] + step
+    return np.array(out)
+
+
+def _loop_wilder(values, n):
+    out = [np.nan] * len(values)
+    out[n - 1] = sum(values[:n]) / n
+    for i in range(n, len(values)):
+        out[i] = (out[i - 1] * (n - 1) + values[i]) / n
+    return np.array(out)
+
+
+def test_obv_matches_loop_per_ticker(panel):
+    _, _, close, volume = panel
+    result = on_balance_volume(close, volume)
+    assert result.shape == close.shape
+    for j in range(close.shape[1]):
+        np.testing.assert_array_equal(result[:, j], _loop_obv(close[:, j], volume[:, j]))
+        np.testing.assert_array_equal(on_balance_volume(close[:, j], volume[:, j]), result[:, j])
+
+
+def test_wilder_smooth_and_atr(panel):
+    high, low, close, _ = panel
+    tr = true_range(high, low, close)
+    np.testing.assert_array_equal(tr[0], high[0] - low[0])
+    expected_tr = np.maximum.reduce([high[1:] - low[1:], np.abs(high[1:] - close[:-1]), np.abs(low[1:] - close[:-1])])
+    np.testing.assert_array_equal(tr[1:], expected_tr)
+
+    result = average_true_range(high, low, close, 14)
+    for j in range(close.shape[1]):
+        np.testing.assert_allclose(result[:, j], _loop_wilder(tr[:, j], 14), rtol=1e-12)
+    assert np.isnan(wilder_smooth(np.ones(5), 14)).all()
+
+
+def test_adl_is_cumulative_money_flow(panel):
+    high, low, close, volume = panel
+    adl = accumulation_distribution(high, low, close, volume)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mfm = ((close - low) - (high - close)) / (high - low)
+    mfv = np.where(high == low, 0.0, mfm * volume)
+    np.testing.assert_allclose(np.diff(adl, axis=0), mfv[1:], rtol=1e-9, atol=1e-6)
+    np.testing.assert_allclose(adl[0], mfv[0])
+
+    osc = chaikin_oscillator(high, low, close, volume, 3, 10)
+    frame = pd.DataFrame(adl)
+    expected = frame.ewm(span=3, adjust=False).mean() - frame.ewm(span=10, adjust=False).mean()
+    np.testing.assert_allclose(osc, expected.to_numpy())
+
+
+def test_indicator_classes_use_kernels(panel):
+    high, low, close, volume = panel
+    df = pd.DataFrame({"Open": close[:, 0], "High": high[:, 0], "Low": low[:, 0],
+                       "Close": close[:, 0], "Volume": volume[:, 0]},
+                      index=pd.bdate_range("2019-01-01", periods=len(close), name="Date"))
+    indicator = obv(df)
+    indicator.cal_OBV()
+    np.testing.assert_array_equal(indicator.results["OBV"], _loop_obv(close[:, 0], volume[:, 0]))
+
+    indicator = atr(df)
+    indicator.cal_ATR(20)
+    assert indicator.results["ATR"].isna().sum() == 19
+    assert isinstance(indicator.high_volatility(), (bool, np.bool_))
+
+    indicator = co(df)
+    indicator.cal_CO()
+    assert {"ADL", "Chaikin"} <= set(indicator.results.columns)
+    assert set(indicator.gen_signals()["signal"].unique()) <= {-1.0, 0.0, 1.0}
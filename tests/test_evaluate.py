@@ -1,5 +1,6 @@
 """
-Tests for evaluate module (PortfolioReturn, SharpeRatio, MaxDrawdown, CAGR, StandardDeviation).
+Tests for evaluate module (PortfolioReturn, SharpeRatio, MaxDrawdown, CAGR, StandardDeviation,
+PerformanceMetrics).
 Run from repo root: python -m pytest tests/test_evaluate.py -v
 """
 import sys
@@ -22,6 +23,8 @@ from evaluate import (
     MaxDrawdown,
     CAGR,
     StandardDeviation,
+    PerformanceMetrics,
+    METRICS,
 )
 
 
@@ -90,3 +93,66 @@ def test_portfolio_return_returns_fig():
     fig = PortfolioReturn(portfolio)
     assert fig is not None
     plt.close(fig)
+
+
+def test_max_drawdown_measures_portfolio_total():
+    """MaxDrawdown uses the portfolio's 'total' when given a portfolio."""
+    dates = pd.date_range("2020-01-01", periods=4, freq="B")
+    portfolio = pd.DataFrame({"total": [100.0, 50.0, 75.0, 100.0], "Close": 1.0}, index=dates)
+    fig, max_dd, daily_dd = MaxDrawdown(portfolio)
+    assert max_dd.iloc[-1] == pytest.approx(-0.5)
+    plt.close(fig)
+
+
+def test_performance_metrics_match_single_metric_functions():
+    """One pass over a (date x curve) panel agrees with the per-portfolio functions."""
+    dates = pd.date_range("2020-01-01", periods=300, freq="B")
+    rng = np.random.default_rng(3)
+    totals = pd.DataFrame(100000.0 * np.cumprod(1 + 0.01 * rng.standard_normal((300, 4)), axis=0),
+                          index=dates, columns=list("ABCD"))
+    metrics = PerformanceMetrics(totals)
+    assert list(metrics.columns) == list(METRICS)
+
+    for column in totals:
+        portfolio = pd.DataFrame({"total": totals[column], "returns": totals[column].pct_change()})
+        row = metrics.loc[column]
+        assert row["sharpe"] == pytest.approx(SharpeRatio(portfolio))
+        assert row["cagr"] == pytest.approx(CAGR(portfolio))
+        assert row["volatility"] == pytest.approx(np.sqrt(252) * StandardDeviation(portfolio))
+        assert row["max_drawdown"] == pytest.approx((totals[column] / totals[column].cummax() - 1).min())
+        pd.testing.assert_series_equal(PerformanceMetrics(portfolio), row.rename(None))
+
+    # a bare 2-D array gives the same numbers, counting time in periods for CAGR
+    array = PerformanceMetrics(totals.to_numpy())
+    others = [name for name in METRICS if name not in ("cagr", "calmar")]
+    np.testing.assert_allclose(array[others], metrics[others])
+
+
+def test_performance_metrics_drawdown_duration_hit_rate_and_turnover():
+    """Drawdown duration, hit rate and turnover on a hand-checked curve."""
+    total = np.array([100.0, 110.0, 99.0, 88.0, 99.0, 121.0, 121.0])
+    positions = np.array([0.0, 1.0, 1.0, 0.0, 0.0, 1.0, 1.0])
+    metrics = PerformanceMetrics(total, positions=positions, periods_per_year=7)
+    assert metrics["max_drawdown"] == pytest.approx(-0.2)
+    assert metrics["max_drawdown_duration"] == 3
+    # 3 rises, 2 falls, 1 unchanged period
+    assert metrics["hit_rate"] == pytest.approx(0.6)
+    # weights changed by 3 in total over 7 periods, i.e. a year here
+    assert metrics["turnover"] == pytest.approx(3.0)
+    assert metrics["calmar"] == pytest.approx(metrics["cagr"] / 0.2)
+    assert np.isnan(PerformanceMetrics(total)["turnover"])
+
+
+def test_performance_metrics_skip_missing_history():
+    """Curves that start later (NaN head) are measured from their first value."""
+    values = np.array([[100.0, np.nan], [110.0, np.nan], [121.0, 50.0], [121.0, 55.0]])
+    metrics = PerformanceMetrics(values)
+    assert metrics.loc[1, "total_return"] == pytest.approx(0.1)
+    assert metrics.loc[1, "max_drawdown"] == 0.0
+    assert metrics.loc[1, "max_drawdown_duration"] == 0
+    assert metrics.loc[0, "total_return"] == pytest.approx(0.21)
+
+
+def test_max_drawdown_of_rising_curve_is_zero():
+    assert PerformanceMetrics(np.array([1.0, 2.0, 3.0]))["max_drawdown"] == 0.0
+    assert PerformanceMetrics(np.array([100.0, 50.0, 75.0]))["max_drawdown"] == pytest.approx(-0.5)
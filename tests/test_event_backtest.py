@@ -0,0 +1,218 @@
+"""
+Tests for the event-driven backtest engine (event_backtest.py, backtest.BacktestEvents).
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+import numpy as np
+import pandas as pd
+import pytest
+import matplotlib
+matplotlib.use("Agg")
+
+from backtest import BacktestBatch, BacktestEvents
+from event_backtest import (HKEX_COSTS, CostModel, Order, OrderBook, orders_from_signals, run_events,
+                            transaction_costs)
+
+
+def _bars(close, tickers=("0001.HK",), spread=1.0, volume=10000.0):
+    index = pd.date_range("2020-01-01", periods=len(close), freq="B")
+    close = pd.DataFrame(np.column_stack([close] * len(tickers)), index=index, columns=list(tickers))
+    return {
+        "Open": close.shift(1).fillna(close),
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close,
+        "Volume": pd.DataFrame(volume, index=index, columns=close.columns),
+    }
+
+
+def _orders(bars, rows):
+    index = bars["Close"].index
+    frame = pd.DataFrame(rows)
+    frame["date"] = index[frame.pop("bar")]
+    return frame
+
+
+def test_market_orders_match_batch_backtest_without_costs():
+    rng = np.random.default_rng(0)
+    bars = _bars(100 + np.cumsum(rng.standard_normal(60)), tickers=("A", "B"))
+    signals = pd.DataFrame((rng.random((60, 2)) > 0.5).astype(float), index=bars["Close"].index,
+                           columns=["A", "B"])
+    signals.iloc[0] = 0.0
+
+    result = BacktestEvents(bars, signals)
+    # fills at the next open, which in these bars is the signal bar's close: the same
+    # prices as the batch backtest, with the position held from one bar later
+    batch = BacktestBatch(bars["Close"], signals)
+    np.testing.assert_allclose(result["total"], batch["total"])
+    np.testing.assert_allclose(result["returns"], batch["returns"], atol=1e-12)
+    np.testing.assert_array_equal(result["position"], 100 * signals.shift(1).fillna(0.0))
+
+
+def test_lot_sizes_round_orders_down():
+    bars = _bars(np.full(5, 10.0), tickers=("A", "B"))
+    signals = pd.DataFrame({"A": [0, 1, 1, 0, 0], "B": [0, 1, 1, 1, 1]}, index=bars["Close"].index)
+    orders = orders_from_signals(signals, shares=500, lot_size={"A": 400, "B": 100})
+    assert list(orders["quantity"]) == [400, 500, -400]
+
+    result = BacktestEvents(bars, signals, shares=500, lot_size={"A": 400, "B": 100})
+    assert list(result["position"]["A"]) == [0, 0, 400, 400, 0]
+    assert list(result["position"]["B"]) == [0, 0, 500, 500, 500]
+
+
+def test_costs_commission_minimum_and_stamp_duty_rounding():
+    costs = CostModel(commission_rate=0.001, min_commission=5.0, stamp_duty_rate=0.0013, stamp_duty_rounding=1.0)
+    # 1,000: commission at the minimum, 1.3 of stamp duty rounds up to 2
+    # 100,000: commission 100, stamp duty exactly 130
+    np.testing.assert_allclose(transaction_costs([1000.0, -100000.0, 0.0], costs), [7.0, 230.0, 0.0])
+
+    bars = _bars(np.full(4, 50.0))
+    orders = _orders(bars, [{"bar": 0, "ticker": "0001.HK", "quantity": 1000}])
+    result = run_events(bars, orders, costs=HKEX_COSTS, initial_capital=100000.0)
+    fill = result["fills"].iloc[0]
+    assert fill["costs"] == pytest.approx(transaction_costs(50000.0, HKEX_COSTS))
+    assert result["cash"]["0001.HK"].iloc[-1] == pytest.approx(100000.0 - 50000.0 - fill["costs"])
+
+
+def test_limit_and_stop_orders_trigger_on_the_bar_range():
+    close = np.array([100.0, 100.0, 98.0, 95.0, 101.0, 104.0, 106.0])
+    bars = _bars(close, spread=1.0)
+    orders = _orders(bars, [
+        {"bar": 0, "ticker": "0001.HK", "quantity": 100, "type": "LMT", "limit": 96.5},
+        {"bar": 0, "ticker": "0001.HK", "quantity": 100, "type": "STP", "stop": 104.5},
+    ])
+    result = run_events(bars, orders, slippage=0.01)
+    fills = result["fills"].set_index("order")
+
+    # the limit fills on bar 3 (low 94 <= 96.5) at the limit, as it opened at 98
+    assert fills.loc[0, "date"] == bars["Close"].index[3]
+    assert fills.loc[0, "price"] == 96.5
+    # the stop triggers on bar 5 (high 105 >= 104.5), filling at the stop plus slippage
+    assert fills.loc[1, "date"] == bars["Close"].index[5]
+    assert fills.loc[1, "price"] == pytest.approx(104.5 * 1.01)
+    assert result["position"]["0001.HK"].iloc[-1] == 200
+
+
+def test_limit_gapping_through_fills_at_the_open():
+    bars = _bars(np.array([100.0, 100.0, 90.0, 90.0]), spread=0.5)
+    bars["Open"].iloc[2] = 91.0
+    orders = _orders(bars, [{"bar": 0, "ticker": "0001.HK", "quantity": -100, "type": "LMT", "limit": 95.0},
+                            {"bar": 0, "ticker": "0001.HK", "quantity": 100, "type": "LMT", "limit": 95.0}])
+    fills = run_events(bars, orders)["fills"]
+    # the sell limit fills at the better open on bar 1; the buy limit at the gap-down open on bar 2
+    assert list(fills["order"]) == [0, 1]
+    assert list(fills["price"]) == [100.0, 91.0]
+
+
+def test_partial_fills_follow_volume_participation():
+    bars = _bars(np.full(5, 10.0), volume=2500.0)
+    orders = _orders(bars, [{"bar": 0, "ticker": "0001.HK", "quantity": 1000},
+                            {"bar": 0, "ticker": "0001.HK", "quantity": 300}])
+    result = run_events(bars, orders, lot_size=100, participation=0.2)
+    # 20% of 2,500 is 500 shares per bar, shared first come first served
+    assert list(result["position"]["0001.HK"]) == [0, 500, 1000, 1300, 1300]
+    assert list(result["fills"]["order"]) == [0, 0, 1]
+
+
+def test_good_after_day_orders_and_expiry():
+    bars = _bars(np.array([10.0, 10.0, 11.0, 12.0, 13.0]), spread=0.1)
+    index = bars["Close"].index
+    orders = pd.DataFrame({
+        "date": [index[0], index[0], index[0]],
+        "ticker": "0001.HK",
+        "quantity": [100, 100, 100],
+        "type": ["MKT", "LMT", "LMT"],
+        "limit": [np.nan, 9.0, 9.0],
+        "tif": ["GTC", "DAY", "GTC"],
+        "good_after": [index[3], pd.NaT, pd.NaT],
+        "expiry": [pd.NaT, pd.NaT, index[2]],
+    })
+    fills = run_events(bars, orders)["fills"]
+    assert list(fills["order"]) == [0]
+    assert fills["date"].iloc[0] == index[3]
+
+
+def test_on_bar_callback_submits_orders():
+    bars = _bars(np.array([10.0, 11.0, 12.0, 11.0, 10.0, 9.0]))
+    seen = []
+
+    def on_bar(state):
+        seen.append(state.position[0])
+        if state.bar == 1:
+            return [Order("0001.HK", 250)]
+        if state.bar == 3:
+            return [Order("0001.HK", -200, "STP", stop=9.5)]
+
+    result = run_events(bars, on_bar=on_bar, lot_size=100)
+    assert list(result["position"]["0001.HK"]) == [0, 0, 200, 200, 0, 0]
+    assert seen == [0, 0, 200, 200, 0, 0]
+    # the stop triggers on bar 4 (low 9 <= 9.5) and fills at the stop
+    assert result["fills"]["price"].iloc[-1] == 9.5
+
+
+def test_missing_bars_do_not_fill():
+    bars = _bars(np.array([10.0, 11.0, 12.0, 13.0]))
+    for name in ("Open", "High", "Low", "Close"):
+        bars[name].iloc[1] = np.nan
+    orders = _orders(bars, [{"bar": 0, "ticker": "0001.HK", "quantity": 100}])
+    result = run_events(bars, orders)
+    assert result["fills"]["date"].iloc[0] == bars["Close"].index[2]
+    # the missing close is marked at the last valid price
+    assert result["total"]["0001.HK"].iloc[1] == 100000.0
+
+
+def test_day_and_expiring_orders_do_not_fill_after_their_last_bar():
+    # the low only reaches 8 on bar 2, the bar after the DAY bar and after the expiry
+    bars = _bars(np.array([10.0, 10.5, 9.0, 9.0]), spread=1.0)
+    index = bars["Close"].index
+    orders = pd.DataFrame({
+        "date": [index[0], index[0], index[0]],
+        "ticker": "0001.HK",
+        "quantity": [100, 100, 100],
+        "type": "LMT",
+        "limit": [9.0, 9.0, 9.0],
+        "tif": ["DAY", "GTC", "GTC"],
+        "expiry": [pd.NaT, index[1], pd.NaT],
+    })
+    fills = run_events(bars, orders)["fills"]
+    assert list(fills["order"]) == [2]
+    assert fills["date"].iloc[0] == index[2]
+
+    def on_bar(state):
+        if state.bar == 0:
+            return [Order("0001.HK", 100, "LMT", limit=9.0, tif="DAY")]
+
+    assert run_events(bars, on_bar=on_bar)["fills"].empty
+
+
+def test_order_book_grows_in_place_and_keeps_pending_orders_by_start():
+    rng = np.random.default_rng(1)
+    book = OrderBook(capacity=2)
+    batches = []
+    for size in [1, 3, 0, 5, 2, 8]:
+        batch = dict(ticker=rng.integers(0, 3, size), quantity=rng.integers(-2, 3, size) * 100,
+                     type=np.zeros(size), limit=np.full(size, np.nan), stop=np.full(size, np.nan),
+                     start=rng.integers(0, 6, size), expires=rng.integers(0, 6, size))
+        ids = book.add(**batch)
+        assert list(ids) == list(range(len(book) - size, len(book)))
+        batches.append(batch)
+
+    added = {name: np.concatenate([batch[name] for batch in batches]) for name in batches[0]}
+    assert len(book) == 19
+    for name in ("ticker", "quantity", "start", "expires"):
+        np.testing.assert_array_equal(getattr(book, name), added[name])
+    assert not book.triggered.any()
+
+    # pending: the live orders sorted by start bar, ties in submission order
+    live = np.flatnonzero((added["quantity"] != 0) & (added["expires"] >= added["start"]))
+    expected = live[np.argsort(added["start"][live], kind="stable")]
+    np.testing.assert_array_equal(book._pending, expected)
+    np.testing.assert_array_equal(book._pending_start, added["start"][expected])
+
+    # fields are views: fills write through to the book
+    book.quantity[0] = 7
+    assert book.quantity[0] == 7
@@ -0,0 +1,257 @@
+"""
+Tests for the asyncio IB client (integrated-strategy/ib_async.py) against a fake TWS.
+"""
+import asyncio
+import sys
+import time
+from contextlib import aclosing
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+INTEGRATED = ROOT / "src" / "integrated-strategy"
+sys.path.insert(0, str(INTEGRATED))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ibapi import comm
+from ibapi.contract import Contract
+from ibapi.message import IN, OUT
+from ibapi.order import Order
+from ibapi.server_versions import MAX_CLIENT_VER
+
+from ib_async import IBClient, IBError, Pacer, bars_frame
+
+
+def _msg(*values):
+    return comm.make_msg("".join(comm.make_field(v) for v in values))
+
+
+def _status(orderId, status):
+    return _msg(IN.ORDER_STATUS, orderId, status, 0, 500, 0, 1, 0, 0, 0, "", 0)
+
+
+class FakeTWS:
+    """Answers the handshake and a few requests the way TWS does."""
+    def __init__(self, delay=0.0):
+        self.received = []
+        self.delay = delay  # seconds before answering a historical data request
+        self.open = self.max_open = 0
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def handle(self, reader, writer):
+        assert await reader.readexactly(4) == b"API\0"
+        frames = comm.FrameBuffer()
+        handshake = True
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                frames.write(data)
+                for msg in frames.read_frames():
+                    if handshake:
+                        writer.write(_msg(MAX_CLIENT_VER, "20240102 09:30:00 HKT"))
+                        handshake = False
+                        continue
+                    fields = [f.decode() for f in comm.read_fields(msg)]
+                    self.received.append(fields)
+                    replies = self.answer(int(fields[0]), fields)
+                    if self.delay and int(fields[0]) == OUT.REQ_HISTORICAL_DATA:
+                        asyncio.ensure_future(self.later(writer, replies))
+                        continue
+                    for reply in replies:
+                        writer.write(reply)
+                await writer.drain()
+        except (asyncio.CancelledError, ConnectionError):
+            pass
+        writer.close()
+
+    async def later(self, writer, replies):
+        self.open += 1
+        self.max_open = max(self.max_open, self.open)
+        await asyncio.sleep(self.delay)
+        self.open -= 1
+        for reply in replies:
+            writer.write(reply)
+
+    def answer(self, msgId, fields):
+        if msgId in (OUT.START_API, OUT.REQ_IDS):
+            return [_msg(IN.NEXT_VALID_ID, 1, 7)]
+        if msgId == OUT.REQ_HISTORICAL_DATA:
+            reqId, symbol = fields[1], fields[3]
+            if symbol == "BAD":
+                return [_msg(IN.ERR_MSG, 2, reqId, 200, "No security definition has been found")]
+            if symbol == "SLOW":
+                return []
+            bars = ["20240102", 10, 11, 9, 10.5, 1000, 10.2, 5, "20240103", 10.5, 12, 10, 11.5, 2000, 11.1, 6]
+            return [_msg(IN.HISTORICAL_DATA, reqId, "20240101", "20240104", 2, *bars)]
+        if msgId == OUT.REQ_ACCOUNT_SUMMARY:
+            reqId = fields[2]
+            return [_msg(IN.ACCOUNT_SUMMARY, 1, reqId, "DU1", "CashBalance", "1000", "HKD"),
+                    _msg(IN.ACCOUNT_SUMMARY, 1, reqId, "DU1", "NetLiquidation", "1500", "HKD"),
+                    _msg(IN.ACCOUNT_SUMMARY_END, 1, reqId)]
+        if msgId == OUT.PLACE_ORDER:
+            return [_msg(IN.ERR_MSG, 2, fields[1], 399, "Order Message: warning"),
+                    _status(fields[1], "PendingSubmit"), _status(fields[1], "PreSubmitted")]
+        if msgId == OUT.CANCEL_ORDER:
+            return [_status(fields[2], "PendingCancel"), _status(fields[2], "Cancelled")]
+        if msgId == OUT.REQ_MKT_DATA:
+            reqId = fields[2]
+            if fields[4] == "DELAYED":  # no live subscription: a notice, then delayed ticks
+                return [_msg(IN.ERR_MSG, 2, reqId, 10167, "Displaying delayed market data."),
+                        _msg(IN.TICK_PRICE, 6, reqId, 66, 9.5, 100, 0)]
+            if fields[-3] == "1":  # snapshot
+                return [_msg(IN.TICK_PRICE, 6, reqId, 1, 10.0, 100, 0), _msg(IN.TICK_PRICE, 6, reqId, 2, 10.1, 200, 0),
+                        _msg(IN.TICK_SNAPSHOT_END, 1, reqId)]
+            return [_msg(IN.TICK_PRICE, 6, reqId, 1, 10.0 + i, 100, 0) for i in range(3)]
+        return []
+
+
+def _contract(symbol="1"):
+    contract = Contract()
+    contract.symbol, contract.secType, contract.exchange, contract.currency = symbol, "STK", "SEHK", "HKD"
+    return contract
+
+
+def _run(test, delay=0.0, **kwargs):
+    async def main():
+        tws = FakeTWS(delay)
+        port = await tws.start()
+        async with tws.server:
+            ib = IBClient(**kwargs)
+            assert await ib.connect("127.0.0.1", port, 0, timeout=5) == 7
+            try:
+                await asyncio.wait_for(test(ib), 5)
+            finally:
+                ib.disconnect()
+        return tws
+    return asyncio.run(main())
+
+
+def test_historical_data_and_account_summary_complete_on_end_messages():
+    async def test(ib):
+        bars = await ib.historical_data(_contract(), duration="2 D")
+        assert [(b.date, b.close, b.volume) for b in bars] == [("20240102", 10.5, 1000), ("20240103", 11.5, 2000)]
+        summary = await ib.account_summary(tags="$LEDGER:HKD")
+        assert summary == [("DU1", "CashBalance", "1000", "HKD"), ("DU1", "NetLiquidation", "1500", "HKD")]
+        assert ib.serverVersion() == MAX_CLIENT_VER
+
+    tws = _run(test)
+    assert [int(f[0]) for f in tws.received][-1] == OUT.CANCEL_ACCOUNT_SUMMARY
+
+
+def test_request_errors_raise():
+    async def test(ib):
+        with pytest.raises(IBError) as err:
+            await ib.historical_data(_contract("BAD"))
+        assert err.value.code == 200
+        assert ib._pending == {}
+
+    _run(test)
+
+
+def test_orders_wait_for_status_and_ticks_stream():
+    async def test(ib):
+        order = Order()
+        order.action, order.orderType, order.totalQuantity = "BUY", "MKT", 500
+        status = await ib.place_order(_contract(), order)
+        assert (status.orderId, status.status, status.remaining) == (7, "PreSubmitted", 500)
+        assert ib.nextOrderId == 8
+        assert (await ib.cancel_order(7)).status == "Cancelled"
+
+        ticks = []
+        async with aclosing(ib.market_data(_contract())) as stream:
+            async for tick in stream:
+                ticks.append((tick.name, tick.value))
+                if len(ticks) == 6:
+                    break
+        # each price tick carries its size, which the decoder reports as a size tick
+        assert ticks == [("BID", 10.0), ("BID_SIZE", 100), ("BID", 11.0), ("BID_SIZE", 100),
+                         ("BID", 12.0), ("BID_SIZE", 100)]
+
+    tws = _run(test)
+    assert int(tws.received[-1][0]) == OUT.CANCEL_MKT_DATA
+
+
+def test_delayed_data_notice_does_not_end_the_stream():
+    async def test(ib):
+        async with aclosing(ib.market_data(_contract("DELAYED"))) as stream:
+            async for tick in stream:
+                assert (tick.name, tick.value) == ("DELAYED_BID", 9.5)
+                break
+
+    _run(test)
+
+
+def test_concurrent_historical_requests_are_paced():
+    async def test(ib):
+        contracts = {"%04d" % i: _contract(str(i)) for i in range(1, 13)}
+        contracts["BAD"] = _contract("BAD")
+        results = await ib.download_bars(contracts, duration="2 D")
+        assert isinstance(results.pop("BAD"), IBError)
+        assert list(results) == ["%04d" % i for i in range(1, 13)]
+        frame = bars_frame(results["0001"])
+        assert list(frame.columns) == ["Open", "High", "Low", "Close", "Volume"]
+        assert list(frame["Close"]) == [10.5, 11.5]
+        assert frame.index[0] == pd.Timestamp("2024-01-02")
+        assert ib._pending == {}
+
+    tws = _run(test, delay=0.02, max_in_flight=4)
+    assert tws.max_open == 4
+
+
+def test_historical_timeout_cancels_and_snapshot_completes():
+    async def test(ib):
+        with pytest.raises(asyncio.TimeoutError):
+            await ib.historical_data(_contract("SLOW"), timeout=0.05)
+        assert ib._pending == {}
+        assert await ib.tick_snapshot(_contract()) == {"BID": 10.0, "BID_SIZE": 100, "ASK": 10.1, "ASK_SIZE": 200}
+
+    tws = _run(test)
+    msgIds = [int(f[0]) for f in tws.received]
+    assert OUT.CANCEL_HISTORICAL_DATA in msgIds
+
+
+def test_pacer_spaces_request_starts():
+    async def main():
+        pacer = Pacer(max_in_flight=10, min_interval=0.02)
+        loop = asyncio.get_running_loop()
+        starts = []
+
+        async def request():
+            async with pacer:
+                starts.append(loop.time())
+                if len(starts) == 2:
+                    time.sleep(0.03)  # blocking work: the next request's sleep wakes late
+                await asyncio.sleep(0)
+
+        await asyncio.gather(*(request() for _ in range(8)))
+        return np.diff(starts)
+
+    # each start is at least min_interval after the previous actual start; the only
+    # slack is the time between the pacer noting a start and the body reading the clock
+    assert (asyncio.run(main()) >= 0.02 - 1e-3).all()
+
+
+def test_download_hkex_bars_merges_into_price_csv(tmp_path):
+    from download_hkex_bars import hkex_contract, merge_bars
+
+    assert hkex_contract("0005").symbol == "5"
+    index = pd.to_datetime(["2024-01-02", "2024-01-03"]).rename("Date")
+    old = pd.DataFrame({"Open": [1.0, 2.0], "High": [1.0, 2.0], "Low": [1.0, 2.0], "Close": [1.0, 2.0],
+                        "Volume": [10, 20]}, index=index)
+    path = tmp_path / "hkex_0005.csv"
+    old.to_csv(path)
+    new = old.iloc[1:] * 2
+    new.loc[pd.Timestamp("2024-01-04")] = [5.0, 5.0, 5.0, 5.0, 50]
+    merge_bars(path, new)
+    merged = pd.read_csv(path, index_col="Date", parse_dates=True)
+    # the new bars are adjusted to twice the old level on 2024-01-03: older rows follow
+    assert list(merged["Close"]) == [2.0, 4.0, 5.0]
+    assert list(merged["Open"]) == [2.0, 4.0, 5.0]
+    assert list(merged["Volume"]) == [10, 40, 50]
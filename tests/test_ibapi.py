@@ -0,0 +1,203 @@
+"""
+Tests for the vendored IB API message handling (integrated-strategy/ibapi).
+"""
+import queue
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+INTEGRATED = ROOT / "src" / "integrated-strategy"
+sys.path.insert(0, str(INTEGRATED))
+
+import numpy as np
+import pytest
+
+from ibapi import comm
+from ibapi.client import EClient
+from ibapi.decoder import Decoder
+from ibapi.message import IN
+from ibapi.reader import EReader
+from ibapi.server_versions import MAX_CLIENT_VER, MIN_SERVER_VER_SYNT_REALTIME_BARS
+from ibapi.utils import BadMessage
+from ibapi.wrapper import EWrapper
+
+
+def _stream(n, seed=0):
+    rng = np.random.default_rng(seed)
+    msgs = [b"\0".join(str(v).encode() for v in rng.integers(0, 10**6, rng.integers(1, 12))) + b"\0"
+            for _ in range(n)]
+    return msgs, b"".join(comm.make_msg(m.decode()) for m in msgs)
+
+
+@pytest.mark.parametrize("capacity", [8, 1 << 16])
+def test_frame_buffer_reassembles_frames_split_anywhere(capacity):
+    msgs, wire = _stream(500)
+    rng = np.random.default_rng(1)
+    cuts = np.sort(rng.choice(len(wire), 300, replace=False))
+
+    frames = comm.FrameBuffer(capacity)
+    out = []
+    for chunk in np.split(np.frombuffer(wire, dtype=np.uint8), cuts):
+        frames.write(chunk.tobytes())
+        out.extend(frames.read_frames())
+    assert out == msgs
+    assert len(frames) == 0
+
+
+def test_frame_buffer_read_frame_matches_read_msg():
+    msgs, wire = _stream(20)
+    frames = comm.FrameBuffer(16)
+    frames.write(wire[:-3])
+    buf = wire
+    for msg in msgs[:-1]:
+        size, text, buf = comm.read_msg(buf)
+        assert frames.read_frame() == text == msg
+    assert frames.read_frame() is None
+    frames.write(wire[-3:])
+    assert frames.read_frame() == msgs[-1]
+
+
+class _FakeConnection:
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+
+    def isConnected(self):
+        return bool(self.chunks)
+
+    def recvMsg(self):
+        return self.chunks.pop(0)
+
+
+def test_reader_queues_every_message_in_order():
+    msgs, wire = _stream(200, seed=2)
+    handshake = comm.FrameBuffer()
+    handshake.write(wire[:50])  # bytes left over from the connect handshake
+    chunks = [wire[i:i + 97] for i in range(50, len(wire), 97)]
+
+    msg_queue = queue.Queue()
+    reader = EReader(_FakeConnection(chunks), msg_queue, handshake)
+    reader.run()
+    assert [msg_queue.get_nowait() for _ in range(msg_queue.qsize())] == msgs
+
+
+class _Recorder(EWrapper):
+    """Records every wrapper call with its arguments (objects as their attribute dicts)."""
+    def __init__(self):
+        self.calls = []
+
+    def __getattribute__(self, name):
+        attr = super().__getattribute__(name)
+        if name.startswith("_") or name == "calls" or not callable(attr):
+            return attr
+
+        def record(*args):
+            self.calls.append((name, tuple(vars(a) if hasattr(a, "__dict__") else a for a in args)))
+        return record
+
+
+def _fields(*values):
+    return comm.read_fields(b"\0".join(str(v).encode() for v in values) + b"\0")
+
+
+HOT_MESSAGES = [
+    _fields(IN.TICK_PRICE, 6, 1, 1, 101.5, 300, 3),
+    _fields(IN.TICK_PRICE, 6, 1, 9, 99.0, 0, 0),
+    _fields(IN.TICK_PRICE, 6, 2, 68, "", "", ""),
+    _fields(IN.TICK_SIZE, 6, 1, 0, 1200),
+    _fields(IN.MARKET_DEPTH, 1, 7, 0, 1, 1, 10.25, 400),
+    _fields(IN.MARKET_DEPTH_L2, 1, 7, 2, "MM\xe9", 0, 0, 10.2, 100, 1),
+    _fields(IN.TICK_BY_TICK, 5, 1, 1600000000, 10.5, 200, 2, "SEHK", "X"),
+    _fields(IN.TICK_BY_TICK, 5, 3, 1600000001, 10.4, 10.6, 100, 300, 1),
+    _fields(IN.TICK_BY_TICK, 5, 4, 1600000002, 10.5),
+    _fields(IN.TICK_BY_TICK, 5, 0, 1600000003),
+    _fields(IN.ERR_MSG, 2, 5, 200, "No security definition"),
+]
+
+BARS = [("20200102", 10, 11, 9, 10.5, 1000, 10.2, 50), ("20200103", 10.5, 12, 10, 11.5, "", 11.1, 60)]
+
+
+def _historical_data(serverVersion):
+    if serverVersion < MIN_SERVER_VER_SYNT_REALTIME_BARS:
+        # a version field, and a WAP flag before each bar count
+        bars = [value for bar in BARS for value in bar[:-1] + ("false", bar[-1])]
+        return _fields(IN.HISTORICAL_DATA, 3, 9, "20200101", "20200110", len(BARS), *bars)
+    bars = [value for bar in BARS for value in bar]
+    return _fields(IN.HISTORICAL_DATA, 9, "20200101", "20200110", len(BARS), *bars)
+
+
+@pytest.mark.parametrize("serverVersion", [MIN_SERVER_VER_SYNT_REALTIME_BARS - 1, MAX_CLIENT_VER])
+def test_fast_decoders_match_generic_decoding(serverVersion):
+    messages = HOT_MESSAGES + [_historical_data(serverVersion)]
+    calls = {}
+    for fast in (False, True):
+        wrapper = _Recorder()
+        decoder = Decoder(wrapper, serverVersion, fast=fast)
+        for fields in messages:
+            decoder.interpret(fields)
+        calls[fast] = wrapper.calls
+    assert calls[True] == calls[False]
+    assert [name for name, _ in calls[True]].count("historicalData") == len(BARS)
+
+
+def test_fast_decoder_reports_truncated_messages():
+    wrapper = _Recorder()
+    decoder = Decoder(wrapper, MAX_CLIENT_VER)
+    with pytest.raises(BadMessage):
+        decoder.interpret(_fields(IN.TICK_PRICE, 6, 1, 1))
+    assert wrapper.calls[-1][0] == "error"
+
+
+def _client(messages):
+    wrapper = _Recorder()
+    client = EClient(wrapper)
+    client.decoder = Decoder(wrapper, MAX_CLIENT_VER)
+    for fields in messages:
+        client.msg_queue.put(b"\0".join(fields) + b"\0")
+    return client, wrapper
+
+
+TICKS = [
+    _fields(IN.TICK_PRICE, 6, 1, 1, 10.0, 100, 0),
+    _fields(IN.TICK_SIZE, 6, 1, 0, 500),
+    _fields(IN.TICK_PRICE, 6, 2, 1, 20.0, 100, 0),
+    _fields(IN.TICK_PRICE, 6, 1, 1, 10.1, 200, 0),
+    _fields(IN.ERR_MSG, 2, 1, 200, "warning"),
+    _fields(IN.TICK_SIZE, 6, 1, 0, 600),
+    _fields(IN.TICK_PRICE, 6, 1, 2, 10.2, 300, 0),
+]
+
+
+def test_batch_run_dispatches_like_run():
+    calls = {}
+    for batch in (False, True):
+        client, wrapper = _client(TICKS)
+        client.run(batch=batch)
+        calls[batch] = wrapper.calls
+    assert calls[True] == calls[False]
+
+
+def test_coalesce_keeps_latest_tick_per_ticker_and_field():
+    kept = comm.coalesce_ticks(TICKS)
+    assert kept == [TICKS[2], TICKS[3], TICKS[4], TICKS[5], TICKS[6]]
+
+
+def test_coalesce_keeps_every_trade_print():
+    # RT_VOLUME (48) and RT_TRD_VOLUME (77) strings are trades, not quotes
+    prints = [
+        _fields(IN.TICK_STRING, 6, 1, 48, "10.0;100;1600000000000;100;10.0;true"),
+        _fields(IN.TICK_PRICE, 6, 1, 1, 10.0, 100, 0),
+        _fields(IN.TICK_STRING, 6, 1, 48, "10.1;200;1600000000001;300;10.07;true"),
+        _fields(IN.TICK_STRING, 6, 1, 77, "10.1;200;1600000000001;300;10.07;true"),
+        _fields(IN.TICK_STRING, 6, 1, 77, "10.2;100;1600000000002;400;10.1;true"),
+        _fields(IN.TICK_PRICE, 6, 1, 1, 10.1, 200, 0),
+    ]
+    assert comm.coalesce_ticks(prints) == prints[:1] + prints[2:]
+
+
+def test_batch_callback_receives_coalesced_batch():
+    client, wrapper = _client(TICKS)
+    batches = []
+    client.setBatchCallback(batches.append, dispatch=False)
+    client.run(batch=True, coalesce=True)
+    assert batches == [comm.coalesce_ticks(TICKS)]
+    assert wrapper.calls == []
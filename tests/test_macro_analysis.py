@@ -0,0 +1,113 @@
+"""
+Tests for the macro data cache (macro_data.py) and the macro filters
+(integrated-strategy/filters/macro_analysis.py).
+"""
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+INTEGRATED = SRC / "integrated-strategy"
+sys.path.insert(0, str(SRC))
+sys.path.insert(0, str(INTEGRATED))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import config
+import macro_data
+from filters import macro_analysis
+
+
+@pytest.fixture
+def macro_root(tmp_path, monkeypatch):
+    """Temporary database_real with small GDP / unemployment / property price series."""
+    determinants = tmp_path / "macroeconomic_data" / "determinants"
+    determinants.mkdir(parents=True)
+    pd.DataFrame({
+        "Date": ["2019-10-01", "2020-01-01", "2020-04-01"],
+        "GDP_current_market_prices": ["700,100", "650,200", "690,300"],
+    }).to_csv(determinants / "quarterly_gdp.csv", index=False)
+    pd.DataFrame({
+        "Date": ["2019-12-01", "2020-01-01", "2020-01-08", "2020-02-01"],
+        "Unemployment_rate_seasonally_adjusted": [3.2, 3.4, 3.7, 4.2],
+    }).to_csv(determinants / "unemployment_rate.csv", index=False)
+    pd.DataFrame({
+        "Date": ["2020-01-06", "2020-01-01"],  # unsorted on purpose
+        "average_price_per_sqft": [14000, 13500],
+    }).to_csv(determinants / "property_price.csv", index=False)
+    monkeypatch.setattr(config, "_DATABASE_REAL", str(tmp_path))
+    monkeypatch.setattr(macro_data, "_CACHE", {})
+    return tmp_path
+
+
+def _reference(dates, macro_dates, macro_values):
+    """Per-date lookup: value of the latest observation on or before each date, else 0."""
+    order = np.argsort(macro_dates)
+    macro_dates = [macro_dates[i] for i in order]
+    macro_values = [macro_values[i] for i in order]
+    out = []
+    for date in dates:
+        value = 0.0
+        for d, v in zip(macro_dates, macro_values):
+            if d <= date:
+                value = v
+        out.append(value)
+    return np.array(out, dtype=float)
+
+
+def test_align_macrodata_matches_per_date_lookup(macro_root):
+    dates = pd.to_datetime(["2019-11-29", "2019-12-02", "2020-01-01", "2020-01-07",
+                            "2020-01-08", "2020-03-31", "2020-06-30"])
+    expected = _reference(dates, pd.to_datetime(["2019-12-01", "2020-01-01", "2020-01-08", "2020-02-01"]),
+                          [3.2, 3.4, 3.7, 4.2])
+    np.testing.assert_allclose(macro_analysis.AlignMacrodata(dates, "Unemployment rate"), expected)
+
+    # before the first observation is 0; commas are stripped; unsorted files are handled
+    gdp = macro_analysis.AlignMacrodata(dates, "GDP")
+    np.testing.assert_allclose(gdp, [700100, 700100, 650200, 650200, 650200, 650200, 690300])
+    pp = macro_analysis.AlignMacrodata(dates, "Property price")
+    np.testing.assert_allclose(pp, [0, 0, 13500, 14000, 14000, 14000, 14000])
+
+
+def test_get_macrodata_and_sensitivity(macro_root):
+    prices = pd.read_csv(ROOT / "tests" / "fixtures" / "sample_prices.csv",
+                         index_col="Date", parse_dates=True)
+    signals = pd.DataFrame({"signal": 0.0}, index=prices.index)
+
+    out = macro_analysis.GetMacrodata(signals)
+    assert list(out.columns) == ["Date", "signal", "GDP", "Unemployment rate", "Property price"]
+    for name in ["Unemployment rate", "Property price"]:
+        assert out[name].min() == 0.0 and out[name].max() == 1.0
+    assert out["GDP"].isna().all()  # constant over the window, as before
+
+    s_gdp, s_unemploy, s_property = macro_analysis.GetSensitivity(prices)
+    urate = macro_analysis.AlignMacrodata(prices.index, "Unemployment rate")
+    assert s_unemploy == pytest.approx(np.corrcoef(prices["Close"], urate)[0, 1])
+    assert np.isnan(s_gdp)  # GDP is constant over the fixture's dates
+    assert -1.0 <= s_property <= 1.0
+
+
+def test_macro_series_parsed_once_until_file_changes(macro_root, monkeypatch):
+    parsed = []
+    parse = macro_data._parse
+    monkeypatch.setattr(macro_data, "_parse", lambda path, col: parsed.append(path) or parse(path, col))
+
+    prices = pd.read_csv(ROOT / "tests" / "fixtures" / "sample_prices.csv",
+                         index_col="Date", parse_dates=True)
+    for _ in range(3):  # e.g. three tickers in one baseline run
+        macro_analysis.GetSensitivity(prices)
+        macro_analysis.GetMacrodata(pd.DataFrame({"signal": 0.0}, index=prices.index))
+    assert sorted(parsed) == sorted(macro_data.macro_path(n) for n in macro_data.MACRO_SERIES)
+
+    series = macro_data.get_series("GDP")
+    assert macro_data.get_series("GDP") is series
+    assert not series.values.flags.writeable
+
+    path = macro_data.macro_path("GDP")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert macro_data.get_series("GDP") is not series
+    assert parsed.count(path) == 2
@@ -0,0 +1,58 @@
+"""
+Tests for the vectorised Money Flow Index (strategy/money_flow_index.py).
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+TA_PY = SRC / "technical-analysis_python"
+sys.path.insert(0, str(SRC))
+sys.path.insert(0, str(TA_PY))
+
+import numpy as np
+import pandas as pd
+import pytest
+import matplotlib
+matplotlib.use("Agg")
+
+from strategy.money_flow_index import mfi, money_flow_index
+
+
+def _apply_mfi(df, n):
+    """Reference: the rolling().apply formulation cal_MFI used before."""
+    tp = (df["High"] + df["Low"] + df["Close"]) / 3.0
+    flow = tp * df["Volume"] * np.where(tp > tp.shift(1), 1, np.where(tp < tp.shift(1), -1, 0))
+    pos = flow.rolling(n).apply(lambda x: np.sum(np.where(x >= 0.0, x, 0.0)), raw=True)
+    neg = abs(flow.rolling(n).apply(lambda x: np.sum(np.where(x < 0.0, x, 0.0)), raw=True))
+    return 100 - (100 / (1 + pos / neg))
+
+
+def _ohlcv(seed, n=300):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(np.round(rng.normal(0, 1, n), 1))
+    close[40:60] = close[39]  # no money flow at all for a while
+    return pd.DataFrame({"High": close + 1, "Low": close - 1, "Close": close,
+                         "Volume": rng.integers(100, 1000, n)},
+                        index=pd.bdate_range("2016-01-01", periods=n, name="Date"))
+
+
+def test_cal_mfi_matches_rolling_apply():
+    df = _ohlcv(0)
+    expected = _apply_mfi(df, 10)
+    indicator = mfi(df, n=10)
+    indicator.cal_MFI()
+    np.testing.assert_array_equal(indicator.results["MFI"], expected)
+    assert set(indicator.gen_signals()["signal"].unique()) <= {-1.0, 0.0, 1.0}
+
+
+def test_money_flow_index_multi_ticker_frames():
+    frames = {ticker: _ohlcv(seed) for seed, ticker in enumerate(["0001.HK", "0005.HK", "0700.HK"])}
+    panel = {field: pd.DataFrame({t: f[field] for t, f in frames.items()})
+             for field in ["High", "Low", "Close", "Volume"]}
+
+    result = money_flow_index(panel["High"], panel["Low"], panel["Close"], panel["Volume"])
+    assert isinstance(result, pd.DataFrame)
+    assert list(result.columns) == list(frames) and result.index.equals(panel["Close"].index)
+    for ticker, frame in frames.items():
+        np.testing.assert_array_equal(result[ticker], _apply_mfi(frame, 14))
@@ -0,0 +1,118 @@
+"""
+Tests for the shared-intermediate cache and indicator pipeline
+(technical-analysis_python/strategy/frame_cache.py, strategy/pipeline.py).
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+TA_PY = ROOT / "src" / "technical-analysis_python"
+sys.path.insert(0, str(TA_PY))
+
+import numpy as np
+import pandas as pd
+import pytest
+import matplotlib
+matplotlib.use("Agg")
+
+from strategy.frame_cache import FrameCache
+from strategy.pipeline import STRATEGIES, run_strategy, run_strategies
+from strategy.macd_crossover import macdCrossover
+
+
+def _prices(n=120, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100.0 + np.cumsum(rng.standard_normal(n))
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close + rng.random(n),
+            "Low": close - rng.random(n),
+            "Close": close,
+            "Volume": rng.integers(1000, 5000, n).astype(np.float64),
+        },
+        index=pd.date_range("2020-01-01", periods=n, freq="B"),
+    )
+
+
+def test_cache_matches_pandas():
+    df = _prices()
+    cache = FrameCache(df)
+    tp = (df["High"] + df["Low"] + df["Close"]) / 3
+
+    pd.testing.assert_series_equal(cache.typical_price(), tp)
+    pd.testing.assert_series_equal(cache.change("Close"), df["Close"] - df["Close"].shift(1))
+    pd.testing.assert_series_equal(cache.ema(26), df["Close"].ewm(span=26, adjust=False).mean())
+    pd.testing.assert_series_equal(cache.sma(14, "Typical price", min_periods=1),
+                                   tp.rolling(14, min_periods=1).mean())
+    pd.testing.assert_series_equal(cache.rolling_std(20, ddof=0), df["Close"].rolling(20).std(ddof=0))
+    np.testing.assert_array_equal(cache.rolling_max(14), df["High"].rolling(14).max().to_numpy())
+
+
+def test_intermediates_are_computed_once():
+    df = _prices()
+    cache = FrameCache(df)
+    first = cache.ema(12)
+    assert cache.ema(12) is first
+    assert cache.ema(12, adjust=True) is not first
+    assert cache.computed == [("ema", "Close", 12, False), ("ema", "Close", 12, True)]
+
+
+def test_cached_arrays_are_read_only():
+    with pytest.raises(ValueError):
+        FrameCache(_prices()).rolling_min(5)[0] = 0.0
+
+
+def test_indicator_cache_follows_its_frame():
+    df = _prices()
+    indicator = macdCrossover(df)
+    cache = indicator.cache
+    assert indicator.cache is cache and cache.df is df
+
+    indicator.df = df.copy()
+    assert indicator.cache is not cache
+
+
+def test_pipeline_matches_independent_runs():
+    df = _prices()
+    signals = run_strategies(df)
+
+    assert set(signals) == set(STRATEGIES)
+    for strategy in STRATEGIES:
+        pd.testing.assert_frame_equal(signals[strategy], run_strategy(df, strategy))
+
+
+def test_pipeline_shares_typical_price_between_strategies():
+    cache = FrameCache(_prices())
+    run_strategies(cache.df, ["cci_emerging_trends", "cci_overbought_oversold", "mfi"], cache=cache)
+    assert cache.computed.count(("Typical price",)) == 1
+    # both CCIs use the same window by default, so their SMA and deviation are shared too
+    assert len([key for key in cache.computed if key[0] in ("sma", "std")]) == 2
+
+
+def test_pipeline_passes_params_and_rejects_unknown_strategy():
+    df = _prices()
+    cache = FrameCache(df)
+    run_strategies(df, ["macd_crossover"], params={"macd_crossover": {"short_span": 8}}, cache=cache)
+    assert ("ema", "Close", 8, False) in cache
+
+    with pytest.raises(ValueError):
+        run_strategies(df, ["no_such_strategy"])
+    with pytest.raises(ValueError):
+        run_strategies(df.copy(), ["macd_crossover"], cache=cache)
+
+
+def test_indicators_leave_the_price_frame_unchanged():
+    df = _prices()
+    original = df.copy()
+    run_strategies(df)
+    pd.testing.assert_frame_equal(df, original)
+
+
+def test_results_hold_indicator_outputs():
+    df = _prices()
+    indicator = macdCrossover(df)
+    indicator.cal_MACD()
+    assert list(indicator.results.columns) == ["MACD", "Signal line"]
+    assert indicator.results.index.equals(df.index)
+    assert "MACD" not in df
@@ -0,0 +1,67 @@
+"""
+Tests for the binary columnar price store (price_store.py).
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+sys.path.insert(0, str(SRC))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import config
+import price_store
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+@pytest.fixture
+def data_root(tmp_path, monkeypatch):
+    """Temporary data root holding the fixture prices as hkex_0001.csv."""
+    market = tmp_path / price_store.HKEX_DAY
+    market.mkdir(parents=True)
+    (market / "hkex_0001.csv").write_text((FIXTURES / "sample_prices.csv").read_text())
+    monkeypatch.setattr(config, "_DATA_ROOT", str(tmp_path))
+    monkeypatch.setattr(config, "_PRICE_STORE", str(tmp_path / ".price_store"))
+    return tmp_path
+
+
+def test_read_prices_matches_read_csv(data_root):
+    expected = pd.read_csv(FIXTURES / "sample_prices.csv", index_col="Date", parse_dates=True)
+    pd.testing.assert_frame_equal(price_store.read_prices("0001"), expected)
+    pd.testing.assert_frame_equal(
+        price_store.read_prices("0001", "2020-01-03", "2020-01-06"),
+        expected.loc["2020-01-03":"2020-01-06"],
+    )
+
+
+def test_get_arrays_is_zero_copy_view(data_root):
+    prices = price_store.get_arrays("0001", start="2020-01-03")
+    assert isinstance(prices.values.base, np.memmap) or isinstance(prices.values, np.memmap)
+    assert not prices.values.flags.writeable
+    assert prices.values.shape == (len(prices.columns), len(prices.dates))
+    assert prices.dates[0] == np.datetime64("2020-01-03")
+
+
+def test_store_rebuilds_when_csv_changes(data_root):
+    n_rows = len(price_store.read_prices("0001"))
+
+    csv = data_root / price_store.HKEX_DAY / "hkex_0001.csv"
+    with open(csv, "a", encoding="utf-8") as f:
+        f.write("2030-01-08,100.5,101.0,99.5,100.0,800\n")
+    stat = os.stat(csv)
+    os.utime(csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    df = price_store.read_prices("0001")
+    assert len(df) == n_rows + 1
+    assert df["Close"].iloc[-1] == 100.0
+
+
+def test_missing_ticker_raises(data_root):
+    with pytest.raises(FileNotFoundError, match="Price file not found"):
+        price_store.read_prices("9999")
@@ -0,0 +1,62 @@
+"""
+Tests for the Parabolic SAR kernel (strategy/parabolic_stop_and_reverse.py).
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+TA_PY = SRC / "technical-analysis_python"
+sys.path.insert(0, str(SRC))
+sys.path.insert(0, str(TA_PY))
+
+import numpy as np
+import pandas as pd
+import pytest
+import matplotlib
+matplotlib.use("Agg")
+
+from strategy import parabolic_stop_and_reverse as psar_module
+from strategy.parabolic_stop_and_reverse import ParabolicSAR, psar_arrays
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+nan = np.nan
+
+# psar / psarbull / psarbear for sample_prices.csv from the original pandas loop
+EXPECTED = np.array([
+    [100.5, nan, nan], [101.0, nan, nan], [101.0, nan, 101.0], [100.5, 100.5, nan],
+    [101.0, nan, 101.0], [100.0, 100.0, nan], [100.0, 100.0, nan], [100.16, 100.16, nan],
+    [100.3136, 100.3136, nan], [100.461056, 100.461056, nan],
+])
+
+
+def test_cal_psar_matches_original_values():
+    df = pd.read_csv(FIXTURES / "sample_prices.csv", index_col="Date", parse_dates=True)
+    indicator = ParabolicSAR(df)
+    indicator.cal_PSAR()
+    np.testing.assert_allclose(indicator.results[["psar", "psarbull", "psarbear"]].to_numpy(), EXPECTED, rtol=0, atol=1e-12)
+
+
+def test_gen_signals_without_plotting_or_cal():
+    df = pd.read_csv(FIXTURES / "sample_prices.csv", index_col="Date", parse_dates=True)
+    signals = ParabolicSAR(df).gen_signals()
+    np.testing.assert_array_equal(signals["signal"], [0, 0, -1, 1, -1, 1, 1, 1, 1, 1])
+
+
+def test_psar_arrays_short_inputs():
+    for n in (0, 1, 2):
+        psar, bull, bear = psar_arrays(np.ones(n) + 1, np.ones(n), np.ones(n) + 0.5)
+        np.testing.assert_array_equal(psar, np.ones(n) + 0.5)
+        assert np.isnan(bull).all() and np.isnan(bear).all()
+
+
+def test_compiled_kernel_matches_python(monkeypatch):
+    if psar_module._psar_loop_jit is None:
+        pytest.skip("numba not installed")
+    rng = np.random.default_rng(3)
+    close = 100 + np.cumsum(rng.normal(0, 1, 2000))
+    high, low = close + rng.uniform(0, 1, 2000), close - rng.uniform(0, 1, 2000)
+    compiled = psar_arrays(high, low, close)
+    monkeypatch.setattr(psar_module, "_psar_loop_jit", None)
+    for got, expected in zip(compiled, psar_arrays(high, low, close)):
+        np.testing.assert_array_equal(got, expected)
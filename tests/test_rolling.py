@@ -0,0 +1,89 @@
+"""
+Tests for the rolling extrema (strategy/rolling.py) and the indicators built on them.
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+TA_PY = SRC / "technical-analysis_python"
+sys.path.insert(0, str(SRC))
+sys.path.insert(0, str(TA_PY))
+
+import numpy as np
+import pandas as pd
+import pytest
+import matplotlib
+matplotlib.use("Agg")
+
+from strategy.rolling import rolling_max, rolling_min, rolling_sum
+from strategy.stochastic_oscillator import stc_oscillator
+from strategy.williams_R import williamsR
+
+
+@pytest.fixture
+def ohlc():
+    rng = np.random.default_rng(11)
+    n = 300
+    close = 50.0 + np.cumsum(rng.normal(0, 1, n))
+    return pd.DataFrame({
+        "Open": close, "High": close + rng.uniform(0, 1, n), "Low": close - rng.uniform(0, 1, n),
+        "Close": close, "Volume": rng.integers(1000, 2000, n),
+    }, index=pd.bdate_range("2018-01-01", periods=n, name="Date"))
+
+
+@pytest.mark.parametrize("window", [1, 2, 5, 14, 37, 299, 300, 301])
+def test_rolling_extrema_match_pandas(window):
+    rng = np.random.default_rng(window)
+    panel = rng.normal(size=(300, 4))
+    panel[[10, 150], [0, 2]] = np.nan
+    frame = pd.DataFrame(panel)
+
+    np.testing.assert_array_equal(rolling_max(panel, window), frame.rolling(window).max().to_numpy())
+    np.testing.assert_array_equal(rolling_min(panel, window), frame.rolling(window).min().to_numpy())
+    np.testing.assert_array_equal(rolling_max(panel[:, 1], window), frame[1].rolling(window).max().to_numpy())
+
+
+def test_rolling_sum_matches_pandas():
+    rng = np.random.default_rng(1)
+    panel = rng.normal(size=(200, 3))
+    panel[40:60, 1] = 0.0
+    panel[90, 2] = np.nan
+    result = rolling_sum(panel, 14)
+    np.testing.assert_allclose(result, pd.DataFrame(panel).rolling(14).sum().to_numpy(), rtol=1e-12, atol=1e-12)
+    assert (result[59, 1] == 0.0) and np.isnan(result[95, 2])
+
+
+def test_rolling_extrema_reject_bad_window():
+    with pytest.raises(ValueError):
+        rolling_max(np.arange(5.0), 0)
+
+
+def _loop_kd(df, k):
+    """The former per-row loops of cal_KD (lookback k)."""
+    high, low, close = list(df["High"]), list(df["Low"]), list(df["Close"])
+    kvalues = [0] * len(df)
+    for i in range(k - 1, len(df)):
+        hh = max(high[i - k + 1:i + 1])
+        ll = min(low[i - k + 1:i + 1])
+        kvalues[i] = ((close[i] - ll) * 100) / (hh - ll) if hh - ll != 0 else 0.0
+    return np.array(kvalues, dtype=float)
+
+
+@pytest.mark.parametrize("k", [14, 5])
+def test_stochastic_oscillator_honours_k(ohlc, k):
+    df = ohlc.copy()
+    indicator = stc_oscillator(df, k=k)
+    indicator.cal_KD()
+    results = indicator.results
+    np.testing.assert_array_equal(results["%K"], _loop_kd(ohlc, k))
+    np.testing.assert_allclose(results["%D"], results["%K"].rolling(3, min_periods=1).mean())
+
+
+def test_williams_r_unchanged(ohlc):
+    df = ohlc.copy()
+    indicator = williamsR(df, lbp=10)
+    indicator.cal_wr()
+    hh = ohlc["High"].rolling(10).max()
+    ll = ohlc["Low"].rolling(10).min()
+    np.testing.assert_array_equal(indicator.results["%R"], -100 * (hh - ohlc["Close"]) / (hh - ll))
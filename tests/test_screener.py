@@ -0,0 +1,116 @@
+"""
+Tests for the universe-wide indicator screener (technical-analysis_python/screener.py).
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+TA_PY = SRC / "technical-analysis_python"
+sys.path.insert(0, str(SRC))
+sys.path.insert(0, str(TA_PY))
+
+import numpy as np
+import pandas as pd
+import pytest
+import matplotlib
+matplotlib.use("Agg")
+
+import config
+from backtest import BacktestPortfolio
+from evaluate import SharpeRatio, CAGR, PerformanceMetrics
+from screener import MARKETS, PANEL_SIGNALS, load_panel, panel_signals, screen
+from strategy.pipeline import run_strategy
+
+
+def _make_ohlcv(index, seed):
+    rng = np.random.default_rng(seed)
+    close = 100.0 + np.cumsum(rng.standard_normal(len(index)))
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close + rng.random(len(index)),
+            "Low": close - rng.random(len(index)),
+            "Close": close,
+            "Volume": rng.integers(1000, 5000, len(index)).astype(np.float64),
+        },
+        index=pd.DatetimeIndex(index, name="Date"),
+    )
+
+
+@pytest.fixture
+def frames():
+    dates = pd.date_range("2018-01-01", periods=260, freq="B")
+    return {f"000{i}.HK": _make_ohlcv(dates, i) for i in range(1, 4)}
+
+
+@pytest.fixture
+def panel(frames):
+    return {column: pd.DataFrame({ticker: df[column] for ticker, df in frames.items()})
+            for column in ("Open", "High", "Low", "Close", "Volume")}
+
+
+@pytest.mark.parametrize("strategy", sorted(PANEL_SIGNALS))
+def test_panel_rules_match_strategy_classes(frames, panel, strategy):
+    signals = panel_signals(panel, strategy)
+    for ticker, df in frames.items():
+        expected = run_strategy(df, strategy)["signal"]
+        np.testing.assert_array_equal(signals[ticker].to_numpy(), expected.to_numpy())
+
+
+@pytest.mark.parametrize("strategy", sorted(PANEL_SIGNALS) + ["parabolic_sar"])
+def test_signals_match_strategy_classes_on_gapped_and_mixed_calendars(frames, strategy):
+    # 0001 misses two days, 0002 lists later, 0003 trades on another market's calendar
+    frames = {
+        "0001.HK": frames["0001.HK"].drop(frames["0001.HK"].index[[100, 101]]),
+        "0002.HK": frames["0002.HK"].iloc[30:],
+        "AAPL": _make_ohlcv(pd.date_range("2018-01-01", periods=260, freq="W-SUN"), 3),
+    }
+    panel = {column: pd.concat({ticker: df[column] for ticker, df in frames.items()}, axis=1)
+             for column in ("Open", "High", "Low", "Close", "Volume")}
+    signals = panel_signals(panel, strategy)
+    for ticker, df in frames.items():
+        expected = run_strategy(df, strategy)["signal"]
+        np.testing.assert_array_equal(signals.loc[df.index, ticker].to_numpy(), expected.to_numpy())
+        assert signals[ticker].drop(df.index).isna().all()
+
+
+def test_strategies_without_panel_rule_run_per_ticker(frames, panel):
+    signals = panel_signals(panel, "parabolic_sar")
+    for ticker, df in frames.items():
+        np.testing.assert_array_equal(signals[ticker], run_strategy(df, "parabolic_sar")["signal"])
+
+
+def test_screen_ranks_tickers_with_backtest_metrics(frames, panel):
+    results = screen(panel, ["macd_crossover", "rsi"])
+    assert len(results) == 6
+    assert results["sharpe"].is_monotonic_decreasing
+
+    row = results[(results["ticker"] == "0002.HK") & (results["strategy"] == "macd_crossover")].iloc[0]
+    signals = run_strategy(frames["0002.HK"], "macd_crossover")
+    portfolio = BacktestPortfolio("0002.HK", signals, frames["0002.HK"])
+    assert row["signal"] == signals["signal"].iloc[-1]
+    assert row["date"] == frames["0002.HK"].index[-1]
+    assert row["sharpe"] == pytest.approx(SharpeRatio(portfolio))
+    assert row["cagr"] == pytest.approx(CAGR(portfolio))
+    assert row["max_drawdown"] == pytest.approx(PerformanceMetrics(portfolio)["max_drawdown"])
+
+
+def test_load_panel_aligns_markets_on_union_of_dates(tmp_path, monkeypatch, frames):
+    monkeypatch.setattr(config, "_DATA_ROOT", str(tmp_path))
+    monkeypatch.setattr(config, "_PRICE_STORE", str(tmp_path / ".price_store"))
+    hkex = tmp_path / MARKETS["hkex"][0]
+    nasdaq = tmp_path / MARKETS["nasdaq"][0]
+    hkex.mkdir(parents=True)
+    nasdaq.mkdir(parents=True)
+    frames["0001.HK"].to_csv(hkex / "hkex_0001.csv")
+    frames["0002.HK"].iloc[10:].to_csv(hkex / "hkex_0002.csv")
+    frames["0003.HK"].iloc[::2].to_csv(nasdaq / "nasdaq_AAPL.csv")
+
+    panel = load_panel(["hkex", "nasdaq"], end="2018-06-29")
+    close = panel["Close"]
+    assert list(close.columns) == ["0001.HK", "0002.HK", "AAPL"]
+    assert close.index.equals(frames["0001.HK"].loc[:"2018-06-29"].index)
+    assert close["0002.HK"].isna().sum() == 10
+    assert close["AAPL"].isna().sum() == len(close) // 2
+    np.testing.assert_allclose(panel["High"]["0001.HK"], frames["0001.HK"].loc[:"2018-06-29", "High"], rtol=1e-12)
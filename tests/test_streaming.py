@@ -0,0 +1,119 @@
+"""
+Parity tests: streaming indicators (strategy/streaming.py) against the batch versions.
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+TA_PY = SRC / "technical-analysis_python"
+sys.path.insert(0, str(SRC))
+sys.path.insert(0, str(TA_PY))
+
+import numpy as np
+import pandas as pd
+import pytest
+import matplotlib
+matplotlib.use("Agg")
+
+from strategy.bollinger_bands import bollinger_bands
+from strategy.macd_crossover import macdCrossover
+from strategy.relative_strength_index import rsi
+from strategy.williams_R import williamsR
+from strategy.streaming import (EMA, RollingExtreme, StreamingBollinger, StreamingMACD,
+                                StreamingRSI, StreamingWilliamsR, replay)
+
+
+@pytest.fixture
+def ohlc():
+    rng = np.random.default_rng(7)
+    n = 600
+    close = 100.0 + np.cumsum(rng.normal(0, 1, n))
+    close[200:215] = close[199]  # flat stretch
+    high = close + rng.uniform(0, 2, n)
+    low = close - rng.uniform(0, 2, n)
+    return pd.DataFrame({"High": high, "Low": low, "Close": close},
+                        index=pd.bdate_range("2015-01-01", periods=n, name="Date"))
+
+
+def _stream(indicator, df, field):
+    out, signals = [], []
+    for _, bar in df.iterrows():
+        indicator.update(bar)
+        out.append(getattr(indicator, field))
+        signals.append(indicator.signal)
+    return np.array(out), np.array(signals)
+
+
+def test_ema_matches_pandas_exactly(ohlc):
+    for adjust in (False, True):
+        ema = EMA(12, adjust=adjust)
+        got = [ema.update(x) for x in ohlc["Close"]]
+        np.testing.assert_array_equal(got, ohlc["Close"].ewm(span=12, adjust=adjust).mean())
+
+
+def test_rolling_extreme_matches_pandas(ohlc):
+    rmax, rmin = RollingExtreme(14, "max"), RollingExtreme(14, "min")
+    np.testing.assert_array_equal([rmax.update(x) for x in ohlc["High"]], ohlc["High"].rolling(14).max())
+    np.testing.assert_array_equal([rmin.update(x) for x in ohlc["Low"]], ohlc["Low"].rolling(14).min())
+
+
+def test_streaming_macd_parity(ohlc):
+    df = ohlc.copy()
+    batch = macdCrossover(df, 8, 21, 5)
+    batch.cal_MACD()
+    signals = batch.gen_signals()
+
+    macd, signal = _stream(StreamingMACD(8, 21, 5), ohlc, "macd")
+    np.testing.assert_array_equal(macd, batch.results["MACD"])
+    np.testing.assert_array_equal(signal, signals["signal"])
+
+
+@pytest.mark.parametrize("mean", ["ewma", "sma"])
+def test_streaming_rsi_parity(ohlc, mean):
+    batch = rsi(ohlc.copy())
+    batch.mean = mean
+    batch.cal_RSI()
+    expected = batch.RSI.to_numpy()
+    signals = batch.gen_signals()
+
+    values, signal = _stream(StreamingRSI(mean=mean), ohlc, "RSI")
+    assert np.isnan(values[0])
+    np.testing.assert_allclose(values[1:], expected, rtol=1e-12, atol=1e-9)
+    # the first bar has no RSI; both read it as 0, a buy
+    assert signal[0] == signals["signal"].iloc[0] == 1.0
+    np.testing.assert_array_equal(signal, signals["signal"])
+
+
+def test_streaming_bollinger_parity(ohlc):
+    df = ohlc.copy()
+    batch = bollinger_bands(df)
+    batch.cal_BB()
+    signals = batch.gen_signals()
+
+    indicator = StreamingBollinger()
+    bands, signal = [], []
+    for _, bar in ohlc.iterrows():
+        bands.append(indicator.update(bar))
+        signal.append(indicator.signal)
+    np.testing.assert_allclose(np.array(bands), batch.results[["Middle band", "Upper band", "Lower band"]].to_numpy(),
+                               rtol=1e-12, atol=1e-9)
+    np.testing.assert_array_equal(signal, signals["signal"])
+
+
+def test_streaming_williams_r_parity(ohlc):
+    df = ohlc.copy()
+    batch = williamsR(df)
+    batch.cal_wr()
+    signals = batch.gen_signals()
+
+    wr, signal = _stream(StreamingWilliamsR(), ohlc, "wr")
+    np.testing.assert_array_equal(wr, batch.results["%R"])
+    np.testing.assert_array_equal(signal, signals["signal"])
+
+
+def test_replay_then_update_matches_full_history(ohlc):
+    warm = replay(StreamingMACD(), ohlc.iloc[:-1])
+    full = replay(StreamingMACD(), ohlc)
+    warm.update(ohlc.iloc[-1])
+    assert (warm.macd, warm.signal_line) == (full.macd, full.signal_line)
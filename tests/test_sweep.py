@@ -0,0 +1,85 @@
+"""
+Tests for the indicator parameter sweep (technical-analysis_python/sweep.py).
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+TA_PY = SRC / "technical-analysis_python"
+sys.path.insert(0, str(SRC))
+sys.path.insert(0, str(TA_PY))
+
+import numpy as np
+import pandas as pd
+import pytest
+import matplotlib
+matplotlib.use("Agg")
+
+from sweep import _frames, _share, param_grid, run_sweep
+
+
+def _make_ohlcv(index, seed):
+    rng = np.random.default_rng(seed)
+    close = 100.0 + np.cumsum(rng.standard_normal(len(index)))
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close + rng.random(len(index)),
+            "Low": close - rng.random(len(index)),
+            "Close": close,
+            "Volume": rng.integers(1000, 5000, len(index)).astype(np.float64),
+        },
+        index=index,
+    )
+
+
+def _prices():
+    dates = pd.date_range("2019-01-01", periods=300, freq="B")
+    return {"A.HK": _make_ohlcv(dates, 1), "B.HK": _make_ohlcv(dates, 2)}
+
+
+def test_param_grid_expands_all_combinations():
+    grid = param_grid({"short_span": [8, 12], "long_span": [21, 26, 34]})
+    assert len(grid) == 6
+    assert {"short_span": 8, "long_span": 34} in grid
+
+
+def test_run_sweep_collects_metrics_per_combination():
+    windows = [("2019-01-01", "2019-06-30"), ("2019-07-01", "2019-12-31")]
+    results = run_sweep(_prices(), "macd_crossover", {"short_span": [8, 12], "long_span": [26]},
+                        windows, processes=1)
+
+    assert len(results) == 2 * 2 * 2
+    for column in ["ticker", "start", "end", "short_span", "sharpe", "cagr", "max_drawdown", "trades"]:
+        assert column in results.columns
+    assert (results["error"] == "").all()
+    assert np.isfinite(results["sharpe"]).all()
+    assert (results["max_drawdown"] <= 0).all()
+
+
+def test_run_sweep_process_pool_matches_in_process():
+    windows = [("2019-01-01", "2019-12-31")]
+    grid = {"window_size": [10, 14]}
+    serial = run_sweep(_prices(), "rsi", grid, windows, processes=1)
+    pooled = run_sweep(_prices(), "rsi", grid, windows, processes=2)
+    pd.testing.assert_frame_equal(serial, pooled)
+
+
+def test_shared_price_frames_view_the_shared_block():
+    prices = _prices()
+    block, layout = _share(prices)
+    try:
+        frames = _frames(block.buf, layout)
+        for ticker, df in prices.items():
+            pd.testing.assert_frame_equal(frames[ticker], df, check_freq=False)
+            assert not frames[ticker]["Close"].to_numpy().flags.writeable
+        del frames
+    finally:
+        block.close()
+        block.unlink()
+
+
+def test_run_sweep_rejects_unknown_strategy():
+    with pytest.raises(ValueError, match="unknown strategy"):
+        run_sweep(_prices(), "nope", {}, [("2019-01-01", "2019-12-31")])
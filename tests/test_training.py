@@ -0,0 +1,81 @@
+"""
+Tests for checkpointed training and the per-ticker job scheduler (integrated-strategy/training.py).
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+INTEGRATED = ROOT / "src" / "integrated-strategy"
+sys.path.insert(0, str(INTEGRATED))
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from training import fit, checkpoint_path, predict, run_jobs
+
+
+def _setup():
+    torch.manual_seed(1)
+    x = torch.randn(64, 5, 3)
+    y = torch.randn(64, 3)
+    model = torch.nn.Sequential(torch.nn.Flatten(), torch.nn.Dropout(0.2), torch.nn.Linear(15, 3))
+    optimiser = torch.optim.Adam(model.parameters(), lr=0.01)
+    return model, optimiser, torch.nn.MSELoss(), x, y
+
+
+def _job(name):
+    if name == "bad":
+        raise ValueError("no data")
+
+
+def test_resumed_training_matches_uninterrupted(tmp_path):
+    model, optimiser, loss_fn, x, y = _setup()
+    full_hist = fit(model, optimiser, loss_fn, x, y, num_epochs=6, batch_size=16)
+    full_state = {k: v.clone() for k, v in model.state_dict().items()}
+
+    ckpt = checkpoint_path(str(tmp_path), "0001")
+    model, optimiser, loss_fn, x, y = _setup()
+    fit(model, optimiser, loss_fn, x, y, num_epochs=4, batch_size=16, checkpoint=ckpt, checkpoint_every=2)
+
+    # a fresh process: new model, same seed, resume the remaining epochs
+    model, optimiser, loss_fn, x, y = _setup()
+    hist = fit(model, optimiser, loss_fn, x, y, num_epochs=6, batch_size=16, checkpoint=ckpt, checkpoint_every=2)
+    np.testing.assert_allclose(hist, full_hist)
+    for key, value in model.state_dict().items():
+        torch.testing.assert_close(value, full_state[key])
+
+    # finished: nothing is retrained
+    model, optimiser, loss_fn, x, y = _setup()
+    hist = fit(model, optimiser, loss_fn, x, y, num_epochs=6, batch_size=16, checkpoint=ckpt)
+    np.testing.assert_allclose(hist, full_hist)
+    for key, value in model.state_dict().items():
+        torch.testing.assert_close(value, full_state[key])
+
+
+def test_full_batch_step_in_chunks_matches_one_pass():
+    hists, states = [], []
+    for chunk_size in (64, 10):
+        model, optimiser, loss_fn, x, y = _setup()
+        model.eval()  # no dropout, so both runs compute the same function
+        hists.append(fit(model, optimiser, loss_fn, x, y, num_epochs=3, chunk_size=chunk_size))
+        states.append(model.state_dict())
+    np.testing.assert_allclose(hists[1], hists[0], rtol=1e-5)
+    for name, value in states[0].items():
+        torch.testing.assert_close(states[1][name], value, rtol=1e-5, atol=1e-6)
+
+
+def test_predict_runs_in_chunks_without_a_graph():
+    model, _, _, x, _ = _setup()
+    model.eval()
+    pred = predict(model, x, chunk_size=10)
+    assert not pred.requires_grad
+    torch.testing.assert_close(pred, model(x).detach())
+
+
+def test_run_jobs_reports_failures_and_continues():
+    errors = run_jobs(_job, ["0001", "bad", "0002"], processes=1)
+    assert list(errors) == ["0001", "bad", "0002"]
+    assert errors["0001"] == "" and errors["0002"] == ""
+    assert errors["bad"] == "ValueError: no data"
@@ -0,0 +1,53 @@
+"""
+Tests for the per-headline VADER score cache (models/sentiment/vader_cache.py).
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+INTEGRATED = SRC / "integrated-strategy"
+sys.path.insert(0, str(SRC))
+sys.path.insert(0, str(INTEGRATED))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.sentiment import vader_cache
+
+
+@pytest.fixture
+def cache_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(vader_cache, "_CACHE", {})
+    return str(tmp_path / "sentiment_data" / "vader-cache.csv")
+
+
+def test_cached_headlines_are_not_rescored(cache_path):
+    headlines = ["HSBC profit beats forecast", "Tencent shares slump", "HSBC profit beats forecast"]
+    Path(cache_path).parent.mkdir(parents=True)
+    pd.DataFrame({
+        "key": [vader_cache.headline_key(h) for h in headlines[:2]],
+        "compound": [0.4404, -0.3818],
+    }).to_csv(cache_path, index=False)
+
+    scores = vader_cache.score_headlines(pd.Series(headlines), path=cache_path)
+    np.testing.assert_array_equal(scores, [0.4404, -0.3818, 0.4404])
+    assert vader_cache._ANALYSER is None  # nothing was scored
+    assert len(pd.read_csv(cache_path)) == 2
+
+
+def test_misses_are_scored_once_and_persisted(cache_path):
+    pytest.importorskip("nltk")
+    try:
+        expected = vader_cache._score_batch(["Good results", "Terrible losses"])
+    except LookupError:
+        pytest.skip("vader_lexicon not installed")
+
+    headlines = ["Good results", "Terrible losses", "Good results"]
+    scores = vader_cache.score_headlines(headlines, processes=1, batch_size=1, path=cache_path)
+    np.testing.assert_allclose(scores, [expected[0], expected[1], expected[0]])
+
+    vader_cache._CACHE.clear()  # as in a new process
+    cached = vader_cache.load_cache(cache_path)
+    assert len(cached) == 2 and cached[vader_cache.headline_key("Terrible losses")] == expected[1]
@@ -0,0 +1,84 @@
+"""
+Tests for the walk-forward framework (integrated-strategy/walk_forward.py).
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+INTEGRATED = ROOT / "src" / "integrated-strategy"
+sys.path.insert(0, str(INTEGRATED))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import walk_forward
+from walk_forward import WindowMoments, fitted, run_folds, summarise, walk_forward_splits
+
+
+def _bounds(folds):
+    return [(f.train.start, f.train.stop, f.test.start, f.test.stop) for f in folds]
+
+
+def test_rolling_splits():
+    assert _bounds(walk_forward_splits(10, 4, 2)) == [(0, 4, 4, 6), (2, 6, 6, 8), (4, 8, 8, 10)]
+    assert _bounds(walk_forward_splits(10, 4, 2, step=3, gap=1)) == [(0, 4, 5, 7), (3, 7, 8, 10)]
+    assert walk_forward_splits(5, 4, 2) == []
+
+
+def test_expanding_splits_stay_anchored():
+    folds = walk_forward_splits(10, 4, 3, expanding=True)
+    assert _bounds(folds) == [(0, 4, 4, 7), (0, 7, 7, 10)]
+    assert [f.number for f in folds] == [0, 1]
+
+
+def test_window_moments_match_pandas():
+    rng = np.random.default_rng(0)
+    x = 1e6 + np.cumsum(rng.standard_normal(500))
+    y = rng.standard_normal(500) * 1e4
+    x[[3, 70, 71]] = np.nan
+    y[200] = np.nan
+    moments = WindowMoments(x, y)
+
+    for lo, hi in [(0, 500), (0, 50), (60, 260), (199, 201), (250, 500)]:
+        xs, ys = pd.Series(x[lo:hi]), pd.Series(y[lo:hi])
+        valid = xs.notna() & ys.notna()
+        assert moments.count(lo, hi) == valid.sum()
+        assert moments.corr(lo, hi) == pytest.approx(xs.corr(ys), rel=1e-9, abs=1e-12, nan_ok=True)
+        assert moments.std(lo, hi) == pytest.approx(xs[valid].std(), rel=1e-9, nan_ok=True)
+
+
+def test_window_moments_constant_window_has_no_correlation():
+    moments = WindowMoments(np.arange(10.0), np.r_[np.ones(5), np.arange(5.0)])
+    assert np.isnan(moments.corr(0, 5))
+    assert moments.corr(5, 10) == pytest.approx(1.0)
+
+
+def test_fitted_memoises_per_process(monkeypatch):
+    monkeypatch.setattr(walk_forward, "_FITTED", {})
+    calls = []
+    assert fitted("scaler", lambda: calls.append(1) or 42) == 42
+    assert fitted("scaler", lambda: calls.append(1) or 0) == 42
+    assert calls == [1]
+
+
+def _evaluate(data, fold):
+    if fold.number == 2:
+        raise ValueError("bad fold")
+    return {"train_mean": data[fold.train].mean(), "test_sum": data[fold.test].sum()}
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_run_folds_collects_metrics_and_errors(processes):
+    data = np.arange(20.0)
+    folds = walk_forward_splits(len(data), 8, 4, step=2)
+    results = run_folds(_evaluate, data, folds, processes=processes)
+
+    assert list(results["fold"]) == [0, 1, 2, 3, 4]
+    assert results.loc[0, "train_mean"] == 3.5
+    assert results.loc[1, "test_sum"] == 10 + 11 + 12 + 13
+    assert results.loc[2, "error"] == "ValueError: bad fold"
+
+    summary = summarise(results)
+    assert summary.loc["mean", "test_sum"] == pytest.approx(np.mean([38, 46, 62, 70]))
+    assert "fold" not in summary
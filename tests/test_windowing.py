@@ -0,0 +1,50 @@
+"""
+Tests for the LSTM look-back windows (integrated-strategy/windowing.py).
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+INTEGRATED = ROOT / "src" / "integrated-strategy"
+sys.path.insert(0, str(INTEGRATED))
+
+import numpy as np
+import pytest
+
+from windowing import sliding_windows, split_windows
+
+
+def _materialised(data_raw, look_back):
+    """Reference: the window list load_data used to build."""
+    data = np.array([data_raw[i: i + look_back] for i in range(len(data_raw) - look_back)])
+    test_set_size = int(np.round(0.2 * data.shape[0]))
+    train_set_size = data.shape[0] - test_set_size
+    return [data[:train_set_size, :-1, :], data[:train_set_size, -1, :],
+            data[train_set_size:, :-1], data[train_set_size:, -1, :]]
+
+
+def test_split_windows_matches_materialised_windows():
+    rng = np.random.default_rng(0)
+    scaled = rng.uniform(-1, 1, size=(250, 7)).astype(np.float32)
+    for got, expected in zip(split_windows(scaled, 60), _materialised(scaled, 60)):
+        assert got.shape == expected.shape
+        np.testing.assert_array_equal(got, expected)
+
+
+def test_windows_are_views_of_one_series():
+    values = np.arange(100, dtype=np.float32).reshape(50, 2)
+    windows = sliding_windows(values, 10)
+    assert windows.shape == (40, 10, 2)
+    assert np.shares_memory(windows, values)  # float32 input is not copied
+    x_train, y_train, x_test, y_test = split_windows(values, 10)
+    assert all(np.shares_memory(part, values) for part in (x_train, y_train, x_test, y_test))
+
+    column = np.linspace(0.0, 1.0, 30)  # float64 single column, e.g. df['Close']
+    x_train, y_train, _, _ = split_windows(column, 5)
+    assert x_train.dtype == np.float32 and x_train.shape == (20, 4, 1)
+    np.testing.assert_allclose(y_train[:, 0], column[4:24].astype(np.float32))
+
+
+def test_too_short_series():
+    with pytest.raises(ValueError):
+        sliding_windows(np.zeros((10, 3)), 10)